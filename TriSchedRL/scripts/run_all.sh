@@ -1,3 +1,4 @@
 #!/usr/bin/env bash
 set -e
 python scripts/smoke_test_guard.py
+python scripts/run_sweep.py --seeds 0,1 --horizon 20 --out sweep_results.json
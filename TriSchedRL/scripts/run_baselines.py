@@ -1,2 +1,10 @@
-# Placeholder: baseline runner provided earlier in chat.
-print('Use the chat-provided run_baselines.py content if you want full baselines.')
+from __future__ import annotations
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from run_sweep import main
+from src.evaluation.sweep import BASELINES
+
+# Baseline-only sweep; shares run_sweep.py's flags and result cache.
+if __name__ == "__main__":
+    main(default_schedulers=BASELINES, description="Baseline schedulers over seeds x workloads, cached like run_sweep.py.")
@@ -0,0 +1,52 @@
+from __future__ import annotations
+import argparse
+import sys
+from src.evaluation.benchmark import CASES, BenchConfig, compare, load_results, run_suite, save_results
+
+def _ints(s: str):
+    return tuple(int(x) for x in s.split(","))
+
+def _floats(s: str):
+    return tuple(float(x) for x in s.split(","))
+
+def main():
+    ap = argparse.ArgumentParser(description="Hot-path micro/scaling benchmarks with baseline regression check.")
+    ap.add_argument("--nodes", type=_ints, default=BenchConfig.node_counts)
+    ap.add_argument("--batch", type=_ints, default=BenchConfig.batch_sizes)
+    ap.add_argument("--rates", type=_floats, default=BenchConfig.rates)
+    ap.add_argument("--cases", default=None, help="Comma-separated case names; see --list.")
+    ap.add_argument("--min-time", type=float, default=BenchConfig.min_time_s)
+    ap.add_argument("--repeat", type=int, default=BenchConfig.repeat)
+    ap.add_argument("--agent-max-nodes", type=int, default=BenchConfig.agent_max_nodes)
+    ap.add_argument("--quick", action="store_true", help="Small grid for CI: nodes 4,64; batch 32; one rate.")
+    ap.add_argument("--out", default="bench_results.json")
+    ap.add_argument("--baseline", default=None, help="Earlier --out file to compare against.")
+    ap.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown fraction before flagging.")
+    ap.add_argument("--list", action="store_true")
+    args = ap.parse_args()
+
+    if args.list:
+        for name, (axes, _) in CASES.items():
+            print(f"{name:28s} {','.join(axes)}")
+        return
+    cfg = BenchConfig(node_counts=args.nodes, batch_sizes=args.batch, rates=args.rates,
+                      cases=args.cases.split(",") if args.cases else None, min_time_s=args.min_time,
+                      repeat=args.repeat, agent_max_nodes=args.agent_max_nodes)
+    if args.quick:
+        cfg.node_counts, cfg.batch_sizes, cfg.rates, cfg.min_time_s, cfg.repeat = (4, 64), (32,), (args.rates[0],), 0.01, 3
+
+    report = run_suite(cfg, progress=lambda r: print(f"{r.key:60s} {r.median_us:12.2f} us  (x{r.loops})", flush=True))
+    save_results(report, args.out)
+    print(f"wrote {args.out}")
+    if args.baseline:
+        rows = compare(report, load_results(args.baseline), args.threshold)
+        bad = [r for r in rows if r["regressed"]]
+        for r in rows:
+            flag = "REGRESSION" if r["regressed"] else ""
+            print(f"{r['key']:60s} {r['baseline_us']:12.2f} -> {r['current_us']:12.2f} us  x{r['ratio']:.2f} {flag}")
+        print(f"{len(bad)} of {len(rows)} benchmarks slower than baseline by more than {100 * args.threshold:.0f}%")
+        if bad:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
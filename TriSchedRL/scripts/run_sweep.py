@@ -0,0 +1,59 @@
+from __future__ import annotations
+import argparse
+import json
+from src.evaluation.sweep import SCHEDULERS, SweepConfig, run_sweep, skipped_schedulers, summarize_rows
+
+def _ints(s: str):
+    return tuple(int(x) for x in s.split(","))
+
+def _floats(s: str):
+    return tuple(float(x) for x in s.split(","))
+
+def _strs(s: str):
+    return tuple(x for x in s.split(",") if x)
+
+def build_parser(default_schedulers=SCHEDULERS, description="Seeds x workloads x schedulers sweep with an on-disk result cache.") -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description=description)
+    ap.add_argument("--seeds", type=_ints, default=SweepConfig.seeds)
+    ap.add_argument("--modes", type=_strs, default=SweepConfig.modes)
+    ap.add_argument("--rates", type=_floats, default=SweepConfig.rates)
+    ap.add_argument("--schedulers", type=_strs, default=default_schedulers, help=f"Any of {','.join(SCHEDULERS)}.")
+    ap.add_argument("--horizon", type=float, default=None, help="Override workload.yaml horizon_s.")
+    ap.add_argument("--configs", default=SweepConfig.configs_dir)
+    ap.add_argument("--cache-dir", default=SweepConfig.cache_dir)
+    ap.add_argument("--workers", type=int, default=SweepConfig.workers, help="0 = one per CPU; 1 = in-process.")
+    ap.add_argument("--checkpoint", default=None, help="train_trischedrl.py --save output for the RL schedulers.")
+    ap.add_argument("--untrained-rl", action="store_true", help="Run the RL schedulers with random weights when no --checkpoint is given.")
+    ap.add_argument("--batch-window", type=float, default=SweepConfig.batch_window_s, help="Arrival window (s) for minmin/maxmin.")
+    ap.add_argument("--base-seed", type=int, default=SweepConfig.base_seed)
+    ap.add_argument("--out", default="sweep_results.json")
+    return ap
+
+def main(argv=None, **parser_kwargs):
+    args = build_parser(**parser_kwargs).parse_args(argv)
+    cfg = SweepConfig(seeds=args.seeds, modes=args.modes, rates=args.rates, schedulers=args.schedulers,
+                      horizon_s=args.horizon, configs_dir=args.configs, cache_dir=args.cache_dir, workers=args.workers,
+                      checkpoint=args.checkpoint, untrained_rl=args.untrained_rl, batch_window_s=args.batch_window,
+                      base_seed=args.base_seed)
+    skipped = skipped_schedulers(cfg)
+    if skipped:
+        print(f"skipping {','.join(skipped)}: no --checkpoint (pass --untrained-rl to run them untrained)")
+
+    def _progress(r):
+        tag = "cached" if r["cached"] else f"{r['wall_s']:.1f}s"
+        name = r["scheduler"] + ("*" if r["untrained"] else "")
+        print(f"seed={r['seed']} {r['mode']:8s} rate={r['rate']:<5g} {name:18s} "
+              f"viol={r['sla_viol_rate']:.3f} lat_p95={r['lat_p95']:.3f} eng={r['eng_mean']:.2f}  [{tag}]", flush=True)
+
+    rows = run_sweep(cfg, progress=_progress)
+    summary = summarize_rows(rows)
+    with open(args.out, "w") as f:
+        json.dump({"rows": rows, "summary": summary}, f, indent=2)
+    print(f"{'mode':8s} {'rate':>6s} {'scheduler':18s} {'viol':>7s} {'lat_mean':>9s} {'lat_p95':>9s} {'eng_mean':>9s} {'reward':>9s}")
+    for s in summary:
+        print(f"{s['mode']:8s} {s['rate']:6g} {s['scheduler']:18s} {s['sla_viol_rate']:7.3f} {s['lat_mean']:9.3f} "
+              f"{s['lat_p95']:9.3f} {s['eng_mean']:9.2f} {s['avg_reward']:9.3f}")
+    print(f"{sum(r['cached'] for r in rows)} of {len(rows)} cells from cache; wrote {args.out}")
+
+if __name__ == "__main__":
+    main()
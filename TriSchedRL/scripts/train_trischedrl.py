@@ -1,2 +1,43 @@
-# Placeholder: training script provided earlier in chat.
-print('Use the chat-provided train_trischedrl.py content if you want full training.')
+from __future__ import annotations
+import argparse
+import json
+from src.env.config import load_yaml
+from src.workloads.generators import WorkloadConfig
+from src.meta.meta_controller import MetaConfig
+from src.meta.signals import SignalConfig
+from src.agents.actor_critic import ACTrainConfig
+from src.agents.distributed import DistributedConfig, WorkerSpec, train_distributed
+
+def main():
+    ap = argparse.ArgumentParser(description="Actor-learner training: N rollout processes, one learner.")
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--env-steps", type=int, default=100_000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--max-wall-s", type=float, default=float("inf"))
+    ap.add_argument("--configs", default="configs")
+    ap.add_argument("--save", default=None, help="Path for the trained actor/critic state_dict.")
+    args = ap.parse_args()
+
+    env_cfg = load_yaml(f"{args.configs}/env.yaml")
+    agent_cfg = load_yaml(f"{args.configs}/agent.yaml")
+    meta_cfg = load_yaml(f"{args.configs}/meta.yaml")
+    window = int(meta_cfg.pop("signal_window", 50))
+    replay_capacity = int(agent_cfg.pop("replay_capacity", 100_000))
+
+    spec = WorkerSpec(
+        env_cfg=env_cfg,
+        workload=WorkloadConfig(**load_yaml(f"{args.configs}/workload.yaml")),
+        meta_cfg=MetaConfig(**meta_cfg),
+        signal_cfg=SignalConfig(window=window),
+    )
+    cfg = DistributedConfig(num_workers=args.workers, total_env_steps=args.env_steps, replay_capacity=replay_capacity,
+                            seed=args.seed, max_wall_s=args.max_wall_s)
+    out = train_distributed(spec, cfg, ACTrainConfig(**agent_cfg))
+    agent = out.pop("agent")
+    if args.save:
+        import torch
+        torch.save({"actor": agent.actor.state_dict(), "critic": agent.critic.state_dict()}, args.save)
+    print(json.dumps(out, indent=2))
+
+if __name__ == "__main__":
+    main()
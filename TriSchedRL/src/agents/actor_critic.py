@@ -1,11 +1,12 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 import numpy as np
 import torch
 import torch.nn as nn
 import torch.optim as optim
 from .networks import Actor, Critic
+from .inference import BatchedPolicy
 
 @dataclass
 class ACTrainConfig:
@@ -18,15 +19,18 @@ class ACTrainConfig:
     device: str = "cpu"
 
 class ActorCriticAgent:
-    def __init__(self, state_dim: int, action_dim: int, train_cfg: ACTrainConfig):
+    def __init__(self, state_dim: int, action_dim: int, train_cfg: ACTrainConfig, networks: Optional[Tuple[nn.Module, nn.Module]] = None):
+        # networks overrides the flat MLP Actor/Critic, e.g. (SetActor, SetCritic).
         self.state_dim = int(state_dim)
         self.action_dim = int(action_dim)
         self.cfg = train_cfg
         self.device = torch.device(train_cfg.device)
-        self.actor = Actor(self.state_dim, self.action_dim).to(self.device)
-        self.critic = Critic(self.state_dim).to(self.device)
+        actor, critic = networks if networks is not None else (Actor(self.state_dim, self.action_dim), Critic(self.state_dim))
+        self.actor = actor.to(self.device)
+        self.critic = critic.to(self.device)
         self.opt_actor = optim.Adam(self.actor.parameters(), lr=train_cfg.lr_actor)
         self.opt_critic = optim.Adam(self.critic.parameters(), lr=train_cfg.lr_critic)
+        self.last_td_errors: np.ndarray = np.zeros(0, dtype=np.float32)
 
     @torch.no_grad()
     def act(self, s: np.ndarray) -> Tuple[int, np.ndarray]:
@@ -37,6 +41,9 @@ class ActorCriticAgent:
         probs = dist.probs.detach().cpu().numpy()
         return a, probs
 
+    def inference_policy(self, max_batch: int = 1024, quantize: bool = False, seed: Optional[int] = None) -> BatchedPolicy:
+        return BatchedPolicy(self.actor, self.state_dim, self.action_dim, max_batch=max_batch, quantize=quantize, seed=seed)
+
     def update(self, batch: Dict[str, np.ndarray]) -> Dict[str, float]:
         s = torch.tensor(batch["s"], dtype=torch.float32, device=self.device)
         a = torch.tensor(batch["a"], dtype=torch.int64, device=self.device)
@@ -48,9 +55,13 @@ class ActorCriticAgent:
             v_next = self.critic(sp)
             target = r + self.cfg.gamma * (1.0 - done) * v_next
 
+        # Importance-sampling weights from PrioritizedReplayBuffer, if present.
+        w = torch.tensor(batch["w"], dtype=torch.float32, device=self.device) if "w" in batch else None
+
         v = self.critic(s)
         td = target - v
-        critic_loss = (td ** 2).mean()
+        critic_loss = (td ** 2 * w).mean() if w is not None else (td ** 2).mean()
+        self.last_td_errors = td.detach().cpu().numpy()
 
         self.opt_critic.zero_grad()
         critic_loss.backward()
@@ -64,6 +75,8 @@ class ActorCriticAgent:
         entropy = dist.entropy().mean()
 
         adv = td.detach()
+        if w is not None:
+            adv = adv * w
         actor_loss = -(logp * adv).mean() - self.cfg.entropy_coef * entropy
 
         self.opt_actor.zero_grad()
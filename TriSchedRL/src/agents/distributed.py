@@ -0,0 +1,268 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+import multiprocessing as mp
+import time
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+import torch
+
+from src.env.config import build_env_components
+from src.env.array_env import ArrayEdgeCloudEnv
+from src.env.sla import reward_from_step
+from src.workloads.generators import WorkloadConfig, WorkloadGenerator
+from src.predictors.feature_builder import FeatureBuilder
+from src.predictors.latency_predictor import LatencyPredictor
+from src.predictors.energy_predictor import EnergyPredictor
+from src.predictors.sla_risk_predictor import SLARiskPredictor
+from src.predictors.aggregator import AggregationConfig, PredictionAggregator
+from src.guard.feasibility import FeasibilityConfig
+from src.guard.fallback import FallbackConfig
+from src.guard.lazy import LazyGuard
+from src.meta.meta_controller import MetaConfig, MetaController
+from src.meta.signals import SignalConfig, IncrementalSignalTracker
+from .actor_critic import ACTrainConfig, ActorCriticAgent
+from .networks import Actor
+from .replay_buffer import ReplayBuffer, ReplayBufferConfig
+from .state_vectorizer import StateVectorizer
+
+@dataclass
+class DistributedConfig:
+    num_workers: int = 4
+    total_env_steps: int = 100_000
+    ring_capacity: int = 8192      # per-worker transitions in flight
+    replay_capacity: int = 100_000
+    warmup_steps: int = 1_000      # buffer size before the first update
+    updates_per_drain: int = 1
+    publish_every: int = 10        # learner updates between weight publications
+    seed: int = 0
+    start_method: Optional[str] = None
+    max_wall_s: float = float("inf")
+
+@dataclass
+class WorkerSpec:
+    env_cfg: Dict[str, Any]
+    workload: WorkloadConfig
+    agg_cfg: AggregationConfig = field(default_factory=AggregationConfig)
+    feas_cfg: FeasibilityConfig = field(default_factory=FeasibilityConfig)
+    fall_cfg: FallbackConfig = field(default_factory=FallbackConfig)
+    meta_cfg: MetaConfig = field(default_factory=MetaConfig)
+    signal_cfg: SignalConfig = field(default_factory=SignalConfig)
+
+_HEAD, _TAIL = 0, 1
+
+class TransitionRing:
+    # Single-producer/single-consumer ring in shared memory. The producer writes
+    # rows and then bumps head; the consumer reads [tail, head) and then bumps
+    # tail. Counters are monotonic int64s touched only under a process-shared
+    # lock, whose acquire/release are the memory barriers that order the row
+    # writes before the head bump on any architecture, not just x86.
+    def __init__(self, state_dim: int, capacity: int, name: Optional[str] = None, ctx=None, lock=None):
+        self.state_dim = int(state_dim)
+        self.capacity = int(capacity)
+        self.lock = lock if lock is not None else (ctx or mp).Lock()
+        layout = [("ctr", (2,), np.int64), ("s", (capacity, state_dim), np.float32), ("a", (capacity,), np.int64),
+                  ("r", (capacity,), np.float32), ("sp", (capacity, state_dim), np.float32), ("done", (capacity,), np.float32)]
+        nbytes = sum(int(np.prod(shape)) * np.dtype(dt).itemsize for _, shape, dt in layout)
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=nbytes)
+        self.name = self.shm.name
+        off = 0
+        for key, shape, dt in layout:
+            arr = np.ndarray(shape, dtype=dt, buffer=self.shm.buf, offset=off)
+            setattr(self, key, arr)
+            off += arr.nbytes
+        if name is None:
+            self.ctr[:] = 0
+
+    def __getstate__(self):
+        return (self.state_dim, self.capacity, self.name, self.lock)
+
+    def __setstate__(self, st):
+        self.__init__(st[0], st[1], name=st[2], lock=st[3])
+
+    def _counters(self) -> Tuple[int, int]:
+        with self.lock:
+            return int(self.ctr[_HEAD]), int(self.ctr[_TAIL])
+
+    def put(self, s, a, r, sp, done, stop=None) -> bool:
+        head, tail = self._counters()
+        while head - tail >= self.capacity:
+            if stop is not None and stop.is_set():
+                return False
+            time.sleep(1e-4)
+            tail = self._counters()[1]
+        i = head % self.capacity
+        self.s[i] = s
+        self.a[i] = a
+        self.r[i] = r
+        self.sp[i] = sp
+        self.done[i] = done
+        with self.lock:
+            self.ctr[_HEAD] = head + 1
+        return True
+
+    def drain_into(self, buf: ReplayBuffer) -> int:
+        head, tail = self._counters()
+        n = head - tail
+        if n <= 0:
+            return 0
+        idx = (tail + np.arange(n)) % self.capacity
+        buf.add_batch(self.s[idx], self.a[idx], self.r[idx], self.sp[idx], self.done[idx])
+        with self.lock:
+            self.ctr[_TAIL] = head
+        return n
+
+    def close(self, unlink: bool = False) -> None:
+        for key in ("ctr", "s", "a", "r", "sp", "done"):
+            setattr(self, key, None)
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+class SharedWeights:
+    # Flat float32 parameter vector plus a version (bumped by 2 per publish).
+    # Publish and pull copy under a process-shared lock, so a reader never sees
+    # a torn vector or a version ahead of its data, whatever the memory model.
+    def __init__(self, n_params: int, name: Optional[str] = None, ctx=None, lock=None):
+        self.n_params = int(n_params)
+        self.lock = lock if lock is not None else (ctx or mp).Lock()
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=8 + 4 * self.n_params)
+        self.name = self.shm.name
+        self.version = np.ndarray((1,), dtype=np.int64, buffer=self.shm.buf, offset=0)
+        self.data = np.ndarray((self.n_params,), dtype=np.float32, buffer=self.shm.buf, offset=8)
+        if name is None:
+            self.version[0] = 0
+
+    def __getstate__(self):
+        return (self.n_params, self.name, self.lock)
+
+    def __setstate__(self, st):
+        self.__init__(st[0], name=st[1], lock=st[2])
+
+    def publish(self, module: torch.nn.Module) -> None:
+        flat = torch.nn.utils.parameters_to_vector(module.parameters()).detach().cpu().numpy()
+        with self.lock:
+            self.data[:] = flat
+            self.version[0] += 2
+
+    def pull(self, module: torch.nn.Module, seen: int) -> int:
+        with self.lock:
+            v = int(self.version[0])
+            if v == seen:
+                return seen
+            flat = self.data.copy()
+        if flat.shape[0] != sum(p.numel() for p in module.parameters()):
+            raise ValueError("Published weights do not match the module's parameter count")
+        torch.nn.utils.vector_to_parameters(torch.from_numpy(flat), module.parameters())
+        return v
+
+    def close(self, unlink: bool = False) -> None:
+        self.version = self.data = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+def rollout_worker(seed: int, spec: WorkerSpec, ring: TransitionRing, weights: SharedWeights, stop, pull_every: int = 64) -> None:
+    torch.set_num_threads(1)
+    pool, net, sla, dt_s = build_env_components(spec.env_cfg)
+    env = ArrayEdgeCloudEnv(pool, net, sla, dt_s=dt_s)
+    fb = FeatureBuilder()
+    guard = LazyGuard(spec.feas_cfg, spec.fall_cfg, LatencyPredictor(), EnergyPredictor(), SLARiskPredictor(), fb)
+    agg = PredictionAggregator(spec.agg_cfg)
+    vec = StateVectorizer(env.nodes.node_ids, agg.out_dim)
+    actor = Actor(vec.state_dim, env.num_nodes)
+    seen = weights.pull(actor, -1)
+    rng = np.random.default_rng(seed)
+    steps = 0
+    while not stop.is_set():
+        meta = MetaController(spec.meta_cfg)
+        signals = IncrementalSignalTracker(spec.signal_cfg)
+        alpha, beta, gamma = meta.update(signals.phi())
+        # Fresh env and workload randomness per episode, both drawn from the worker's rng.
+        env_seed, wl_seed = (int(x) for x in rng.integers(2**31, size=2))
+        env.reset(env_seed)
+        wl = WorkloadConfig(**{**spec.workload.__dict__, "seed": wl_seed})
+        pending = None
+        for chunk in WorkloadGenerator(wl).stream():
+            for _, task in chunk.iter_tasks():
+                if stop.is_set():
+                    return
+                state = env.observe_arrays()
+                # kappa needs every candidate's scores (top-k); the guard reuses them.
+                b = fb.build_batch(state, task)
+                pred = guard.fused.predict(b)
+                s = vec.vectorize_arrays(state, agg.aggregate_batch(pred.L_hat, pred.E_hat, pred.R_hat, alpha, beta, gamma)[0]).copy()
+                if pending is not None and not ring.put(*pending, s, 0.0, stop=stop):
+                    return
+                with torch.no_grad():
+                    logits = actor(torch.from_numpy(s).unsqueeze(0)).squeeze(0)
+                proposed = int(torch.distributions.Categorical(logits=logits).sample().item())
+                dec = guard.decide(state, task, proposed, alpha, beta, gamma, precomputed=(b, pred))
+                _, res, _, _ = env.step(task, dec.node_idx)
+                signals.update_from_step(res.latency_s, res.energy_j, res.violation)
+                signals.update_from_arrays(env.observe_arrays())
+                pending = (s, dec.node_idx, reward_from_step(res, alpha, beta, gamma))
+                alpha, beta, gamma = meta.update(signals.phi())
+                steps += 1
+                if steps % pull_every == 0:
+                    seen = weights.pull(actor, seen)
+        if pending is not None and not ring.put(*pending, pending[0], 1.0, stop=stop):
+            return
+
+def train_distributed(spec: WorkerSpec, cfg: DistributedConfig, train_cfg: ACTrainConfig = ACTrainConfig()) -> Dict[str, Any]:
+    # N rollout processes feed per-worker shared-memory rings; this (learner)
+    # process owns the agent and replay buffer and republishes actor weights.
+    node_ids = build_env_components(spec.env_cfg)[0].all_ids()
+    state_dim = StateVectorizer(node_ids, PredictionAggregator(spec.agg_cfg).out_dim).state_dim
+    action_dim = len(node_ids)
+    agent = ActorCriticAgent(state_dim, action_dim, train_cfg)
+    buf = ReplayBuffer(state_dim, ReplayBufferConfig(capacity=cfg.replay_capacity))
+    ctx = mp.get_context(cfg.start_method)
+    stop = ctx.Event()
+    rings = [TransitionRing(state_dim, cfg.ring_capacity, ctx=ctx) for _ in range(cfg.num_workers)]
+    weights = SharedWeights(sum(p.numel() for p in agent.actor.parameters()), ctx=ctx)
+    weights.publish(agent.actor)
+    seeds = np.random.SeedSequence(cfg.seed).generate_state(cfg.num_workers)
+    procs = [ctx.Process(target=rollout_worker, args=(int(seeds[w]), spec, rings[w], weights, stop), daemon=True)
+             for w in range(cfg.num_workers)]
+    t0 = time.perf_counter()
+    env_steps = updates = 0
+    stats: Dict[str, float] = {}
+    try:
+        for p in procs:
+            p.start()
+        while env_steps < cfg.total_env_steps and time.perf_counter() - t0 < cfg.max_wall_s:
+            got = sum(r.drain_into(buf) for r in rings)
+            env_steps += got
+            if buf.size < max(cfg.warmup_steps, train_cfg.batch_size):
+                if not got:
+                    if not any(p.is_alive() for p in procs):
+                        raise RuntimeError("All rollout workers exited")
+                    time.sleep(1e-3)
+                continue
+            for _ in range(cfg.updates_per_drain):
+                stats = agent.update(buf.sample(train_cfg.batch_size))
+                updates += 1
+                if updates % cfg.publish_every == 0:
+                    weights.publish(agent.actor)
+    finally:
+        stop.set()
+        for p in procs:
+            p.join(timeout=10.0)
+            if p.is_alive():
+                p.terminate()
+        wall = time.perf_counter() - t0
+        for r in rings:
+            r.close(unlink=True)
+        published = int(weights.version[0]) // 2
+        weights.close(unlink=True)
+    return {
+        "agent": agent,
+        "env_steps": env_steps,
+        "updates": updates,
+        "wall_s": wall,
+        "env_steps_per_s": env_steps / wall if wall > 0 else 0.0,
+        "updates_per_s": updates / wall if wall > 0 else 0.0,
+        "weight_versions": published,
+        "last_losses": stats,
+    }
@@ -0,0 +1,76 @@
+from __future__ import annotations
+import copy
+from typing import Optional, Tuple
+import numpy as np
+import torch
+import torch.nn as nn
+
+class BatchedPolicy:
+    # Deployment-side actor: scores (B, state_dim) states in one forward pass
+    # under inference_mode, writing into preallocated buffers shared between
+    # torch and NumPy. Sampling uses the Gumbel-max trick, so no Categorical is
+    # built; greedy=True is a plain argmax.
+    def __init__(self, actor: nn.Module, state_dim: int, action_dim: int, max_batch: int = 1024,
+                 quantize: bool = False, seed: Optional[int] = None):
+        self.state_dim = int(state_dim)
+        self.action_dim = int(action_dim)
+        self.max_batch = int(max_batch)
+        model = copy.deepcopy(actor).cpu().eval()
+        if quantize:
+            # Dynamic int8 for the Linear layers; CPU-only.
+            model = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+        self.model = model
+        self._in_np = np.zeros((self.max_batch, self.state_dim), dtype=np.float32)
+        self._in = torch.from_numpy(self._in_np)
+        self._probs_np = np.zeros((self.max_batch, self.action_dim), dtype=np.float32)
+        self._probs = torch.from_numpy(self._probs_np)
+        self._act_np = np.zeros(self.max_batch, dtype=np.int64)
+        self._act = torch.from_numpy(self._act_np)
+        self._noise = torch.empty((self.max_batch, self.action_dim), dtype=torch.float32)
+        self._gen = torch.Generator()
+        if seed is not None:
+            self._gen.manual_seed(int(seed))
+
+    def load_state_dict(self, actor: nn.Module) -> None:
+        # Refresh from the training actor (unquantized models only).
+        self.model.load_state_dict(actor.state_dict())
+
+    def _logits(self, states: np.ndarray) -> torch.Tensor:
+        states = np.asarray(states, dtype=np.float32).reshape(-1, self.state_dim)
+        B = states.shape[0]
+        if B > self.max_batch:
+            raise ValueError(f"Batch of {B} exceeds max_batch={self.max_batch}")
+        self._in_np[:B] = states
+        return self.model(self._in[:B])
+
+    def act_batch(self, states: np.ndarray, greedy: bool = False, return_probs: bool = False) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        # Returned arrays are views into the internal buffers; copy them to keep
+        # them past the next call.
+        with torch.inference_mode():
+            logits = self._logits(states)
+            B = logits.shape[0]
+            if greedy:
+                torch.argmax(logits, dim=-1, out=self._act[:B])
+            else:
+                g = self._noise[:B].exponential_(generator=self._gen).log_().neg_()
+                torch.argmax(logits + g, dim=-1, out=self._act[:B])
+            probs = None
+            if return_probs:
+                self._probs[:B].copy_(torch.softmax(logits, dim=-1))
+                probs = self._probs_np[:B]
+        return self._act_np[:B], probs
+
+    def act(self, s: np.ndarray, greedy: bool = False) -> int:
+        return int(self.act_batch(s, greedy=greedy)[0][0])
+
+    def export(self, path: str, method: str = "trace") -> torch.jit.ScriptModule:
+        # TorchScript artifact loadable with torch.jit.load, without this repo.
+        if method == "trace":
+            with torch.inference_mode(False), torch.no_grad():
+                m = torch.jit.trace(self.model, torch.zeros(1, self.state_dim))
+        elif method == "script":
+            m = torch.jit.script(self.model)
+        else:
+            raise ValueError(f"Unknown export method: {method}")
+        torch.jit.save(m, path)
+        return m
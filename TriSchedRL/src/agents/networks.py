@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import torch
 import torch.nn as nn
 
@@ -34,3 +34,58 @@ class Critic(nn.Module):
 
     def forward(self, s: torch.Tensor) -> torch.Tensor:
         return self.v(s).squeeze(-1)
+
+class NodeSetEncoder(nn.Module):
+    # Shared per-node encoder plus a pooled context. Works on node tensors
+    # (B, N, per_node_dim) with kappa (B, kappa_dim), or on StateVectorizer's flat
+    # layout (B, N * per_node_dim + kappa_dim) for any N. mask (B, N) marks real
+    # nodes when clusters of different sizes are padded into one batch.
+    def __init__(self, per_node_dim: int, kappa_dim: int, hidden: int = 128):
+        super().__init__()
+        self.per_node_dim = int(per_node_dim)
+        self.kappa_dim = int(kappa_dim)
+        self.node = mlp([self.per_node_dim, hidden, hidden], out_activation=nn.ReLU)
+        self.context = mlp([hidden + self.kappa_dim, hidden], out_activation=nn.ReLU)
+
+    def split(self, s: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        n = (s.shape[-1] - self.kappa_dim) // self.per_node_dim
+        nodes = s[..., : n * self.per_node_dim].reshape(*s.shape[:-1], n, self.per_node_dim)
+        return nodes, s[..., n * self.per_node_dim:]
+
+    def forward(self, nodes: torch.Tensor, kappa: torch.Tensor, mask: Optional[torch.Tensor] = None) -> Tuple[torch.Tensor, torch.Tensor]:
+        h = self.node(nodes)                                   # (B, N, H)
+        if mask is None:
+            pooled = h.mean(dim=-2)
+        else:
+            m = mask.unsqueeze(-1).to(h.dtype)
+            pooled = (h * m).sum(dim=-2) / m.sum(dim=-2).clamp_min(1.0)
+        ctx = self.context(torch.cat([pooled, kappa], dim=-1))  # (B, H)
+        return h, ctx
+
+class SetActor(nn.Module):
+    # One logit per node from [node embedding, context]; parameters and FLOPs do
+    # not depend on N, and permuting the nodes permutes the logits.
+    def __init__(self, per_node_dim: int, kappa_dim: int, hidden: int = 128):
+        super().__init__()
+        self.enc = NodeSetEncoder(per_node_dim, kappa_dim, hidden)
+        self.score = mlp([2 * hidden, hidden, 1])
+
+    def forward(self, s: torch.Tensor, kappa: Optional[torch.Tensor] = None, mask: Optional[torch.Tensor] = None) -> torch.Tensor:
+        nodes, kappa = self.enc.split(s) if kappa is None else (s, kappa)
+        h, ctx = self.enc(nodes, kappa, mask)
+        ctx = ctx.unsqueeze(-2).expand(*h.shape[:-1], ctx.shape[-1])
+        logits = self.score(torch.cat([h, ctx], dim=-1)).squeeze(-1)
+        if mask is not None:
+            logits = logits.masked_fill(~mask.bool(), float("-inf"))
+        return logits
+
+class SetCritic(nn.Module):
+    def __init__(self, per_node_dim: int, kappa_dim: int, hidden: int = 128):
+        super().__init__()
+        self.enc = NodeSetEncoder(per_node_dim, kappa_dim, hidden)
+        self.v = mlp([hidden, hidden, 1])
+
+    def forward(self, s: torch.Tensor, kappa: Optional[torch.Tensor] = None, mask: Optional[torch.Tensor] = None) -> torch.Tensor:
+        nodes, kappa = self.enc.split(s) if kappa is None else (s, kappa)
+        _, ctx = self.enc(nodes, kappa, mask)
+        return self.v(ctx).squeeze(-1)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, Optional
+import numpy as np
+from .replay_buffer import ReplayBuffer, ReplayBufferConfig
+
+class SegmentTree:
+    # Array-backed complete binary tree (root at 1, leaves at [size, 2*size)).
+    # Updates and prefix-sum descents run level by level over the whole batch,
+    # so a batch costs O(log n) NumPy ops rather than O(B log n) Python steps.
+    def __init__(self, capacity: int, op: str = "sum"):
+        self.size = 1 << max(0, int(capacity - 1).bit_length())
+        self.depth = self.size.bit_length() - 1
+        self.op = op
+        self.neutral = 0.0 if op == "sum" else np.inf
+        self.tree = np.full(2 * self.size, self.neutral, dtype=np.float64)
+
+    def update(self, idx: np.ndarray, values: np.ndarray) -> None:
+        idx = np.asarray(idx, dtype=np.int64) + self.size
+        # Last write wins for duplicate indices, as with sequential updates.
+        self.tree[idx] = values
+        node = idx
+        for _ in range(self.depth):
+            node = np.unique(node >> 1)
+            left, right = self.tree[2 * node], self.tree[2 * node + 1]
+            self.tree[node] = left + right if self.op == "sum" else np.minimum(left, right)
+
+    def get(self, idx: np.ndarray) -> np.ndarray:
+        return self.tree[np.asarray(idx, dtype=np.int64) + self.size]
+
+    @property
+    def root(self) -> float:
+        return float(self.tree[1])
+
+    def find_prefixsum(self, u: np.ndarray) -> np.ndarray:
+        # Leaf index i with sum(leaves[:i]) <= u < sum(leaves[:i+1]); sum trees only.
+        u = np.array(u, dtype=np.float64)
+        node = np.ones(u.shape[0], dtype=np.int64)
+        for _ in range(self.depth):
+            left = self.tree[2 * node]
+            right = u >= left
+            u -= left * right
+            node = 2 * node + right
+        return node - self.size
+
+@dataclass
+class PrioritizedReplayConfig:
+    capacity: int = 100_000
+    alpha: float = 0.6
+    beta0: float = 0.4
+    beta_steps: int = 100_000  # samples over which beta anneals to 1.0
+    eps: float = 1e-6
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    # Proportional prioritized replay (Schaul et al., 2016). New transitions get
+    # the current max priority; sample() adds "idx" and importance weights "w",
+    # and update_priorities() takes the |TD| errors from ActorCriticAgent.update.
+    def __init__(self, state_dim: int, cfg: PrioritizedReplayConfig):
+        super().__init__(state_dim, ReplayBufferConfig(capacity=cfg.capacity))
+        self.pcfg = cfg
+        self.sum_tree = SegmentTree(self.capacity, "sum")
+        self.min_tree = SegmentTree(self.capacity, "min")
+        self.max_priority = 1.0
+        self.n_sampled = 0
+
+    def _set_priority(self, idx: np.ndarray, p_alpha: np.ndarray) -> None:
+        self.sum_tree.update(idx, p_alpha)
+        self.min_tree.update(idx, p_alpha)
+
+    def add(self, s, a, r, sp, done: bool):
+        i = self.ptr
+        super().add(s, a, r, sp, done)
+        self._set_priority(np.array([i]), np.array([self.max_priority ** self.pcfg.alpha]))
+
+    def add_batch(self, s, a, r, sp, done) -> None:
+        n = min(int(np.shape(a)[0]), self.capacity)
+        idx = (self.ptr + np.arange(n)) % self.capacity
+        super().add_batch(s, a, r, sp, done)
+        self._set_priority(idx, np.full(n, self.max_priority ** self.pcfg.alpha))
+
+    def beta(self) -> float:
+        frac = min(1.0, self.n_sampled / max(1, self.pcfg.beta_steps))
+        return self.pcfg.beta0 + frac * (1.0 - self.pcfg.beta0)
+
+    def sample(self, batch_size: int, beta: Optional[float] = None) -> Dict[str, np.ndarray]:
+        # Stratified: one uniform draw per equal-mass segment of the priority total.
+        total = self.sum_tree.root
+        if self.size == 0 or total <= 0.0:
+            raise ValueError("Cannot sample from an empty replay buffer")
+        u = (np.arange(batch_size) + np.random.random_sample(batch_size)) * (total / batch_size)
+        idx = self.sum_tree.find_prefixsum(np.minimum(u, np.nextafter(total, 0.0)))
+        idx = np.minimum(idx, self.size - 1)
+        beta = self.beta() if beta is None else float(beta)
+        self.n_sampled += batch_size
+        p_min = self.min_tree.root
+        w = (self.sum_tree.get(idx) / p_min) ** (-beta)
+        return {"s": self.s[idx], "a": self.a[idx], "r": self.r[idx], "sp": self.sp[idx], "done": self.done[idx],
+                "idx": idx, "w": w.astype(np.float32)}
+
+    def update_priorities(self, idx: np.ndarray, td_errors: np.ndarray) -> None:
+        p = np.abs(np.asarray(td_errors, dtype=np.float64)) + self.pcfg.eps
+        self.max_priority = max(self.max_priority, float(p.max()))
+        self._set_priority(np.asarray(idx, dtype=np.int64), p ** self.pcfg.alpha)
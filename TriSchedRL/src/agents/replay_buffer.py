@@ -1,6 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Optional
+import os
 import numpy as np
 
 @dataclass
@@ -29,6 +30,172 @@ class ReplayBuffer:
         self.ptr = (self.ptr + 1) % self.capacity
         self.size = min(self.size + 1, self.capacity)
 
+    def add_batch(self, s, a, r, sp, done) -> None:
+        n = int(np.shape(a)[0])
+        if n > self.capacity:
+            s, a, r, sp, done = s[-self.capacity:], a[-self.capacity:], r[-self.capacity:], sp[-self.capacity:], done[-self.capacity:]
+            n = self.capacity
+        idx = (self.ptr + np.arange(n)) % self.capacity
+        self.s[idx] = s
+        self.a[idx] = a
+        self.r[idx] = r
+        self.sp[idx] = sp
+        self.done[idx] = np.asarray(done, dtype=np.float32)
+        self.ptr = (self.ptr + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+
     def sample(self, batch_size: int) -> Dict[str, np.ndarray]:
         idx = np.random.randint(0, self.size, size=batch_size)
         return {"s": self.s[idx], "a": self.a[idx], "r": self.r[idx], "sp": self.sp[idx], "done": self.done[idx]}
+
+@dataclass
+class CompactReplayConfig:
+    capacity: int = 100_000
+    # State slots; each transition needs one new slot when its s equals the
+    # previous transition's sp (the usual case within an episode), two otherwise.
+    obs_capacity: Optional[int] = None  # default: capacity + capacity // 4
+    storage_dtype: str = "float32"      # "float32" | "float16" | "uint8"
+    quant_low: Optional[np.ndarray] = None   # per-dim range for "uint8"
+    quant_high: Optional[np.ndarray] = None
+    memmap_dir: Optional[str] = None    # back all arrays with np.memmap files here
+
+_META_OBS, _META_HEAD, _META_TAIL, _META_LAST_SP = 0, 1, 2, 3   # last sp slot + 1; 0 = none
+
+class CompactReplayBuffer:
+    # Stores every state once in an obs ring and keeps (s, sp) as indices into it,
+    # so chained transitions cost one state row instead of two. Positions are
+    # monotonic counters; a transition is evicted once its s slot is overwritten.
+    # With memmap_dir the arrays (and counters) live on disk, so capacity can
+    # exceed RAM and other processes can open the same directory read-only.
+    def __init__(self, state_dim: int, cfg: CompactReplayConfig, readonly: bool = False):
+        if cfg.storage_dtype not in ("float32", "float16", "uint8"):
+            raise ValueError(f"Unknown storage_dtype: {cfg.storage_dtype}")
+        if readonly and cfg.memmap_dir is None:
+            raise ValueError("readonly needs memmap_dir to open an existing buffer")
+        self.state_dim = int(state_dim)
+        self.capacity = int(cfg.capacity)
+        self.obs_capacity = int(cfg.obs_capacity or self.capacity + self.capacity // 4)
+        if self.obs_capacity < 2:
+            raise ValueError("obs_capacity must be at least 2")
+        self.cfg = cfg
+        if cfg.storage_dtype == "uint8":
+            if cfg.quant_low is None or cfg.quant_high is None:
+                raise ValueError("uint8 storage needs quant_low and quant_high")
+            self._q_low = np.broadcast_to(np.asarray(cfg.quant_low, dtype=np.float32), (self.state_dim,)).copy()
+            span = np.broadcast_to(np.asarray(cfg.quant_high, dtype=np.float32), (self.state_dim,)) - self._q_low
+            self._q_scale = np.maximum(span, 1e-12) / 255.0
+        mode = "r" if readonly else None
+        self.obs = self._alloc("obs", (self.obs_capacity, self.state_dim), cfg.storage_dtype, mode)
+        self.s_pos = self._alloc("s_pos", (self.capacity,), np.int64, mode)
+        self.sp_pos = self._alloc("sp_pos", (self.capacity,), np.int64, mode)
+        self.a = self._alloc("a", (self.capacity,), np.int64, mode)
+        self.r = self._alloc("r", (self.capacity,), np.float32, mode)
+        self.done = self._alloc("done", (self.capacity,), np.float32, mode)
+        self.meta = self._alloc("meta", (4,), np.int64, mode)
+        # A reopened buffer continues the dedup chain from the stored last sp.
+        # For float16/uint8 that is the decoded value, so a chain may be missed
+        # (one extra slot), never wrongly joined.
+        last = int(self.meta[_META_LAST_SP])
+        self._last_sp: Optional[np.ndarray] = self._decode(self.obs[(last - 1) % self.obs_capacity]).copy() if last else None
+
+    def _alloc(self, name: str, shape, dtype, mode: Optional[str]) -> np.ndarray:
+        if self.cfg.memmap_dir is None:
+            return np.zeros(shape, dtype=dtype)
+        os.makedirs(self.cfg.memmap_dir, exist_ok=True)
+        path = os.path.join(self.cfg.memmap_dir, f"{name}.dat")
+        if mode is None:
+            mode = "r+" if os.path.exists(path) else "w+"
+        return np.memmap(path, dtype=dtype, mode=mode, shape=shape)
+
+    @property
+    def size(self) -> int:
+        return int(self.meta[_META_HEAD] - self.meta[_META_TAIL])
+
+    @property
+    def ptr(self) -> int:
+        return int(self.meta[_META_HEAD] % self.capacity)
+
+    def nbytes(self) -> int:
+        return sum(int(x.nbytes) for x in (self.obs, self.s_pos, self.sp_pos, self.a, self.r, self.done))
+
+    def flush(self) -> None:
+        for x in (self.obs, self.s_pos, self.sp_pos, self.a, self.r, self.done, self.meta):
+            if isinstance(x, np.memmap):
+                x.flush()
+
+    def _encode(self, x: np.ndarray) -> np.ndarray:
+        if self.cfg.storage_dtype == "uint8":
+            return np.clip(np.rint((x - self._q_low) / self._q_scale), 0, 255).astype(np.uint8)
+        return x
+
+    def _decode(self, x: np.ndarray) -> np.ndarray:
+        if self.cfg.storage_dtype == "uint8":
+            return x.astype(np.float32) * self._q_scale + self._q_low
+        return x.astype(np.float32, copy=False)
+
+    def add(self, s, a, r, sp, done: bool) -> None:
+        self.add_batch(np.asarray(s, dtype=np.float32)[None], [a], [r], np.asarray(sp, dtype=np.float32)[None], [done])
+
+    def add_batch(self, s, a, r, sp, done) -> None:
+        s = np.asarray(s, dtype=np.float32).reshape(-1, self.state_dim)
+        sp = np.asarray(sp, dtype=np.float32).reshape(-1, self.state_dim)
+        a, r, done = np.asarray(a), np.asarray(r), np.asarray(done)
+        if s.shape[0] == 0:
+            return
+
+        # s[k] reuses the previous sp's slot when they are equal.
+        chained = np.zeros(s.shape[0], dtype=bool)
+        chained[1:] = np.all(s[1:] == sp[:-1], axis=1)
+        if self._last_sp is not None:
+            chained[0] = bool(np.array_equal(s[0], self._last_sp))
+        # Keep the longest suffix that fits both rings.
+        need = np.cumsum((2 - chained)[::-1])[::-1]
+        start = max(s.shape[0] - self.capacity, int(np.searchsorted(-need, -self.obs_capacity, side="left")))
+        if start:
+            s, a, r, sp, done, chained = s[start:], a[start:], r[start:], sp[start:], done[start:], chained[start:].copy()
+            chained[0] = False
+            if int((2 - chained).sum()) > self.obs_capacity:
+                s, a, r, sp, done, chained = s[1:], a[1:], r[1:], sp[1:], done[1:], chained[1:]
+                chained[0] = False
+        n = s.shape[0]
+        items = np.stack([s, sp], axis=1).reshape(2 * n, self.state_dim)
+        keep = np.stack([~chained, np.ones(n, dtype=bool)], axis=1).reshape(2 * n)
+        base = int(self.meta[_META_OBS])
+        pos = base + np.cumsum(keep) - 1
+        sp_p = pos[1::2]
+        s_p = np.where(chained, np.concatenate([[base - 1], sp_p[:-1]]), pos[0::2])
+        new = items[keep]
+        self.obs[np.arange(base, base + new.shape[0]) % self.obs_capacity] = self._encode(new)
+        self.meta[_META_OBS] = base + new.shape[0]
+        self.meta[_META_LAST_SP] = base + new.shape[0]
+        self._last_sp = sp[-1].copy()
+
+        # Drop transitions whose s slot was just overwritten, then those pushed
+        # out of the transition ring.
+        self._evict_older_than(int(self.meta[_META_OBS]) - self.obs_capacity)
+        head = int(self.meta[_META_HEAD])
+        idx = (head + np.arange(n)) % self.capacity
+        self.s_pos[idx] = s_p
+        self.sp_pos[idx] = sp_p
+        self.a[idx] = a
+        self.r[idx] = r
+        self.done[idx] = np.asarray(done, dtype=np.float32)
+        self.meta[_META_HEAD] = head + n
+        self.meta[_META_TAIL] = max(int(self.meta[_META_TAIL]), head + n - self.capacity)
+
+    def _evict_older_than(self, min_pos: int) -> None:
+        tail, head = int(self.meta[_META_TAIL]), int(self.meta[_META_HEAD])
+        if tail == head or self.s_pos[tail % self.capacity] >= min_pos:
+            return
+        live = np.arange(tail, head) % self.capacity
+        self.meta[_META_TAIL] = tail + int(np.searchsorted(self.s_pos[live], min_pos, side="left"))
+
+    def sample(self, batch_size: int) -> Dict[str, np.ndarray]:
+        k = (int(self.meta[_META_TAIL]) + np.random.randint(0, self.size, size=batch_size)) % self.capacity
+        return {
+            "s": self._decode(self.obs[self.s_pos[k] % self.obs_capacity]),
+            "a": self.a[k],
+            "r": self.r[k],
+            "sp": self._decode(self.obs[self.sp_pos[k] % self.obs_capacity]),
+            "done": self.done[k],
+        }
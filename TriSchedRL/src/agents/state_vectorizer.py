@@ -1,11 +1,14 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 import numpy as np
+from src.env.arrays import ArrayState
 
 @dataclass
 class VectorizerConfig:
     use_node_kind: bool = True
+    normalize: bool = False   # running mean/std normalization (array paths only)
+    norm_clip: float = 10.0
 
 class StateVectorizer:
     def __init__(self, node_ids: List[str], kappa_dim: int, cfg: VectorizerConfig = VectorizerConfig()):
@@ -14,6 +17,11 @@ class StateVectorizer:
         self.cfg = cfg
         self.per_node_dim = 8 + (1 if self.cfg.use_node_kind else 0)
         self.state_dim = self.per_node_dim * len(self.node_ids) + self.kappa_dim
+        self._buf = np.zeros(self.state_dim, dtype=np.float32)
+        self._perm: Tuple[Optional[list], Optional[np.ndarray]] = (None, None)
+        self.norm_count = 0.0
+        self.norm_mean = np.zeros(self.state_dim, dtype=np.float64)
+        self.norm_m2 = np.zeros(self.state_dim, dtype=np.float64)
 
     def _node_to_vec(self, n: Dict[str, Any]) -> np.ndarray:
         energy_budget = n["energy_budget_j_step"]
@@ -40,3 +48,72 @@ class StateVectorizer:
         if kappa.shape[0] != self.kappa_dim:
             raise ValueError(f"kappa_dim mismatch: expected {self.kappa_dim}, got {kappa.shape[0]}")
         return np.concatenate([s_flat, kappa], axis=0)
+
+    def vectorize_nodes(self, state: Dict[str, Any], kappa: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Per-node tensor form for SetActor/SetCritic: (N, per_node_dim) rows in
+        # self.node_ids order, plus kappa. vectorize() is this flattened.
+        s = self.vectorize(state, kappa)
+        n = len(self.node_ids)
+        return s[: n * self.per_node_dim].reshape(n, self.per_node_dim), s[n * self.per_node_dim:]
+
+    def _order(self, state: ArrayState) -> Optional[np.ndarray]:
+        # Index from state.node_ids into self.node_ids order; None when identical.
+        if self._perm[0] is not state.node_ids:
+            if list(state.node_ids) == self.node_ids:
+                perm = None
+            else:
+                pos = {nid: i for i, nid in enumerate(state.node_ids)}
+                perm = np.array([pos[nid] for nid in self.node_ids], dtype=np.int64)
+            self._perm = (state.node_ids, perm)
+        return self._perm[1]
+
+    def vectorize_arrays(self, state: ArrayState, kappa: np.ndarray, out: Optional[np.ndarray] = None, update_norm: bool = True) -> np.ndarray:
+        # Same layout as vectorize(), written column by column straight from an
+        # ArrayState. Runtime columns may be (N,) -> out (state_dim,), or (B, N)
+        # from a VecEdgeCloudEnv -> out (B, state_dim). Without out, a single
+        # state is written into a reused internal buffer (overwritten next call).
+        batched = np.ndim(state.util) == 2
+        B = state.util.shape[0] if batched else 1
+        if out is None:
+            out = np.empty((B, self.state_dim), dtype=np.float32) if batched else self._buf
+        elif not out.flags.c_contiguous or out.size != B * self.state_dim:
+            # reshape() of a strided view silently returns a copy, so writes would be lost.
+            raise ValueError(f"out must be a C-contiguous array of {B} x {self.state_dim} values")
+        rows = out.reshape(B, self.state_dim)
+        n, F = len(self.node_ids), self.per_node_dim
+        node_block = rows[:, : n * F].reshape(B, n, F)
+        perm = self._order(state)
+        take = (lambda x: x) if perm is None else (lambda x: x[..., perm])
+        node_block[..., 0] = take(state.util)
+        node_block[..., 1] = take(state.queue_work_mi)
+        node_block[..., 2] = take(state.f_mi_s)
+        node_block[..., 3] = take(state.capacity_mi_step)
+        node_block[..., 4] = take(state.bandwidth_mbps)
+        node_block[..., 5] = take(state.rtt_ms)
+        node_block[..., 6] = take(state.loss)
+        node_block[..., 7] = take(state.energy_budget_j_step >= 0)
+        if self.cfg.use_node_kind:
+            node_block[..., 8] = take(state.is_cloud)
+        kappa = np.asarray(kappa, dtype=np.float32)
+        if kappa.shape[-1] != self.kappa_dim:
+            raise ValueError(f"kappa_dim mismatch: expected {self.kappa_dim}, got {kappa.shape[-1]}")
+        rows[:, n * F:] = kappa.reshape(-1, self.kappa_dim)
+        if self.cfg.normalize:
+            self._normalize(rows, update_norm)
+        return out
+
+    def _normalize(self, rows: np.ndarray, update: bool) -> None:
+        # Chan/Welford batch update of the running moments, then in-place scaling.
+        if update:
+            nb = rows.shape[0]
+            bm = rows.mean(axis=0, dtype=np.float64)
+            tot = self.norm_count + nb
+            d = bm - self.norm_mean
+            self.norm_mean += d * (nb / tot)
+            self.norm_m2 += ((rows - bm) ** 2).sum(axis=0) + d * d * (self.norm_count * nb / tot)
+            self.norm_count = tot
+        if self.norm_count > 1:
+            std = np.sqrt(self.norm_m2 / self.norm_count) + 1e-8
+            np.subtract(rows, self.norm_mean, out=rows, casting="unsafe")
+            np.divide(rows, std, out=rows, casting="unsafe")
+            np.clip(rows, -self.cfg.norm_clip, self.cfg.norm_clip, out=rows)
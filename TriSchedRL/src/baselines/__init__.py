@@ -1,4 +1,4 @@
 from .eft import choose_eft
 from .least_energy import choose_least_energy
 from .fixed_weight_sum import choose_fixed_weight_sum, FixedWeights
-from .minmin_maxmin import choose_minmin, choose_maxmin
+from .minmin_maxmin import choose_minmin, choose_maxmin, BatchSchedule, minmin_batch, maxmin_batch, schedule_batch
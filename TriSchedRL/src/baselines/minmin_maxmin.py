@@ -1,8 +1,79 @@
 from __future__ import annotations
-from typing import Dict
+from dataclasses import dataclass
+from typing import Dict, Optional
+import numpy as np
+from src.predictors.feature_builder import CandidateBatch
+from src.predictors.fused import Predictions
+from src.predictors.latency_predictor import LatencyPredictor
 
 def choose_minmin(L_hat: Dict[str, float]) -> str:
     return min(L_hat.keys(), key=lambda nid: float(L_hat[nid]))
 
 def choose_maxmin(L_hat: Dict[str, float]) -> str:
     return max(L_hat.keys(), key=lambda nid: float(L_hat[nid]))
+
+@dataclass
+class BatchSchedule:
+    order: np.ndarray      # (T,) task indices in assignment order
+    node_idx: np.ndarray   # (T,) node chosen for each task (by task index)
+    finish_s: np.ndarray   # (T,) completion time of each task
+    ready_s: np.ndarray    # (N,) node ready times after the batch
+
+    @property
+    def makespan(self) -> float:
+        return float(self.finish_s.max()) if self.finish_s.size else 0.0
+
+def _batch_heuristic(exec_s: np.ndarray, ready_s: np.ndarray, comm_s: Optional[np.ndarray], max_min: bool) -> BatchSchedule:
+    # Completion time CT[t, n] = ready[n] + comm[t, n] + exec[t, n]. Each round picks
+    # the task whose best CT is smallest (Min-Min) or largest (Max-Min), assigns
+    # it, and bumps only that node's column. Tasks whose best node was that node
+    # are re-scanned; every other task's best cannot change because CT only grew.
+    exec_s = np.asarray(exec_s, dtype=np.float64)
+    T, N = exec_s.shape
+    ready = np.array(ready_s, dtype=np.float64).reshape(N)
+    ct = exec_s + ready
+    if comm_s is not None:
+        ct = ct + np.broadcast_to(comm_s, (T, N))
+    rows = np.arange(T)
+    best = np.argmin(ct, axis=1)
+    best_ct = ct[rows, best]
+    done_key = -np.inf if max_min else np.inf
+    key = best_ct.copy()
+    alive = np.ones(T, dtype=bool)
+    order = np.empty(T, dtype=np.int64)
+    node_idx = np.empty(T, dtype=np.int64)
+    finish = np.empty(T, dtype=np.float64)
+    for k in range(T):
+        t = int(np.argmax(key) if max_min else np.argmin(key))
+        n = int(best[t])
+        order[k], node_idx[t], finish[t] = t, n, best_ct[t]
+        alive[t] = False
+        key[t] = done_key
+        delta = exec_s[t, n]
+        ready[n] += delta
+        ct[:, n] += delta
+        stale = np.flatnonzero(alive & (best == n))
+        if stale.size:
+            b = np.argmin(ct[stale], axis=1)
+            best[stale] = b
+            best_ct[stale] = ct[stale, b]
+            key[stale] = best_ct[stale]
+    return BatchSchedule(order=order, node_idx=node_idx, finish_s=finish, ready_s=ready)
+
+def minmin_batch(exec_s: np.ndarray, ready_s: np.ndarray, comm_s: Optional[np.ndarray] = None) -> BatchSchedule:
+    return _batch_heuristic(exec_s, ready_s, comm_s, max_min=False)
+
+def maxmin_batch(exec_s: np.ndarray, ready_s: np.ndarray, comm_s: Optional[np.ndarray] = None) -> BatchSchedule:
+    return _batch_heuristic(exec_s, ready_s, comm_s, max_min=True)
+
+def schedule_batch(b: CandidateBatch, pred: Predictions, mode: str = "minmin") -> BatchSchedule:
+    # Pending TaskBatch x nodes from FeatureBuilder.build_batch/FusedPredictor:
+    # exec and comm times per pair, ready times from the current node queues.
+    ready = LatencyPredictor.t_queue_batch(b.queue_work_mi, b.f_mi_s)
+    exec_s = np.broadcast_to(pred.t_exec, pred.L_hat.shape)
+    comm_s = np.broadcast_to(pred.t_comm, pred.L_hat.shape)
+    if mode == "minmin":
+        return minmin_batch(exec_s, ready, comm_s)
+    if mode == "maxmin":
+        return maxmin_batch(exec_s, ready, comm_s)
+    raise ValueError(f"Unknown batch heuristic: {mode}")
@@ -0,0 +1,155 @@
+from __future__ import annotations
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+import numpy as np
+
+from .resources import ResourcePool
+from .network import NetworkModel, comm_time
+from .sla import SLAConfig, violation_indicator, sla_penalty
+from .arrays import NodeArrays, LinkArrays, ArrayState
+from .edgecloud_env import Task, StepResult
+from .dynamic_network import DynamicNetwork
+from .sources import SourceLinks
+
+NIC_POWER_W = 1.5
+
+def decay_queues(queue_work_mi: np.ndarray, util: np.ndarray, drain: np.ndarray, cap_safe: np.ndarray, dt_s: float) -> None:
+    # In-place queue drain and utilization refresh; works on (N,) and (B, N) runtime arrays.
+    processed = drain * max(0.0, dt_s)
+    np.subtract(queue_work_mi, processed, out=queue_work_mi)
+    np.maximum(queue_work_mi, 0.0, out=queue_work_mi)
+    np.divide(queue_work_mi, cap_safe, out=util)
+    np.minimum(util, 1.0, out=util)
+
+class ArrayEdgeCloudEnv:
+    # Struct-of-arrays variant of EdgeCloudEnv. Node specs, runtime queue/util and
+    # iot->node links are snapshotted into contiguous arrays at construction, so
+    # step() touches one index and step_decay() is a single vectorized update.
+    def __init__(self, resources: ResourcePool, network: NetworkModel, sla: SLAConfig, dt_s: float = 1.0, src_id: str = "iot",
+                 source_ids: Optional[Sequence[str]] = None, sparse_sources: bool = False):
+        # source_ids: gateways that task.source indexes; their links to the nodes
+        # become a SourceLinks matrix and self.links is the first source's row.
+        self.resources = resources
+        self.network = network
+        self.sla = sla
+        self.dt_s = float(dt_s)
+        self.src_id = src_id
+        self.nodes = NodeArrays.from_pool(resources)
+        self.sources: Optional[SourceLinks] = None
+        if source_ids:
+            self.sources = SourceLinks.from_network(network, source_ids, self.nodes.node_ids, sparse=sparse_sources)
+            self.src_id = self.sources.source_ids[0]
+            self.links = self.sources.row_links(0)
+        else:
+            self.links = LinkArrays.from_network(network, src_id, self.nodes.node_ids)
+        self.node_index = self.nodes.index()
+        n = len(self.nodes)
+        self.queue_work_mi = np.zeros(n, dtype=np.float64)
+        self.util = np.zeros(n, dtype=np.float64)
+        self._f_safe = np.maximum(1e-9, self.nodes.f_mi_s)
+        self._drain = np.maximum(0.0, self.nodes.f_mi_s)
+        self._cap_safe = np.maximum(1e-6, self.nodes.capacity_mi_step)
+        self.dynamics: Optional[DynamicNetwork] = None
+        # Cached comm-time coefficients, also handed to the predictors via ArrayState.comm.
+        self._links_cache = DynamicNetwork(self.links) if self.sources is None else None
+        self._state = ArrayState.from_arrays(self.nodes, self.links, self.queue_work_mi, self.util, self.sources,
+                                             comm=self.sources if self.sources is not None else self._links_cache)
+        topo = getattr(network, "topology", None)
+        if topo is not None and self.sources is None and self.src_id in topo.index:
+            # Multi-hop routing: edge updates on the topology re-export the affected
+            # route-equivalent links into self.links.
+            topo.bind(lambda idx, l: self.update_links(idx, l.bandwidth_mbps[idx], l.rtt_ms[idx], l.loss[idx], l.overhead_ms[idx]),
+                      self.src_id, self.nodes.node_ids)
+
+    def enable_dynamics(self, processes=(), seed: int = 0) -> DynamicNetwork:
+        # Time-varying links: the processes advance by dt_s after every step and
+        # t_comm comes from the cached per-link coefficients. With sources, the
+        # processes drive source 0's row, and every write refreshes that row's
+        # SourceLinks cache (dense only: sparse rows are not views).
+        if self.sources is not None and self.sources.sparse:
+            raise ValueError("enable_dynamics() is not supported with sparse_sources")
+        self.dynamics = DynamicNetwork(self.links, processes, seed=seed)
+        if self.sources is not None:
+            sources = self.sources
+            self.dynamics.listeners.append(lambda idx: sources.refresh_row(0, idx))
+        else:
+            self._links_cache = self._state.comm = self.dynamics
+        return self.dynamics
+
+    def update_links(self, idx, bandwidth_mbps=None, rtt_ms=None, loss=None, overhead_ms=None) -> None:
+        # Writes (source 0's) links to nodes idx through the coefficient cache;
+        # write self.links directly and step()/the predictors see stale comm times.
+        values = dict(bandwidth_mbps=bandwidth_mbps, rtt_ms=rtt_ms, loss=loss, overhead_ms=overhead_ms)
+        if self.dynamics is not None:
+            self.dynamics.update(idx, **values)
+        elif self.sources is not None:
+            idx = np.arange(self.num_nodes) if idx is None else np.asarray(idx, dtype=np.int64).reshape(-1)
+            self.sources.update(np.zeros_like(idx), idx, **values)
+            if self.sources.sparse:
+                self.links = self.sources.row_links(0)
+                for k in ("bandwidth_mbps", "rtt_ms", "loss"):
+                    setattr(self._state, k, getattr(self.links, k))
+        else:
+            self._links_cache.update(idx, **values)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.nodes)
+
+    def reset(self, seed: int = 0) -> ArrayState:
+        self.queue_work_mi[:] = 0.0
+        self.util[:] = 0.0
+        if self.dynamics is not None:
+            self.dynamics.rng = np.random.default_rng(seed)
+            self.dynamics.reset()
+        return self.observe_arrays()
+
+    def observe_arrays(self) -> ArrayState:
+        # Live view: the arrays are updated in place by step(). Use .copy() to keep a snapshot.
+        return self._state
+
+    def observe_state(self) -> Dict[str, Any]:
+        return self._state.to_dict()
+
+    def step_decay(self, dt_s: float) -> None:
+        decay_queues(self.queue_work_mi, self.util, self._drain, self._cap_safe, dt_s)
+
+    def _resolve(self, node: Union[str, int]) -> int:
+        if isinstance(node, str):
+            return self.node_index[node]
+        return int(node)
+
+    def step(self, task: Task, node: Union[str, int]) -> Tuple[ArrayState, StepResult, bool, Dict[str, Any]]:
+        i = self._resolve(node)
+        f = self._f_safe[i]
+        t_exec = float(task.c_mi) / f
+        t_queue = max(0.0, self.queue_work_mi[i]) / f
+        if self.sources is not None:
+            t_comm = self.sources.comm_time_one(float(task.s_mb), getattr(task, "source", 0), i)
+        elif self.dynamics is not None:
+            t_comm = self.dynamics.comm_time_one(float(task.s_mb), i)
+        else:
+            # Static links: the exact EdgeCloudEnv formula, so both envs agree bit for bit.
+            t_comm = float(comm_time(float(task.s_mb), self.links.bandwidth_mbps[i], self.links.rtt_ms[i], self.links.loss[i], self.links.overhead_ms[i]))
+        latency = t_exec + t_queue + t_comm
+
+        vio = violation_indicator(latency, float(task.d_s))
+        pen = sla_penalty(latency, float(task.d_s), hard_deadline=self.sla.hard_deadline)
+        p_w = self.nodes.power_idle_w[i] + self.util[i] * self.nodes.power_dyn_w[i]
+        energy = p_w * t_exec + NIC_POWER_W * t_comm
+
+        self.queue_work_mi[i] += float(task.c_mi)
+        self.step_decay(self.dt_s)
+        if self.dynamics is not None:
+            self.dynamics.advance(self.dt_s)
+
+        res = StepResult(
+            node_id=self.nodes.node_ids[i],
+            latency_s=float(latency),
+            energy_j=float(energy),
+            violation=int(vio),
+            sla_penalty=float(pen),
+            t_exec_s=float(t_exec),
+            t_queue_s=float(t_queue),
+            t_comm_s=float(t_comm),
+        )
+        return self.observe_arrays(), res, False, {}
@@ -0,0 +1,135 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+import numpy as np
+
+from .resources import ResourcePool
+from .network import NetworkModel
+
+@dataclass
+class NodeArrays:
+    node_ids: List[str]
+    is_cloud: np.ndarray             # bool (N,)
+    f_mi_s: np.ndarray               # float64 (N,)
+    capacity_mi_step: np.ndarray
+    power_idle_w: np.ndarray
+    power_dyn_w: np.ndarray
+    energy_budget_j_step: np.ndarray  # -1.0 where the node has no budget
+
+    @classmethod
+    def from_pool(cls, pool: ResourcePool, node_ids: Optional[List[str]] = None) -> "NodeArrays":
+        ids = list(node_ids) if node_ids is not None else pool.all_ids()
+        nodes = [pool.get(nid) for nid in ids]
+        return cls(
+            node_ids=ids,
+            is_cloud=np.array([str(n.kind).lower() == "cloud" for n in nodes], dtype=bool),
+            f_mi_s=np.array([n.f for n in nodes], dtype=np.float64),
+            capacity_mi_step=np.array([n.capacity_mi_per_step for n in nodes], dtype=np.float64),
+            power_idle_w=np.array([n.power_idle_w for n in nodes], dtype=np.float64),
+            power_dyn_w=np.array([n.power_dyn_w for n in nodes], dtype=np.float64),
+            energy_budget_j_step=np.array(
+                [-1.0 if n.energy_budget_j_per_step is None else n.energy_budget_j_per_step for n in nodes],
+                dtype=np.float64,
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def index(self) -> Dict[str, int]:
+        return {nid: i for i, nid in enumerate(self.node_ids)}
+
+@dataclass
+class LinkArrays:
+    bandwidth_mbps: np.ndarray
+    rtt_ms: np.ndarray
+    loss: np.ndarray
+    overhead_ms: np.ndarray
+
+    @classmethod
+    def from_network(cls, network: NetworkModel, src: str, node_ids: List[str]) -> "LinkArrays":
+        links = [network.get_link(src, nid) for nid in node_ids]
+        return cls(
+            bandwidth_mbps=np.array([l.bandwidth_mbps for l in links], dtype=np.float64),
+            rtt_ms=np.array([l.rtt_ms for l in links], dtype=np.float64),
+            loss=np.array([l.loss for l in links], dtype=np.float64),
+            overhead_ms=np.array([l.overhead_ms for l in links], dtype=np.float64),
+        )
+
+@dataclass
+class ArrayState:
+    # Typed array view of the env state. Spec and link columns are (N,); runtime
+    # columns are (N,) for a single env or (B, N) for a vectorized one.
+    node_ids: List[str]
+    is_cloud: np.ndarray
+    f_mi_s: np.ndarray
+    capacity_mi_step: np.ndarray
+    queue_work_mi: np.ndarray
+    util: np.ndarray
+    energy_budget_j_step: np.ndarray
+    bandwidth_mbps: np.ndarray
+    rtt_ms: np.ndarray
+    loss: np.ndarray
+    sources: Any = None  # SourceLinks for multi-source envs; link columns above are source 0
+    comm: Any = None     # cached comm-time coefficients (DynamicNetwork or SourceLinks) over the link columns
+
+    @classmethod
+    def from_arrays(cls, nodes: NodeArrays, links: LinkArrays, queue_work_mi: np.ndarray, util: np.ndarray, sources: Any = None,
+                    comm: Any = None) -> "ArrayState":
+        return cls(
+            node_ids=nodes.node_ids,
+            is_cloud=nodes.is_cloud,
+            f_mi_s=nodes.f_mi_s,
+            capacity_mi_step=nodes.capacity_mi_step,
+            queue_work_mi=queue_work_mi,
+            util=util,
+            energy_budget_j_step=nodes.energy_budget_j_step,
+            bandwidth_mbps=links.bandwidth_mbps,
+            rtt_ms=links.rtt_ms,
+            loss=links.loss,
+            sources=sources,
+            comm=comm,
+        )
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_ids)
+
+    def copy(self) -> "ArrayState":
+        return ArrayState(
+            node_ids=list(self.node_ids),
+            is_cloud=self.is_cloud.copy(),
+            f_mi_s=self.f_mi_s.copy(),
+            capacity_mi_step=self.capacity_mi_step.copy(),
+            queue_work_mi=self.queue_work_mi.copy(),
+            util=self.util.copy(),
+            energy_budget_j_step=self.energy_budget_j_step.copy(),
+            bandwidth_mbps=self.bandwidth_mbps.copy(),
+            rtt_ms=self.rtt_ms.copy(),
+            loss=self.loss.copy(),
+            sources=self.sources,   # comm is dropped: its coefficients track the live links
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.queue_work_mi.ndim != 1:
+            raise ValueError("to_dict() needs a single-env state; index the replica first.")
+        nodes = []
+        for i, nid in enumerate(self.node_ids):
+            budget = float(self.energy_budget_j_step[i])
+            nodes.append({
+                "node_id": nid,
+                "kind": "cloud" if self.is_cloud[i] else "edge",
+                "f_mi_s": float(self.f_mi_s[i]),
+                "capacity_mi_step": float(self.capacity_mi_step[i]),
+                "queue_work_mi": float(self.queue_work_mi[i]),
+                "util": float(self.util[i]),
+                "energy_budget_j_step": None if budget < 0 else budget,
+                "bandwidth_mbps": float(self.bandwidth_mbps[i]),
+                "rtt_ms": float(self.rtt_ms[i]),
+                "loss": float(self.loss[i]),
+            })
+        if self.sources is not None and self.sources.num_sources > 1:
+            bw, rtt, loss = self.sources.gather(np.arange(self.sources.num_sources))
+            for i, n in enumerate(nodes):
+                n["source_links"] = [(float(bw[s, i]), float(rtt[s, i]), float(loss[s, i])) for s in range(bw.shape[0])]
+        return {"nodes": nodes}
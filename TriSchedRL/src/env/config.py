@@ -0,0 +1,79 @@
+from __future__ import annotations
+from typing import Any, Dict, Tuple
+
+from .resources import ResourcePool, Node
+from .network import NetworkModel, Link
+from .sla import SLAConfig
+
+def build_env_components(cfg: Dict[str, Any]) -> Tuple[ResourcePool, NetworkModel, SLAConfig, float]:
+    # cfg has the layout of configs/env.yaml (already parsed).
+    pool = ResourcePool()
+    for n in cfg["nodes"]:
+        pool.add_node(Node(
+            node_id=str(n["node_id"]),
+            kind=str(n["kind"]),
+            f=float(n["f_mi_s"]),
+            capacity_mi_per_step=float(n["capacity_mi_per_step"]),
+            power_idle_w=float(n["power_idle_w"]),
+            power_dyn_w=float(n["power_dyn_w"]),
+            energy_budget_j_per_step=None if n.get("energy_budget_j_per_step") is None else float(n["energy_budget_j_per_step"]),
+        ))
+    net = NetworkModel()
+    for l in cfg["links"]:
+        net.set_link(str(l["src"]), str(l["dst"]), Link(
+            bandwidth_mbps=float(l["bandwidth_mbps"]),
+            rtt_ms=float(l["rtt_ms"]),
+            loss=float(l["loss"]),
+            overhead_ms=float(l.get("overhead_ms", 1.0)),
+        ))
+    if cfg.get("routing", "direct") == "multihop":
+        # links describe a graph (gateways, edges, clouds, inter-edge); the
+        # source->node links the envs read become route-equivalent links.
+        from .topology import Topology
+        topo = Topology.from_network(net, bidirectional=bool(cfg.get("bidirectional", False)),
+                                     ref_mb=float(cfg.get("route_ref_mb", 1.0)))
+        net.topology = topo
+        topo.bind_network(net, str(cfg.get("src_id", "iot")), pool.all_ids())
+    sla = SLAConfig(hard_deadline=bool(cfg.get("sla", {}).get("hard_deadline", True)))
+    return pool, net, sla, float(cfg.get("dt_s", 1.0))
+
+def load_yaml(path: str) -> Dict[str, Any]:
+    import yaml
+    with open(path) as f:
+        return yaml.safe_load(f)
+
+def synthetic_env_cfg(n_nodes: int, seed: int = 0, cloud_every: int = 16, src_id: str = "iot", n_sources: int = 1) -> Dict[str, Any]:
+    # configs/env.yaml-shaped cluster of n_nodes for scaling runs: edge nodes
+    # drawn around the demo edge specs, every cloud_every-th node a cloud node.
+    # n_sources > 1 adds gateways gw0.. (listed under "sources") linked to every node.
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    nodes, links = [], []
+    for i in range(int(n_nodes)):
+        cloud = cloud_every > 0 and i % cloud_every == cloud_every - 1
+        nid = f"cloud{i}" if cloud else f"edge{i}"
+        f = 2500.0 if cloud else float(rng.uniform(400.0, 900.0))
+        nodes.append({
+            "node_id": nid, "kind": "cloud" if cloud else "edge", "f_mi_s": f,
+            "capacity_mi_per_step": (2.4 if cloud else 1.5) * f,
+            "power_idle_w": 20.0 if cloud else float(rng.uniform(3.0, 4.5)),
+            "power_dyn_w": 60.0 if cloud else float(rng.uniform(8.0, 13.0)),
+            "energy_budget_j_per_step": None if cloud else float(rng.uniform(25.0, 45.0)),
+        })
+        links.append({
+            "src": src_id, "dst": nid,
+            "bandwidth_mbps": 30.0 if cloud else float(rng.uniform(30.0, 100.0)),
+            "rtt_ms": 60.0 if cloud else float(rng.uniform(8.0, 25.0)),
+            "loss": float(rng.uniform(0.0, 0.03)),
+            "overhead_ms": 2.0 if cloud else 1.0,
+        })
+    cfg = {"dt_s": 1.0, "sla": {"hard_deadline": True}, "nodes": nodes, "links": links}
+    if n_sources > 1:
+        # Each gateway sees the base links scaled by its own distance factors.
+        base = links
+        cfg["sources"] = [f"gw{k}" for k in range(int(n_sources))]
+        bw_f = rng.uniform(0.5, 1.5, (int(n_sources), len(base)))
+        rtt_f = rng.uniform(0.7, 2.0, (int(n_sources), len(base)))
+        cfg["links"] = [dict(l, src=g, bandwidth_mbps=l["bandwidth_mbps"] * float(bw_f[k, j]), rtt_ms=l["rtt_ms"] * float(rtt_f[k, j]))
+                        for k, g in enumerate(cfg["sources"]) for j, l in enumerate(base)]
+    return cfg
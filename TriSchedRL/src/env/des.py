@@ -0,0 +1,225 @@
+from __future__ import annotations
+import heapq
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import numpy as np
+
+from src.workloads.task import IoTTask
+from .resources import ResourcePool
+from .network import Link, NetworkModel
+from .sla import SLAConfig, violation_indicator, sla_penalty
+from .arrays import NodeArrays, LinkArrays, ArrayState
+from .array_env import NIC_POWER_W
+from .dynamic_network import DynamicNetwork
+from .edgecloud_env import Task, StepResult
+
+# Event kinds double as tie-break priority: at equal timestamps completions and
+# link changes are applied before the arrival that observes them.
+COMPLETION = 0
+LINK_CHANGE = 1
+ARRIVAL = 2
+
+Event = Tuple[float, int, Any]
+
+class EventQueue:
+    def __init__(self):
+        self._heap: List[Tuple[float, int, int, Any]] = []
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, t: float, kind: int, payload: Any = None) -> None:
+        heapq.heappush(self._heap, (float(t), int(kind), self._seq, payload))
+        self._seq += 1
+
+    def pop(self) -> Event:
+        t, kind, _, payload = heapq.heappop(self._heap)
+        return t, kind, payload
+
+    def peek_time(self) -> float:
+        return self._heap[0][0] if self._heap else float("inf")
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._seq = 0
+
+def _iter_arrivals(arrivals: Iterable) -> Iterator[Tuple[float, IoTTask]]:
+    # Accepts (t, task) pairs or ArrivalChunk-like objects (stream()/TraceReader).
+    for item in arrivals:
+        if hasattr(item, "iter_tasks"):
+            yield from item.iter_tasks()
+        else:
+            yield item
+
+class DiscreteEventEnv:
+    # Event-driven variant of ArrayEdgeCloudEnv. Simulated time follows the
+    # arrival timestamps; each node's queue is drained lazily to the current time
+    # only when a decision (or a completion event) touches it, so a step is O(1)
+    # in the node count plus O(log n) for the event heap.
+    def __init__(self, resources: ResourcePool, network: NetworkModel, sla: SLAConfig, src_id: str = "iot"):
+        self.resources = resources
+        self.network = network
+        self.sla = sla
+        self.src_id = src_id
+        self.nodes = NodeArrays.from_pool(resources)
+        self.links = LinkArrays.from_network(network, src_id, self.nodes.node_ids)
+        self._base_links = LinkArrays(*(getattr(self.links, k).copy() for k in ("bandwidth_mbps", "rtt_ms", "loss", "overhead_ms")))
+        self.node_index = self.nodes.index()
+        n = len(self.nodes)
+        self.queue_work_mi = np.zeros(n, dtype=np.float64)
+        self.util = np.zeros(n, dtype=np.float64)
+        self.last_t = np.zeros(n, dtype=np.float64)
+        self.in_flight = np.zeros(n, dtype=np.int64)
+        self._f_safe = np.maximum(1e-9, self.nodes.f_mi_s)
+        self._drain = np.maximum(0.0, self.nodes.f_mi_s)
+        self._cap_safe = np.maximum(1e-6, self.nodes.capacity_mi_step)
+        self._links_cache = DynamicNetwork(self.links)
+        self._state = ArrayState.from_arrays(self.nodes, self.links, self.queue_work_mi, self.util, comm=self._links_cache)
+        self.events = EventQueue()
+        self.now = 0.0
+        self.completed = 0
+        self._source: Optional[Iterator[Tuple[float, IoTTask]]] = None
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.nodes)
+
+    def reset(self, seed: int = 0, arrivals: Optional[Iterable] = None) -> ArrayState:
+        self.queue_work_mi[:] = 0.0
+        self.util[:] = 0.0
+        self.last_t[:] = 0.0
+        self.in_flight[:] = 0
+        b = self._base_links   # undo LINK_CHANGE events
+        self._links_cache.update(None, b.bandwidth_mbps, b.rtt_ms, b.loss, b.overhead_ms)
+        self.events.clear()
+        self.now = 0.0
+        self.completed = 0
+        self._source = None
+        if arrivals is not None:
+            self.load(arrivals)
+        return self._state
+
+    def load(self, arrivals: Iterable) -> None:
+        # Only the next pending arrival is kept on the heap, so arbitrarily long
+        # streams are consumed lazily.
+        self._source = _iter_arrivals(arrivals)
+        self._push_next_arrival()
+
+    def _push_next_arrival(self) -> None:
+        nxt = next(self._source, None) if self._source is not None else None
+        if nxt is None:
+            self._source = None
+            return
+        t, task = nxt
+        self.events.push(t, ARRIVAL, task)
+
+    def schedule_link_change(self, t: float, dst: str, link: Link) -> None:
+        self.events.push(t, LINK_CHANGE, (self.node_index[dst], link))
+
+    def _advance(self, i: int, t: float) -> None:
+        q = self.queue_work_mi[i] - self._drain[i] * max(0.0, t - self.last_t[i])
+        q = q if q > 0.0 else 0.0
+        self.queue_work_mi[i] = q
+        self.util[i] = min(1.0, q / self._cap_safe[i])
+        self.last_t[i] = t
+
+    def sync(self) -> None:
+        # Bring every node to self.now in one vectorized pass.
+        elapsed = np.maximum(0.0, self.now - self.last_t)
+        np.subtract(self.queue_work_mi, self._drain * elapsed, out=self.queue_work_mi)
+        np.maximum(self.queue_work_mi, 0.0, out=self.queue_work_mi)
+        np.divide(self.queue_work_mi, self._cap_safe, out=self.util)
+        np.minimum(self.util, 1.0, out=self.util)
+        self.last_t[:] = self.now
+
+    def observe_arrays(self, sync: bool = True) -> ArrayState:
+        # Live view. Without sync, untouched nodes report their queue as of their
+        # last event rather than self.now.
+        if sync:
+            self.sync()
+        return self._state
+
+    def observe_state(self) -> Dict[str, Any]:
+        return self.observe_arrays().to_dict()
+
+    def _apply(self, t: float, kind: int, payload: Any) -> None:
+        self.now = max(self.now, t)
+        if kind == COMPLETION:
+            i = payload
+            self._advance(i, t)
+            self.in_flight[i] -= 1
+            self.completed += 1
+        elif kind == LINK_CHANGE:
+            i, link = payload
+            self._links_cache.set_link(i, link)
+
+    def next_arrival(self) -> Optional[Tuple[float, IoTTask]]:
+        # Processes completions/link changes up to and including the next arrival,
+        # advances the clock to it and returns it; None once arrivals run out.
+        while self.events:
+            t, kind, payload = self.events.pop()
+            if kind == ARRIVAL:
+                self.now = max(self.now, t)
+                self._push_next_arrival()
+                return t, payload
+            self._apply(t, kind, payload)
+        return None
+
+    def drain(self) -> None:
+        # Runs all remaining non-arrival events (e.g. after the last arrival).
+        while self.events:
+            t, kind, payload = self.events.pop()
+            if kind == ARRIVAL:
+                self.events.push(t, kind, payload)
+                return
+            self._apply(t, kind, payload)
+
+    def _resolve(self, node: Union[str, int]) -> int:
+        if isinstance(node, str):
+            return self.node_index[node]
+        return int(node)
+
+    def step(self, task: Union[Task, IoTTask], node: Union[str, int]) -> Tuple[ArrayState, StepResult, bool, Dict[str, Any]]:
+        # Places task at self.now; only the chosen node is advanced and updated.
+        i = self._resolve(node)
+        self._advance(i, self.now)
+        f = self._f_safe[i]
+        t_exec = float(task.c_mi) / f
+        t_queue = self.queue_work_mi[i] / f
+        t_comm = self._links_cache.comm_time_one(float(task.s_mb), i)
+        latency = t_exec + t_queue + t_comm
+
+        vio = violation_indicator(latency, float(task.d_s))
+        pen = sla_penalty(latency, float(task.d_s), hard_deadline=self.sla.hard_deadline)
+        p_w = self.nodes.power_idle_w[i] + self.util[i] * self.nodes.power_dyn_w[i]
+        energy = p_w * t_exec + NIC_POWER_W * t_comm
+
+        self.queue_work_mi[i] += float(task.c_mi)
+        self.util[i] = min(1.0, self.queue_work_mi[i] / self._cap_safe[i])
+        self.in_flight[i] += 1
+        self.events.push(self.now + latency, COMPLETION, i)
+
+        res = StepResult(
+            node_id=self.nodes.node_ids[i],
+            latency_s=float(latency),
+            energy_j=float(energy),
+            violation=int(vio),
+            sla_penalty=float(pen),
+            t_exec_s=float(t_exec),
+            t_queue_s=float(t_queue),
+            t_comm_s=float(t_comm),
+        )
+        return self._state, res, False, {"t": self.now}
+
+    def run(self, policy: Callable[["DiscreteEventEnv", IoTTask], Union[str, int]], arrivals: Optional[Iterable] = None) -> Iterator[Tuple[float, IoTTask, StepResult]]:
+        # Drives the event loop: policy(env, task) picks a node for each arrival.
+        if arrivals is not None:
+            self.load(arrivals)
+        while True:
+            nxt = self.next_arrival()
+            if nxt is None:
+                break
+            t, task = nxt
+            _, res, _, _ = self.step(task, policy(self, task))
+            yield t, task, res
+        self.drain()
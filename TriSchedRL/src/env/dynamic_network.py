@@ -0,0 +1,217 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Sequence
+import numpy as np
+
+from .network import Link, NetworkModel
+from .arrays import LinkArrays
+
+class DynamicNetwork:
+    # Time-varying link state over a LinkArrays (updated in place, so any
+    # ArrayState built on the same arrays sees the change). comm_time is affine
+    # in the payload, t = tx_coef * s_mb + const, so both coefficients are cached
+    # per link and refreshed only for links marked dirty by update().
+    def __init__(self, links: LinkArrays, processes: Sequence["LinkProcess"] = (), seed: int = 0):
+        self.links = links
+        self.processes = list(processes)
+        self.rng = np.random.default_rng(seed)
+        self.t = 0.0
+        self.version = 0
+        n = links.bandwidth_mbps.shape[0]
+        self.base_bandwidth_mbps = links.bandwidth_mbps.copy()
+        self.base_rtt_ms = links.rtt_ms.copy()
+        self.base_loss = links.loss.copy()
+        self.tx_coef = np.zeros(n, dtype=np.float64)       # s per MB
+        self.inflation = np.zeros(n, dtype=np.float64)
+        self.one_way_s = np.zeros(n, dtype=np.float64)
+        self.const_s = np.zeros(n, dtype=np.float64)       # inflation * (one-way + link overhead)
+        self.prop_s = np.zeros(n, dtype=np.float64)        # inflation * one-way
+        self._dirty = np.ones(n, dtype=bool)
+        self.n_refreshed = 0
+        self.listeners: List[Callable[[Optional[np.ndarray]], None]] = []  # called with the updated idx (None = all)
+        for p in self.processes:
+            p.bind(self)
+        self.refresh()
+
+    @property
+    def num_links(self) -> int:
+        return int(self._dirty.shape[0])
+
+    def update(self, idx=None, bandwidth_mbps=None, rtt_ms=None, loss=None, overhead_ms=None) -> None:
+        # Bulk write for idx (None = all links); values broadcast against idx.
+        sel = slice(None) if idx is None else np.asarray(idx, dtype=np.int64)
+        if isinstance(sel, np.ndarray) and sel.size == 0:
+            return
+        for arr, v in ((self.links.bandwidth_mbps, bandwidth_mbps), (self.links.rtt_ms, rtt_ms),
+                       (self.links.loss, loss), (self.links.overhead_ms, overhead_ms)):
+            if v is not None:
+                arr[sel] = v
+        self._dirty[sel] = True
+        self.version += 1
+        for fn in self.listeners:
+            fn(None if idx is None else sel)
+
+    def set_link(self, i: int, link: Link) -> None:
+        self.update([i], link.bandwidth_mbps, link.rtt_ms, link.loss, link.overhead_ms)
+
+    def refresh(self) -> None:
+        if not self._dirty.any():
+            return
+        idx = np.flatnonzero(self._dirty)
+        l = self.links
+        inflation = 1.0 / (1.0 - np.clip(l.loss[idx], 0.0, 0.99))
+        self.inflation[idx] = inflation
+        self.tx_coef[idx] = inflation * 8.0 / np.maximum(1e-6, l.bandwidth_mbps[idx])
+        self.one_way_s[idx] = (np.maximum(0.0, l.rtt_ms[idx]) / 1000.0) / 2.0
+        self.prop_s[idx] = inflation * self.one_way_s[idx]
+        self.const_s[idx] = self.prop_s[idx] + inflation * np.maximum(0.0, l.overhead_ms[idx]) / 1000.0
+        self._dirty[idx] = False
+        self.n_refreshed += idx.size
+
+    def comm_time(self, s_mb, idx=None, overhead_ms: Optional[float] = None) -> np.ndarray:
+        # Same values as network.comm_time. idx gathers links (default all, so
+        # (T, 1) payloads give (T, N)); overhead_ms replaces the per-link overhead,
+        # as the predictors do.
+        self.refresh()
+        sel = slice(None) if idx is None else idx
+        s = np.maximum(0.0, s_mb)
+        if overhead_ms is None:
+            return self.tx_coef[sel] * s + self.const_s[sel]
+        return self.tx_coef[sel] * s + self.inflation[sel] * (self.one_way_s[sel] + max(0.0, overhead_ms) / 1000.0)
+
+    def comm_coefficients(self, src=None):
+        # (tx_coef, inflation, prop_s) for network.comm_time_cached; src is
+        # ignored (one source). Carried on ArrayState so predictors skip comm_time.
+        self.refresh()
+        return self.tx_coef, self.inflation, self.prop_s
+
+    def comm_time_one(self, s_mb: float, i: int) -> float:
+        if self._dirty[i]:
+            self.refresh()
+        return float(self.tx_coef[i] * max(0.0, s_mb) + self.const_s[i])
+
+    def advance(self, dt_s: float) -> None:
+        # Moves every process forward by dt_s of simulated time.
+        self.t += dt_s
+        for p in self.processes:
+            p.advance(self, self.t, dt_s)
+
+    def reset(self) -> None:
+        self.t = 0.0
+        self.update(None, self.base_bandwidth_mbps, self.base_rtt_ms, self.base_loss)
+        for p in self.processes:
+            p.bind(self)
+
+    def export_links(self, network: NetworkModel, src: str, node_ids: List[str]) -> None:
+        # Writes the current state back as Link objects (for the dict-based env).
+        l = self.links
+        for i, nid in enumerate(node_ids):
+            network.set_link(src, nid, Link(float(l.bandwidth_mbps[i]), float(l.rtt_ms[i]), float(l.loss[i]), float(l.overhead_ms[i])))
+
+def _switch_prob(rate_per_s, dt_s: float) -> np.ndarray:
+    return -np.expm1(-np.asarray(rate_per_s, dtype=np.float64) * max(0.0, dt_s))
+
+class LinkProcess(ABC):
+    # bind() (re)initializes per-link state; advance() writes changes through
+    # DynamicNetwork.update so only the touched links are invalidated.
+    def bind(self, net: DynamicNetwork) -> None:
+        pass
+
+    @abstractmethod
+    def advance(self, net: DynamicNetwork, t: float, dt_s: float) -> None:
+        ...
+
+@dataclass
+class GilbertElliottLoss(LinkProcess):
+    # Two-state Markov loss per link: good/bad with continuous-time switching
+    # rates; loss jumps between loss_good and loss_bad.
+    good_to_bad_per_s: float = 0.05
+    bad_to_good_per_s: float = 0.5
+    loss_good: Optional[float] = None   # None keeps each link's base loss
+    loss_bad: float = 0.25
+    bad: np.ndarray = field(default=None, repr=False)
+
+    def bind(self, net: DynamicNetwork) -> None:
+        self.bad = np.zeros(net.num_links, dtype=bool)
+        self._good = net.base_loss.copy() if self.loss_good is None else np.full(net.num_links, float(self.loss_good))
+        net.update(None, loss=self._good)
+
+    def advance(self, net: DynamicNetwork, t: float, dt_s: float) -> None:
+        p = np.where(self.bad, _switch_prob(self.bad_to_good_per_s, dt_s), _switch_prob(self.good_to_bad_per_s, dt_s))
+        flip = np.flatnonzero(net.rng.random(self.bad.shape[0]) < p)
+        if flip.size:
+            self.bad[flip] = ~self.bad[flip]
+            net.update(flip, loss=np.where(self.bad[flip], self.loss_bad, self._good[flip]))
+
+@dataclass
+class MarkovModulatedLink(LinkProcess):
+    # Per-link congestion level k in 0..K-1: bandwidth = base * bw_levels[k],
+    # RTT = base * rtt_levels[k]. Links leave their level at switch_per_s and
+    # jump according to row k of `transition` (default: uniform over the others).
+    bw_levels: Sequence[float] = (1.0, 0.6, 0.25)
+    rtt_levels: Sequence[float] = (1.0, 1.5, 3.0)
+    switch_per_s: float = 0.1
+    transition: Optional[np.ndarray] = None
+    level: np.ndarray = field(default=None, repr=False)
+
+    def bind(self, net: DynamicNetwork) -> None:
+        K = len(self.bw_levels)
+        P = np.ones((K, K)) - np.eye(K) if self.transition is None else np.asarray(self.transition, dtype=np.float64)
+        self._cum = np.cumsum(P / P.sum(axis=1, keepdims=True), axis=1)
+        self._bw = np.asarray(self.bw_levels, dtype=np.float64)
+        self._rtt = np.asarray(self.rtt_levels, dtype=np.float64)
+        self.level = np.zeros(net.num_links, dtype=np.int64)
+        net.update(None, bandwidth_mbps=net.base_bandwidth_mbps * self._bw[0], rtt_ms=net.base_rtt_ms * self._rtt[0])
+
+    def advance(self, net: DynamicNetwork, t: float, dt_s: float) -> None:
+        moved = np.flatnonzero(net.rng.random(self.level.shape[0]) < _switch_prob(self.switch_per_s, dt_s))
+        if not moved.size:
+            return
+        u = net.rng.random(moved.size)[:, None]
+        lv = np.minimum((u > self._cum[self.level[moved]]).sum(axis=1), self._cum.shape[1] - 1)
+        self.level[moved] = lv
+        net.update(moved, bandwidth_mbps=net.base_bandwidth_mbps[moved] * self._bw[lv], rtt_ms=net.base_rtt_ms[moved] * self._rtt[lv])
+
+@dataclass
+class TraceLinkProcess(LinkProcess):
+    # Replays recorded link state: row r of each (R, L) array holds from
+    # times[r] until times[r + 1]. Only links whose value changed are updated.
+    times: Optional[np.ndarray] = None   # required; Optional only so the dataclass fields can default
+    bandwidth_mbps: Optional[np.ndarray] = None
+    rtt_ms: Optional[np.ndarray] = None
+    loss: Optional[np.ndarray] = None
+    period_s: Optional[float] = None   # replay the trace cyclically
+
+    def __post_init__(self) -> None:
+        if self.times is None:
+            raise ValueError("TraceLinkProcess needs times")
+        self.times = np.asarray(self.times, dtype=np.float64)
+        if self.times.ndim != 1 or np.any(np.diff(self.times) < 0):
+            raise ValueError("TraceLinkProcess times must be a non-decreasing 1-D array")
+        for k in ("bandwidth_mbps", "rtt_ms", "loss"):
+            v = getattr(self, k)
+            if v is not None and np.shape(v)[0] != self.times.shape[0]:
+                raise ValueError(f"TraceLinkProcess {k} needs one row per entry of times")
+
+    def bind(self, net: DynamicNetwork) -> None:
+        self._row = -1
+        self._apply(net, 0.0)
+
+    def _apply(self, net: DynamicNetwork, t: float) -> None:
+        if self.period_s:
+            t = t % self.period_s
+        row = int(np.searchsorted(self.times, t, side="right")) - 1
+        if row < 0 or row == self._row:
+            return
+        cols = {k: getattr(self, k) for k in ("bandwidth_mbps", "rtt_ms", "loss") if getattr(self, k) is not None}
+        new = {k: np.asarray(v, dtype=np.float64)[row] for k, v in cols.items()}
+        changed = np.zeros(net.num_links, dtype=bool)
+        for k, v in new.items():
+            changed |= getattr(net.links, k) != v
+        idx = np.flatnonzero(changed)
+        net.update(idx, **{k: v[idx] for k, v in new.items()})
+        self._row = row
+
+    def advance(self, net: DynamicNetwork, t: float, dt_s: float) -> None:
+        self._apply(net, t)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Optional, Sequence, Tuple
 
 from .resources import ResourcePool
 from .network import NetworkModel
@@ -13,6 +13,7 @@ class Task:
     d_s: float
     s_mb: float
     p: int
+    source: int = 0
 
 @dataclass
 class StepResult:
@@ -26,11 +27,15 @@ class StepResult:
     t_comm_s: float
 
 class EdgeCloudEnv:
-    def __init__(self, resources: ResourcePool, network: NetworkModel, sla: SLAConfig, dt_s: float = 1.0):
+    def __init__(self, resources: ResourcePool, network: NetworkModel, sla: SLAConfig, dt_s: float = 1.0,
+                 source_ids: Optional[Sequence[str]] = None):
         self.resources = resources
         self.network = network
         self.sla = sla
         self.dt_s = float(dt_s)
+        # task.source indexes this list; observe_state reports links from the first
+        # and, with several sources, every source's links per node.
+        self.source_ids = list(source_ids) if source_ids else ["iot"]
 
     def reset(self, seed: int = 0) -> Dict[str, Any]:
         self.resources.reset_runtime()
@@ -41,7 +46,7 @@ class EdgeCloudEnv:
         for nid in self.resources.all_ids():
             node = self.resources.get(nid)
             rt = self.resources.get_runtime(nid)
-            link = self.network.get_link("iot", nid)
+            link = self.network.get_link(self.source_ids[0], nid)
             nodes.append({
                 "node_id": nid,
                 "kind": node.kind,
@@ -54,6 +59,11 @@ class EdgeCloudEnv:
                 "rtt_ms": float(link.rtt_ms),
                 "loss": float(link.loss),
             })
+            if len(self.source_ids) > 1:
+                nodes[-1]["source_links"] = [
+                    (float(l.bandwidth_mbps), float(l.rtt_ms), float(l.loss))
+                    for l in (self.network.get_link(s, nid) for s in self.source_ids)
+                ]
         return {"nodes": nodes}
 
     def _t_exec(self, task: Task, node_id: str) -> float:
@@ -66,7 +76,7 @@ class EdgeCloudEnv:
         return float(max(0.0, rt.queue_work_mi) / f)
 
     def _t_comm(self, task: Task, node_id: str) -> float:
-        link = self.network.get_link("iot", node_id)
+        link = self.network.get_link(self.source_ids[getattr(task, "source", 0)], node_id)
         mbps = max(1e-6, float(link.bandwidth_mbps))
         rate_mb_s = mbps / 8.0
         tx_s = max(0.0, float(task.s_mb)) / rate_mb_s
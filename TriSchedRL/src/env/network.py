@@ -1,6 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, Tuple
+import numpy as np
 
 @dataclass
 class Link:
@@ -12,9 +13,24 @@ class Link:
 class NetworkModel:
     def __init__(self):
         self.links: Dict[Tuple[str, str], Link] = {}
+        self.topology = None  # set by build_env_components for routing: multihop
 
     def set_link(self, src: str, dst: str, link: Link) -> None:
         self.links[(src, dst)] = link
 
     def get_link(self, src: str, dst: str) -> Link:
         return self.links[(src, dst)]
+
+def comm_time(s_mb, bandwidth_mbps, rtt_ms, loss, overhead_ms):
+    # Array form of EdgeCloudEnv._t_comm; broadcasts over tasks and links.
+    rate_mb_s = np.maximum(1e-6, bandwidth_mbps) / 8.0
+    tx_s = np.maximum(0.0, s_mb) / rate_mb_s
+    one_way_s = (np.maximum(0.0, rtt_ms) / 1000.0) / 2.0
+    overhead_s = np.maximum(0.0, overhead_ms) / 1000.0
+    inflation = 1.0 / (1.0 - np.clip(loss, 0.0, 0.99))
+    return inflation * (tx_s + one_way_s + overhead_s)
+
+def comm_time_cached(s_mb, tx_coef, inflation, prop_s, overhead_ms):
+    # comm_time from per-link coefficients cached by DynamicNetwork/SourceLinks:
+    # tx_coef * s + inflation * one_way + inflation * overhead.
+    return tx_coef * np.maximum(0.0, s_mb) + prop_s + inflation * (max(0.0, overhead_ms) / 1000.0)
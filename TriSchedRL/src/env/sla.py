@@ -1,5 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
+import numpy as np
 
 @dataclass
 class SLAConfig:
@@ -15,3 +16,17 @@ def sla_penalty(latency_s: float, deadline_s: float, hard_deadline: bool = True)
     if hard_deadline:
         return 1.0 + tardiness
     return tardiness
+
+def reward_from_step(res, alpha: float, beta: float, gamma: float) -> float:
+    # Negative weighted cost of a StepResult with the meta-controller's current weights.
+    return -(alpha * float(res.sla_penalty) + beta * float(res.latency_s) + gamma * float(res.energy_j))
+
+def violation_indicator_batch(latency_s: np.ndarray, deadline_s: np.ndarray) -> np.ndarray:
+    return (latency_s > deadline_s).astype(np.int64)
+
+def sla_penalty_batch(latency_s: np.ndarray, deadline_s: np.ndarray, hard_deadline: bool = True) -> np.ndarray:
+    # Elementwise sla_penalty: same operations, so results match the scalar path exactly.
+    tardiness = latency_s - deadline_s
+    if hard_deadline:
+        tardiness = 1.0 + tardiness
+    return np.where(latency_s > deadline_s, tardiness, 0.0)
@@ -0,0 +1,162 @@
+from __future__ import annotations
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+from .network import NetworkModel
+from .arrays import LinkArrays
+
+class SourceLinks:
+    # Link state for S sources (IoT gateways) x N nodes. Dense: (S, N) columns.
+    # Sparse: (S, K) columns for the K nodes each source reaches, listed in
+    # cols (rows padded by repeating their first node); unreached pairs have
+    # infinite comm time. comm_time coefficients are cached per entry, so a batch
+    # of tasks from mixed sources is one row gather plus an affine evaluation.
+    def __init__(self, source_ids: Sequence[str], node_ids: Sequence[str], bandwidth_mbps: np.ndarray, rtt_ms: np.ndarray,
+                 loss: np.ndarray, overhead_ms: np.ndarray, cols: Optional[np.ndarray] = None):
+        self.source_ids = list(source_ids)
+        self.node_ids = list(node_ids)
+        self.source_index = {s: i for i, s in enumerate(self.source_ids)}
+        self.bandwidth_mbps = np.ascontiguousarray(bandwidth_mbps, dtype=np.float64)
+        self.rtt_ms = np.ascontiguousarray(rtt_ms, dtype=np.float64)
+        self.loss = np.ascontiguousarray(loss, dtype=np.float64)
+        self.overhead_ms = np.ascontiguousarray(overhead_ms, dtype=np.float64)
+        self.cols = None if cols is None else np.asarray(cols, dtype=np.int64)
+        self.tx_coef = np.empty_like(self.bandwidth_mbps)
+        self.inflation = np.empty_like(self.bandwidth_mbps)
+        self.one_way_s = np.empty_like(self.bandwidth_mbps)
+        self.const_s = np.empty_like(self.bandwidth_mbps)
+        self.prop_s = np.empty_like(self.bandwidth_mbps)
+        self._refresh((slice(None),))
+
+    @property
+    def num_sources(self) -> int:
+        return len(self.source_ids)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def sparse(self) -> bool:
+        return self.cols is not None
+
+    @classmethod
+    def from_network(cls, network: NetworkModel, source_ids: Sequence[str], node_ids: Sequence[str], sparse: bool = False) -> "SourceLinks":
+        # Dense requires every source->node link; sparse keeps the ones present.
+        if not sparse:
+            rows = [LinkArrays.from_network(network, s, list(node_ids)) for s in source_ids]
+            return cls(source_ids, node_ids, *(np.stack([getattr(r, k) for r in rows]) for k in ("bandwidth_mbps", "rtt_ms", "loss", "overhead_ms")))
+        index = {nid: j for j, nid in enumerate(node_ids)}
+        per_src: List[List[Tuple[int, object]]] = [[] for _ in source_ids]
+        src_index = {s: i for i, s in enumerate(source_ids)}
+        for (u, v), l in network.links.items():
+            if u in src_index and v in index:
+                per_src[src_index[u]].append((index[v], l))
+        K = max(1, max(len(r) for r in per_src))
+        cols = np.zeros((len(source_ids), K), dtype=np.int64)
+        vals = np.zeros((4, len(source_ids), K), dtype=np.float64)
+        vals[1] = np.inf
+        for s, r in enumerate(per_src):
+            if not r:
+                continue
+            r = sorted(r, key=lambda x: x[0])
+            r += [r[0]] * (K - len(r))
+            for k, (j, l) in enumerate(r):
+                cols[s, k] = j
+                vals[:, s, k] = (l.bandwidth_mbps, l.rtt_ms, l.loss, l.overhead_ms)
+        return cls(source_ids, node_ids, vals[0], vals[1], vals[2], vals[3], cols=cols)
+
+    @classmethod
+    def from_topology(cls, topo, source_ids: Sequence[str], node_ids: Sequence[str]) -> "SourceLinks":
+        # Dense route-equivalent links from a multi-hop Topology.
+        rows = [topo.effective_links(s, list(node_ids)) for s in source_ids]
+        return cls(source_ids, node_ids, *(np.stack([getattr(r, k) for r in rows]) for k in ("bandwidth_mbps", "rtt_ms", "loss", "overhead_ms")))
+
+    def _refresh(self, sel) -> None:
+        inflation = 1.0 / (1.0 - np.clip(self.loss[sel], 0.0, 0.99))
+        self.inflation[sel] = inflation
+        self.tx_coef[sel] = inflation * 8.0 / np.maximum(1e-6, self.bandwidth_mbps[sel])
+        self.one_way_s[sel] = (np.maximum(0.0, self.rtt_ms[sel]) / 1000.0) / 2.0
+        self.prop_s[sel] = inflation * self.one_way_s[sel]
+        self.const_s[sel] = self.prop_s[sel] + inflation * np.maximum(0.0, self.overhead_ms[sel]) / 1000.0
+
+    def refresh_row(self, src: int, node=None) -> None:
+        # Recomputes cached coefficients after an external in-place write to a
+        # dense row (e.g. a DynamicNetwork over row_links(src)).
+        self._refresh((int(src), slice(None) if node is None else np.asarray(node, dtype=np.int64)))
+
+    def update(self, src, node, bandwidth_mbps=None, rtt_ms=None, loss=None, overhead_ms=None) -> None:
+        # Elementwise (src[k], node[k]) writes; only those entries are refreshed.
+        src = np.asarray(src, dtype=np.int64).reshape(-1)
+        node = np.asarray(node, dtype=np.int64).reshape(-1)
+        if self.sparse:
+            # Every slot holding the node, so padding copies stay in sync.
+            hit = self.cols[src] == node[:, None]
+            if not hit.any(axis=1).all():
+                raise KeyError("update() for a source/node pair with no link")
+            pick, slots = np.nonzero(hit)
+            sel = (src[pick], slots)
+        else:
+            pick = np.arange(src.shape[0])
+            sel = (src, node)
+        for arr, v in ((self.bandwidth_mbps, bandwidth_mbps), (self.rtt_ms, rtt_ms), (self.loss, loss), (self.overhead_ms, overhead_ms)):
+            if v is not None:
+                arr[sel] = np.broadcast_to(v, src.shape)[pick]
+        self._refresh(sel)
+
+    def _scatter(self, src: np.ndarray, vals: np.ndarray, fill: float) -> np.ndarray:
+        out = np.full((src.shape[0], self.num_nodes), fill, dtype=np.float64)
+        out[np.arange(src.shape[0])[:, None], self.cols[src]] = vals
+        return out
+
+    def comm_time(self, s_mb, src, overhead_ms: Optional[float] = None) -> np.ndarray:
+        # (T, N) comm times for tasks with payloads s_mb (T,) from sources src (T,).
+        # overhead_ms replaces the per-link overhead, as the predictors do.
+        src = np.asarray(src, dtype=np.int64)
+        s = np.maximum(0.0, np.asarray(s_mb, dtype=np.float64)).reshape(-1, 1)
+        if overhead_ms is None:
+            t = self.tx_coef[src] * s + self.const_s[src]
+        else:
+            t = self.tx_coef[src] * s + self.inflation[src] * (self.one_way_s[src] + max(0.0, overhead_ms) / 1000.0)
+        return self._scatter(src, t, np.inf) if self.sparse else t
+
+    def comm_time_one(self, s_mb: float, src: int, i: int) -> float:
+        if self.sparse:
+            hit = np.flatnonzero(self.cols[src] == i)
+            if not hit.size:
+                return float("inf")
+            i = int(hit[0])
+        return float(self.tx_coef[src, i] * max(0.0, s_mb) + self.const_s[src, i])
+
+    def gather(self, src) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # (bandwidth_mbps, rtt_ms, loss) rows for each task's source, (T, N) for
+        # src of shape (T,) or (N,) for a scalar src. Unreached pairs read as
+        # bandwidth 0 / RTT inf, which comm_time turns into an infinite time.
+        src_arr = np.atleast_1d(np.asarray(src, dtype=np.int64))
+        if self.sparse:
+            cols = (self._scatter(src_arr, self.bandwidth_mbps[src_arr], 0.0),
+                    self._scatter(src_arr, self.rtt_ms[src_arr], np.inf),
+                    self._scatter(src_arr, self.loss[src_arr], 0.0))
+        else:
+            cols = (self.bandwidth_mbps[src_arr], self.rtt_ms[src_arr], self.loss[src_arr])
+        return tuple(c[0] for c in cols) if np.ndim(src) == 0 else cols
+
+    def comm_coefficients(self, src=0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # (tx_coef, inflation, prop_s) rows for network.comm_time_cached, shaped
+        # like gather(). Unreached pairs get prop_s = inf.
+        src_arr = np.atleast_1d(np.asarray(src, dtype=np.int64))
+        if self.sparse:
+            cols = (self._scatter(src_arr, self.tx_coef[src_arr], 0.0),
+                    self._scatter(src_arr, self.inflation[src_arr], 1.0),
+                    self._scatter(src_arr, self.prop_s[src_arr], np.inf))
+        else:
+            cols = (self.tx_coef[src_arr], self.inflation[src_arr], self.prop_s[src_arr])
+        return tuple(c[0] for c in cols) if np.ndim(src) == 0 else cols
+
+    def row_links(self, src: int = 0) -> LinkArrays:
+        # Source row as LinkArrays (views for dense storage).
+        if not self.sparse:
+            return LinkArrays(self.bandwidth_mbps[src], self.rtt_ms[src], self.loss[src], self.overhead_ms[src])
+        bw, rtt, loss = self.gather(src)
+        oh = self._scatter(np.array([src]), self.overhead_ms[[src]], 0.0)[0]
+        return LinkArrays(bw, rtt, loss, oh)
@@ -0,0 +1,260 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import heapq
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+from .network import Link, NetworkModel
+from .arrays import LinkArrays
+from .dynamic_network import DynamicNetwork, LinkProcess
+
+@dataclass
+class SourceRoutes:
+    # Shortest-path tree from one source. Per destination vertex: routing
+    # distance, the edge into it, and the path's comm_time as a_s_per_mb * s + b_s,
+    # so a lookup is O(1) whatever the hop count.
+    dist: np.ndarray
+    parent_edge: np.ndarray      # -1 for the source and unreachable vertices
+    a_s_per_mb: np.ndarray
+    b_s: np.ndarray
+    keep: np.ndarray             # end-to-end delivery probability, prod(1 - loss)
+    bottleneck_mbps: np.ndarray
+    hops: np.ndarray
+    tree: np.ndarray             # (E,) bool, edges used by the tree
+
+class Topology:
+    # Directed multi-hop graph (gateways, edges, clouds, inter-edge links).
+    # Edge state lives in a DynamicNetwork over per-edge LinkArrays; per-hop
+    # cost is store-and-forward comm_time, and routes minimize that cost for a
+    # reference payload of ref_mb. Route trees are computed per source on
+    # first use and cached; an edge update invalidates only the sources whose
+    # tree uses that edge, or that the edge would now shortcut.
+    def __init__(self, vertices: Sequence[str], src: np.ndarray, dst: np.ndarray, links: LinkArrays,
+                 ref_mb: float = 1.0, processes: Sequence[LinkProcess] = (), seed: int = 0):
+        self.vertices = list(vertices)
+        self.index = {v: i for i, v in enumerate(self.vertices)}
+        self.src = np.asarray(src, dtype=np.int64)
+        self.dst = np.asarray(dst, dtype=np.int64)
+        self.ref_mb = float(ref_mb)
+        V = len(self.vertices)
+        order = np.argsort(self.src, kind="stable")
+        self._indptr = np.searchsorted(self.src[order], np.arange(V + 1)).tolist()
+        self._adj_edge = order.tolist()
+        self._adj_dst = self.dst[order].tolist()
+        self.dyn = DynamicNetwork(links, processes, seed=seed)
+        self.weight = self._edge_weight(slice(None))
+        self._routes: Dict[int, SourceRoutes] = {}
+        self._pending: List[np.ndarray] = []
+        self._pending_all = False
+        self.n_dijkstra = 0
+        self._bindings: List[list] = []   # [sink, src, dsts, last pushed LinkArrays, SourceRoutes they came from]
+        self.dyn.listeners.append(self._on_update)
+
+    @classmethod
+    def from_links(cls, links: Iterable[Tuple[str, str, Link]], bidirectional: bool = False, **kwargs) -> "Topology":
+        vertices: Dict[str, int] = {}
+        rows = []
+        for u, v, l in links:
+            for a, b in ((u, v), (v, u)) if bidirectional else ((u, v),):
+                rows.append((vertices.setdefault(a, len(vertices)), vertices.setdefault(b, len(vertices)), l))
+        arrays = LinkArrays(
+            bandwidth_mbps=np.array([l.bandwidth_mbps for _, _, l in rows], dtype=np.float64),
+            rtt_ms=np.array([l.rtt_ms for _, _, l in rows], dtype=np.float64),
+            loss=np.array([l.loss for _, _, l in rows], dtype=np.float64),
+            overhead_ms=np.array([l.overhead_ms for _, _, l in rows], dtype=np.float64),
+        )
+        return cls(list(vertices), np.array([r[0] for r in rows], dtype=np.int64),
+                   np.array([r[1] for r in rows], dtype=np.int64), arrays, **kwargs)
+
+    @classmethod
+    def from_network(cls, network: NetworkModel, bidirectional: bool = False, **kwargs) -> "Topology":
+        return cls.from_links(((u, v, l) for (u, v), l in network.links.items()), bidirectional=bidirectional, **kwargs)
+
+    @property
+    def num_edges(self) -> int:
+        return int(self.src.shape[0])
+
+    def edge_index(self, u: str, v: str) -> int:
+        # First u->v edge; O(out-degree of u).
+        i, j = self.index[u], self.index[v]
+        for k in range(self._indptr[i], self._indptr[i + 1]):
+            if self._adj_dst[k] == j:
+                return self._adj_edge[k]
+        raise KeyError((u, v))
+
+    def _edge_weight(self, sel) -> np.ndarray:
+        self.dyn.refresh()
+        return self.dyn.tx_coef[sel] * self.ref_mb + self.dyn.const_s[sel]
+
+    def _on_update(self, idx: Optional[np.ndarray]) -> None:
+        if idx is None:
+            self._pending_all = True
+        else:
+            self._pending.append(np.array(idx, dtype=np.int64).reshape(-1))
+
+    def update_edges(self, idx, **values) -> None:
+        # Bulk link-state write (bandwidth_mbps, rtt_ms, loss, overhead_ms).
+        self.dyn.update(idx, **values)
+        self._push()
+
+    def advance(self, dt_s: float) -> None:
+        self.dyn.advance(dt_s)
+        self._push()
+
+    def bind(self, sink: Callable[[np.ndarray, LinkArrays], None], src: str, dsts: Sequence[str]) -> None:
+        # Keeps route-equivalent src->dsts links pushed into a consumer (an env's
+        # link arrays, a NetworkModel). sink(idx, links) gets the positions in
+        # dsts whose effective link changed and the full (len(dsts),) LinkArrays;
+        # it is called once now and after every edge update that reroutes or
+        # re-costs one of src's routes.
+        links = self.effective_links(src, dsts)
+        sink(np.arange(len(dsts)), links)
+        self._bindings.append([sink, src, list(dsts), links, self.routes(src)])
+
+    def bind_network(self, network: NetworkModel, src: str, dsts: Sequence[str]) -> None:
+        def _sink(idx: np.ndarray, l: LinkArrays) -> None:
+            for i in idx.tolist():
+                network.set_link(src, dsts[i], Link(float(l.bandwidth_mbps[i]), float(l.rtt_ms[i]), float(l.loss[i]), 0.0))
+        self.bind(_sink, src, dsts)
+
+    def _push(self) -> None:
+        if not self._bindings:
+            return
+        self._sync()
+        for b in self._bindings:
+            sink, src, dsts, last, tree = b
+            if self._routes.get(self.index[src]) is tree:
+                continue   # src's routes survived the update unchanged
+            links = self.effective_links(src, dsts)
+            changed = np.zeros(len(dsts), dtype=bool)
+            for k in ("bandwidth_mbps", "rtt_ms", "loss"):
+                changed |= getattr(links, k) != getattr(last, k)
+            if changed.any():
+                sink(np.flatnonzero(changed), links)
+            b[3], b[4] = links, self.routes(src)
+
+    def _sync(self) -> None:
+        if self._pending_all:
+            self._pending_all = False
+            self._pending.clear()
+            self.weight = self._edge_weight(slice(None))
+            self._routes.clear()
+            return
+        if not self._pending:
+            return
+        idx = np.unique(np.concatenate(self._pending))
+        self._pending.clear()
+        new_w = self._edge_weight(idx)
+        dec = new_w < self.weight[idx]
+        dec_u, dec_v, dec_w = self.src[idx[dec]], self.dst[idx[dec]], new_w[dec]
+        self.weight[idx] = new_w
+        for s in [s for s, r in self._routes.items()
+                  if r.tree[idx].any() or (dec_w.size and (r.dist[dec_u] + dec_w < r.dist[dec_v]).any())]:
+            del self._routes[s]
+
+    def _dijkstra(self, s: int) -> SourceRoutes:
+        V = len(self.vertices)
+        w = self.weight.tolist()
+        indptr, adj_edge, adj_dst = self._indptr, self._adj_edge, self._adj_dst
+        dist = [float("inf")] * V
+        parent = [-1] * V
+        done = [False] * V
+        order = []
+        dist[s] = 0.0
+        heap = [(0.0, s)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if done[u]:
+                continue
+            done[u] = True
+            order.append(u)
+            for k in range(indptr[u], indptr[u + 1]):
+                e = adj_edge[k]
+                v = adj_dst[k]
+                nd = d + w[e]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    parent[v] = e
+                    heapq.heappush(heap, (nd, v))
+        self.n_dijkstra += 1
+        # Path aggregates in settle order, so each parent is final before its children.
+        dyn = self.dyn
+        parent_a = np.array(parent, dtype=np.int64)
+        a = np.full(V, np.inf)
+        b = np.full(V, np.inf)
+        keep = np.zeros(V)
+        bott = np.zeros(V)
+        hops = np.full(V, -1, dtype=np.int64)
+        a[s], b[s], keep[s], bott[s], hops[s] = 0.0, 0.0, 1.0, np.inf, 0
+        order_a = np.array(order[1:], dtype=np.int64)
+        if order_a.size:
+            e = parent_a[order_a]
+            u = self.src[e]
+            tx, const = dyn.tx_coef[e], dyn.const_s[e]
+            bw, ok = self.dyn.links.bandwidth_mbps[e], 1.0 - np.clip(self.dyn.links.loss[e], 0.0, 0.99)
+            for k in range(order_a.size):
+                v, p = order_a[k], u[k]
+                a[v] = a[p] + tx[k]
+                b[v] = b[p] + const[k]
+                keep[v] = keep[p] * ok[k]
+                bott[v] = min(bott[p], bw[k])
+                hops[v] = hops[p] + 1
+        tree = np.zeros(self.num_edges, dtype=bool)
+        tree[parent_a[parent_a >= 0]] = True
+        return SourceRoutes(np.array(dist), parent_a, a, b, keep, bott, hops, tree)
+
+    def routes(self, src: Union[str, int]) -> SourceRoutes:
+        self._sync()
+        s = self.index[src] if isinstance(src, str) else int(src)
+        r = self._routes.get(s)
+        if r is None:
+            r = self._routes[s] = self._dijkstra(s)
+        return r
+
+    def precompute(self, sources: Optional[Iterable[Union[str, int]]] = None) -> None:
+        # Fills the cache for the given sources (default: all vertices, i.e. all-pairs).
+        for s in (range(len(self.vertices)) if sources is None else sources):
+            self.routes(s)
+
+    def _dst_idx(self, dst) -> Union[int, np.ndarray]:
+        if isinstance(dst, str):
+            return self.index[dst]
+        if isinstance(dst, (list, tuple)) and dst and isinstance(dst[0], str):
+            return np.array([self.index[d] for d in dst], dtype=np.int64)
+        return dst
+
+    def comm_time(self, s_mb, src: Union[str, int], dst) -> np.ndarray:
+        # Multi-hop comm_time; inf where dst is unreachable from src.
+        r = self.routes(src)
+        j = self._dst_idx(dst)
+        return r.a_s_per_mb[j] * np.maximum(0.0, s_mb) + r.b_s[j]
+
+    def path(self, src: Union[str, int], dst: Union[str, int]) -> List[str]:
+        r = self.routes(src)
+        j = self._dst_idx(dst)
+        if not np.isfinite(r.dist[j]):
+            raise ValueError(f"{dst} is unreachable from {src}")
+        out = [j]
+        while r.parent_edge[out[-1]] >= 0:
+            out.append(int(self.src[r.parent_edge[out[-1]]]))
+        return [self.vertices[i] for i in reversed(out)]
+
+    def effective_links(self, src: Union[str, int], dsts: Sequence[str]) -> LinkArrays:
+        # One equivalent link per destination that reproduces the path's
+        # comm_time exactly under network.comm_time: loss is the end-to-end loss,
+        # bandwidth and RTT absorb the summed per-hop terms, overhead is 0.
+        r = self.routes(src)
+        j = self._dst_idx(list(dsts))
+        loss = 1.0 - r.keep[j]
+        inflation = 1.0 / np.maximum(1e-12, r.keep[j])
+        with np.errstate(divide="ignore"):
+            bw = 8.0 * inflation / r.a_s_per_mb[j]
+        bw = np.where(np.isfinite(r.a_s_per_mb[j]), np.where(r.a_s_per_mb[j] > 0, bw, np.inf), 1e-6)
+        return LinkArrays(bandwidth_mbps=bw, rtt_ms=2000.0 * r.b_s[j] / inflation, loss=loss,
+                          overhead_ms=np.zeros(len(j), dtype=np.float64))
+
+    def export_links(self, network: NetworkModel, src: str, dsts: Sequence[str]) -> None:
+        # One-off write of effective src->dst links; bind_network() keeps them current.
+        l = self.effective_links(src, dsts)
+        for i, d in enumerate(dsts):
+            network.set_link(src, d, Link(float(l.bandwidth_mbps[i]), float(l.rtt_ms[i]), float(l.loss[i]), 0.0))
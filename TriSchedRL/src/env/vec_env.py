@@ -0,0 +1,133 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+from src.workloads.task import TaskBatch
+from .resources import ResourcePool
+from .network import NetworkModel
+from .sla import SLAConfig, violation_indicator_batch, sla_penalty_batch
+from .arrays import NodeArrays, LinkArrays, ArrayState
+from .array_env import NIC_POWER_W, decay_queues
+from .dynamic_network import DynamicNetwork
+from .edgecloud_env import StepResult
+
+@dataclass
+class VecStepResult:
+    node_idx: np.ndarray
+    latency_s: np.ndarray
+    energy_j: np.ndarray
+    violation: np.ndarray
+    sla_penalty: np.ndarray
+    t_exec_s: np.ndarray
+    t_queue_s: np.ndarray
+    t_comm_s: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.node_idx.shape[0])
+
+    def result(self, i: int, node_ids: Sequence[str]) -> StepResult:
+        return StepResult(
+            node_id=node_ids[int(self.node_idx[i])],
+            latency_s=float(self.latency_s[i]),
+            energy_j=float(self.energy_j[i]),
+            violation=int(self.violation[i]),
+            sla_penalty=float(self.sla_penalty[i]),
+            t_exec_s=float(self.t_exec_s[i]),
+            t_queue_s=float(self.t_queue_s[i]),
+            t_comm_s=float(self.t_comm_s[i]),
+        )
+
+class VecEdgeCloudEnv:
+    # B independent replicas of the same topology stepped in lockstep. Node and
+    # link specs are shared (N,); runtime queue/util are (B, N).
+    def __init__(self, resources: ResourcePool, network: NetworkModel, sla: SLAConfig, num_envs: int, dt_s: float = 1.0, src_id: str = "iot"):
+        self.sla = sla
+        self.dt_s = float(dt_s)
+        self.num_envs = int(num_envs)
+        self.nodes = NodeArrays.from_pool(resources)
+        self.links = LinkArrays.from_network(network, src_id, self.nodes.node_ids)
+        self.node_index = self.nodes.index()
+        shape = (self.num_envs, len(self.nodes))
+        self.queue_work_mi = np.zeros(shape, dtype=np.float64)
+        self.util = np.zeros(shape, dtype=np.float64)
+        self.seeds: List[int] = [0] * self.num_envs
+        self.rngs: List[np.random.Generator] = [np.random.default_rng(0) for _ in range(self.num_envs)]
+        self._rows = np.arange(self.num_envs)
+        self._f_safe = np.maximum(1e-9, self.nodes.f_mi_s)
+        self._drain = np.maximum(0.0, self.nodes.f_mi_s)
+        self._cap_safe = np.maximum(1e-6, self.nodes.capacity_mi_step)
+        self._links_cache = DynamicNetwork(self.links)
+        self._state = ArrayState.from_arrays(self.nodes, self.links, self.queue_work_mi, self.util, comm=self._links_cache)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.nodes)
+
+    def reset(self, seed: Union[int, Sequence[int], None] = None, indices: Optional[Sequence[int]] = None) -> ArrayState:
+        idx = self._rows if indices is None else np.asarray(indices, dtype=np.int64)
+        if seed is None:
+            seeds = [self.seeds[i] for i in idx]
+        elif np.ndim(seed) == 0:
+            seeds = [int(seed) + int(i) for i in idx]
+        else:
+            seeds = [int(s) for s in seed]
+            if len(seeds) != len(idx):
+                raise ValueError(f"Expected {len(idx)} seeds, got {len(seeds)}")
+        for i, s in zip(idx, seeds):
+            self.seeds[i] = s
+            self.rngs[i] = np.random.default_rng(s)
+        self.queue_work_mi[idx] = 0.0
+        self.util[idx] = 0.0
+        return self.observe_arrays()
+
+    def observe_arrays(self) -> ArrayState:
+        return self._state
+
+    def observe_state(self, i: int) -> Dict[str, Any]:
+        s = self._state
+        return ArrayState(s.node_ids, s.is_cloud, s.f_mi_s, s.capacity_mi_step, self.queue_work_mi[i], self.util[i],
+                          s.energy_budget_j_step, s.bandwidth_mbps, s.rtt_ms, s.loss, comm=s.comm).to_dict()
+
+    def random_actions(self) -> np.ndarray:
+        n = len(self.nodes)
+        return np.array([rng.integers(0, n) for rng in self.rngs], dtype=np.int64)
+
+    def step_decay(self, dt_s: float) -> None:
+        decay_queues(self.queue_work_mi, self.util, self._drain, self._cap_safe, dt_s)
+
+    def step(self, tasks: Union[TaskBatch, Sequence], node_idx) -> Tuple[ArrayState, VecStepResult, np.ndarray, Dict[str, Any]]:
+        if not isinstance(tasks, TaskBatch):
+            tasks = TaskBatch.from_tasks(tasks)
+        if len(tasks) != self.num_envs:
+            raise ValueError(f"Expected {self.num_envs} tasks, got {len(tasks)}")
+        idx = np.asarray(node_idx, dtype=np.int64)
+        if idx.shape != (self.num_envs,):
+            raise ValueError(f"Expected {self.num_envs} node indices, got shape {idx.shape}")
+        rows = self._rows
+
+        f = self._f_safe[idx]
+        t_exec = tasks.c_mi / f
+        t_queue = np.maximum(0.0, self.queue_work_mi[rows, idx]) / f
+        t_comm = self._links_cache.comm_time(tasks.s_mb, idx)
+        latency = t_exec + t_queue + t_comm
+
+        vio = violation_indicator_batch(latency, tasks.d_s)
+        pen = sla_penalty_batch(latency, tasks.d_s, hard_deadline=self.sla.hard_deadline)
+        p_w = self.nodes.power_idle_w[idx] + self.util[rows, idx] * self.nodes.power_dyn_w[idx]
+        energy = p_w * t_exec + NIC_POWER_W * t_comm
+
+        self.queue_work_mi[rows, idx] += tasks.c_mi
+        self.step_decay(self.dt_s)
+
+        res = VecStepResult(
+            node_idx=idx,
+            latency_s=latency,
+            energy_j=energy,
+            violation=vio,
+            sla_penalty=pen,
+            t_exec_s=t_exec,
+            t_queue_s=t_queue,
+            t_comm_s=t_comm,
+        )
+        return self.observe_arrays(), res, np.zeros(self.num_envs, dtype=bool), {}
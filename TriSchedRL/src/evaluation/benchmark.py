@@ -0,0 +1,260 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import itertools
+import json
+import platform
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from src.env.config import build_env_components, synthetic_env_cfg
+from src.env.edgecloud_env import EdgeCloudEnv, Task
+from src.workloads.generators import WorkloadConfig, WorkloadGenerator
+from src.predictors.feature_builder import FeatureBuilder
+from src.predictors.latency_predictor import LatencyPredictor
+from src.predictors.energy_predictor import EnergyPredictor
+from src.predictors.sla_risk_predictor import SLARiskPredictor
+from src.predictors.fused import FusedPredictor
+from src.predictors.aggregator import AggregationConfig, PredictionAggregator
+from src.guard.feasibility import FeasibilityConfig
+from src.guard.repair import feasible_set, repair_action
+from src.agents.state_vectorizer import StateVectorizer
+from src.agents.replay_buffer import ReplayBuffer, ReplayBufferConfig
+
+@dataclass
+class BenchConfig:
+    node_counts: Sequence[int] = (4, 64, 1024, 10_000)
+    batch_sizes: Sequence[int] = (32, 128, 512)
+    rates: Sequence[float] = (2.0, 20.0)   # arrivals/s; env dt_s = 1 / rate
+    cases: Optional[Sequence[str]] = None  # None = all registered cases
+    min_time_s: float = 0.05               # per repeat
+    repeat: int = 5
+    max_loops: int = 100_000
+    agent_max_nodes: int = 1024            # torch/replay cases are skipped above this
+    seed: int = 0
+
+@dataclass
+class BenchResult:
+    case: str
+    params: Dict[str, Any]
+    median_us: float
+    min_us: float
+    max_us: float
+    loops: int
+    repeat: int
+
+    @property
+    def key(self) -> str:
+        return bench_key(self.case, self.params)
+
+def bench_key(case: str, params: Dict[str, Any]) -> str:
+    return case + "[" + ",".join(f"{k}={params[k]}" for k in sorted(params)) + "]"
+
+def time_call(fn: Callable[[], Any], min_time_s: float = 0.05, repeat: int = 5, max_loops: int = 100_000) -> Tuple[np.ndarray, int]:
+    # timeit-style autorange: grow the loop count until one repeat takes at
+    # least min_time_s, then time `repeat` repeats. Returns per-call seconds.
+    clock = time.perf_counter
+    loops = 1
+    while True:
+        t0 = clock()
+        for _ in range(loops):
+            fn()
+        dt = clock() - t0
+        if dt >= min_time_s or loops >= max_loops:
+            break
+        loops = min(max_loops, loops * 10 if dt < min_time_s / 10 else loops * 2)
+    per_call = [dt / loops]
+    for _ in range(repeat - 1):
+        t0 = clock()
+        for _ in range(loops):
+            fn()
+        per_call.append((clock() - t0) / loops)
+    return np.array(per_call), loops
+
+class Fixture:
+    # Everything the cases share for one (nodes, rate) cell, built once.
+    def __init__(self, n_nodes: int, rate: float, seed: int):
+        self.n_nodes = n_nodes
+        pool, net, sla, _ = build_env_components(synthetic_env_cfg(n_nodes, seed))
+        self.env = EdgeCloudEnv(pool, net, sla, dt_s=1.0 / max(1e-6, rate))
+        self.env.reset(seed)
+        horizon = 256.0 / max(1e-6, rate)
+        arrivals = WorkloadGenerator(WorkloadConfig(seed=seed, horizon_s=horizon, lambda_per_s=rate)).generate()
+        self.tasks = [t for _, t in arrivals] or [WorkloadGenerator(WorkloadConfig(seed=seed))._sample_task(0)]
+        self.node_ids = pool.all_ids()
+        self.rng = np.random.default_rng(seed)
+        # Warm the queues so the state reflects the offered load.
+        for task in self.tasks[:64]:
+            self.env.step(self.as_env_task(task), self.node_ids[int(self.rng.integers(n_nodes))])
+        self.state = self.env.observe_state()
+        self.task = self.tasks[0]
+        self.fb = FeatureBuilder()
+        self.lp, self.ep, self.rp = LatencyPredictor(), EnergyPredictor(), SLARiskPredictor()
+        self.cand = self.fb.build_candidates(self.state, self.task)
+        self.L = self.lp.predict(self.cand)
+        self.E = self.ep.predict(self.cand)
+        self.R = self.rp.predict_from_latency(self.cand, self.L)
+        self.caps = {nid: float(x.node["capacity_mi_step"]) for nid, x in self.cand.items()}
+        self.budgets = {nid: (None if float(x.node["energy_budget_j_step"]) < 0 else float(x.node["energy_budget_j_step"]))
+                        for nid, x in self.cand.items()}
+        self.feas_cfg = FeasibilityConfig()
+        self.agg_cfg = AggregationConfig()
+        self.kappa = PredictionAggregator(self.agg_cfg).aggregate(self.L, self.E, self.R, 0.40, 0.35, 0.25)
+        self.vec = StateVectorizer(self.node_ids, self.kappa.shape[0])
+        self._agent = None
+
+    @staticmethod
+    def as_env_task(t) -> Task:
+        return Task(t.task_id, t.c_mi, t.d_s, t.s_mb, t.p)
+
+    @property
+    def agent(self):
+        if self._agent is None:
+            from src.agents.actor_critic import ACTrainConfig, ActorCriticAgent
+            self._agent = ActorCriticAgent(self.vec.state_dim, self.n_nodes, ACTrainConfig())
+        return self._agent
+
+    def replay(self, min_size: int) -> ReplayBuffer:
+        buf = ReplayBuffer(self.vec.state_dim, ReplayBufferConfig(capacity=4 * min_size))
+        n = buf.capacity
+        s = self.rng.standard_normal((n, self.vec.state_dim), dtype=np.float32)
+        buf.add_batch(s, self.rng.integers(self.n_nodes, size=n), self.rng.standard_normal(n), s, np.zeros(n))
+        return buf
+
+# name -> (swept axes, setup(fixture, params) -> zero-arg callable)
+CASES: Dict[str, Tuple[Tuple[str, ...], Callable[[Fixture, Dict[str, Any]], Callable[[], Any]]]] = {}
+
+def register(name: str, axes: Tuple[str, ...] = ("nodes",)):
+    def deco(setup):
+        CASES[name] = (axes, setup)
+        return setup
+    return deco
+
+@register("env.step", ("nodes", "rate"))
+def _env_step(fx: Fixture, p):
+    tasks = itertools.cycle([fx.as_env_task(t) for t in fx.tasks])
+    nodes = itertools.cycle([fx.node_ids[int(i)] for i in fx.rng.integers(fx.n_nodes, size=997)])
+    return lambda: fx.env.step(next(tasks), next(nodes))
+
+@register("env.observe_state")
+def _observe(fx: Fixture, p):
+    return fx.env.observe_state
+
+@register("features.build_candidates")
+def _build_candidates(fx: Fixture, p):
+    return lambda: fx.fb.build_candidates(fx.state, fx.task)
+
+@register("features.build_batch")
+def _build_batch(fx: Fixture, p):
+    return lambda: fx.fb.build_batch(fx.state, fx.task)
+
+@register("predict.latency")
+def _latency(fx: Fixture, p):
+    return lambda: fx.lp.predict(fx.cand)
+
+@register("predict.energy")
+def _energy(fx: Fixture, p):
+    return lambda: fx.ep.predict(fx.cand)
+
+@register("predict.risk")
+def _risk(fx: Fixture, p):
+    return lambda: fx.rp.predict_from_latency(fx.cand, fx.L)
+
+@register("predict.fused")
+def _fused(fx: Fixture, p):
+    fused, b = FusedPredictor(fx.lp, fx.ep, fx.rp), fx.fb.build_batch(fx.state, fx.task)
+    return lambda: fused.predict(b)
+
+@register("guard.feasible_set")
+def _feasible_set(fx: Fixture, p):
+    return lambda: feasible_set(fx.feas_cfg, fx.task, fx.caps, fx.budgets, fx.L, fx.E, fx.R)
+
+@register("guard.repair_action")
+def _repair(fx: Fixture, p):
+    nf = list(fx.L.keys())
+    return lambda: repair_action(fx.task, nf, fx.L, fx.E, fx.R, 0.40, 0.35, 0.25)
+
+@register("vectorizer.vectorize")
+def _vectorize(fx: Fixture, p):
+    return lambda: fx.vec.vectorize(fx.state, fx.kappa)
+
+@register("agent.act")
+def _act(fx: Fixture, p):
+    s = fx.vec.vectorize(fx.state, fx.kappa)
+    agent = fx.agent
+    return lambda: agent.act(s)
+
+@register("agent.update", ("nodes", "batch"))
+def _update(fx: Fixture, p):
+    batch = fx.replay(p["batch"]).sample(p["batch"])
+    agent = fx.agent
+    return lambda: agent.update(batch)
+
+@register("replay.sample", ("nodes", "batch"))
+def _sample(fx: Fixture, p):
+    buf = fx.replay(p["batch"])
+    return lambda: buf.sample(p["batch"])
+
+_AGENT_CASES = ("agent.act", "agent.update", "replay.sample")
+
+def _grid(axes: Tuple[str, ...], cfg: BenchConfig) -> List[Dict[str, Any]]:
+    values = {"nodes": cfg.node_counts, "batch": cfg.batch_sizes, "rate": cfg.rates}
+    return [dict(zip(axes, combo)) for combo in itertools.product(*(values[a] for a in axes))]
+
+def run_suite(cfg: BenchConfig = BenchConfig(), progress: Optional[Callable[[BenchResult], None]] = None) -> Dict[str, Any]:
+    names = list(cfg.cases) if cfg.cases is not None else list(CASES)
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {unknown}")
+    fixtures: Dict[Tuple[int, float], Fixture] = {}
+    results: List[BenchResult] = []
+    skipped: List[str] = []
+    for name in names:
+        axes, setup = CASES[name]
+        for params in _grid(axes, cfg):
+            n, rate = int(params["nodes"]), float(params.get("rate", cfg.rates[0]))
+            if name in _AGENT_CASES and n > cfg.agent_max_nodes:
+                skipped.append(bench_key(name, params))
+                continue
+            if (n, rate) not in fixtures:
+                fixtures[(n, rate)] = Fixture(n, rate, cfg.seed)
+            per_call, loops = time_call(setup(fixtures[(n, rate)], params), cfg.min_time_s, cfg.repeat, cfg.max_loops)
+            res = BenchResult(name, params, 1e6 * float(np.median(per_call)), 1e6 * float(per_call.min()),
+                              1e6 * float(per_call.max()), loops, cfg.repeat)
+            results.append(res)
+            if progress is not None:
+                progress(res)
+    return {"meta": _meta(cfg), "results": [r.__dict__ for r in results], "skipped": skipped}
+
+def _meta(cfg: BenchConfig) -> Dict[str, Any]:
+    meta = {"python": platform.python_version(), "platform": platform.platform(), "numpy": np.__version__,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "config": {k: (list(v) if isinstance(v, tuple) else v)
+                                                                        for k, v in cfg.__dict__.items()}}
+    try:
+        import torch
+        meta["torch"] = torch.__version__
+    except ImportError:
+        pass
+    return meta
+
+def save_results(report: Dict[str, Any], path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.10) -> List[Dict[str, Any]]:
+    # One row per case/params present in both reports; ratio = current / baseline
+    # median, regressed when it exceeds 1 + threshold.
+    base = {bench_key(r["case"], r["params"]): r for r in baseline["results"]}
+    rows = []
+    for r in current["results"]:
+        key = bench_key(r["case"], r["params"])
+        if key not in base:
+            continue
+        ratio = r["median_us"] / max(1e-12, base[key]["median_us"])
+        rows.append({"key": key, "baseline_us": base[key]["median_us"], "current_us": r["median_us"],
+                     "ratio": ratio, "regressed": ratio > 1.0 + threshold})
+    return rows
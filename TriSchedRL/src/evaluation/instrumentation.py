@@ -0,0 +1,232 @@
+from __future__ import annotations
+from bisect import bisect_left
+from collections import Counter
+import contextlib
+import cProfile
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+# Upper bounds (inclusive) of the fixed latency buckets, in microseconds; the
+# last bucket is +Inf. Size buckets are for counts such as feasible-set sizes.
+LATENCY_BUCKETS_US = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1_000, 2_000, 5_000, 10_000, 50_000, 100_000, 1_000_000)
+SIZE_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64, 128, 256, 1024, 4096, 16384)
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "total", "n", "max")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(float(b) for b in bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+        self.n = 0
+        self.max = 0.0
+
+    def observe(self, v: float) -> None:
+        self.counts[bisect_left(self.bounds, v)] += 1
+        self.total += v
+        self.n += 1
+        if v > self.max:
+            self.max = v
+
+    def quantile(self, q: float) -> float:
+        # Upper bound of the bucket holding the q-th observation (max for +Inf).
+        if self.n == 0:
+            return 0.0
+        rank, acc = q * self.n, 0
+        for i, c in enumerate(self.counts):
+            acc += c
+            if acc >= rank and c:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"count": self.n, "sum": self.total, "mean": self.total / self.n if self.n else 0.0, "max": self.max,
+                "p50": self.quantile(0.50), "p99": self.quantile(0.99),
+                "buckets": {("+Inf" if i == len(self.bounds) else repr(self.bounds[i])): c for i, c in enumerate(self.counts)}}
+
+class _StageTimer:
+    __slots__ = ("hist", "t0")
+
+    def __init__(self, hist: Histogram):
+        self.hist = hist
+
+    def __enter__(self):
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.observe((time.perf_counter_ns() - self.t0) / 1000.0)
+        return False
+
+class Instrumentation:
+    # Named stage timers (monotonic perf_counter_ns into fixed-bucket µs
+    # histograms), counters and value histograms for the scheduling loop.
+    # Not thread-safe; use one instance per loop and merge snapshots.
+    enabled = True
+
+    def __init__(self, latency_buckets_us: Sequence[float] = LATENCY_BUCKETS_US, size_buckets: Sequence[float] = SIZE_BUCKETS):
+        self.latency_buckets_us = latency_buckets_us
+        self.size_buckets = size_buckets
+        self.stages: Dict[str, Histogram] = {}
+        self.values: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self._timers: Dict[str, _StageTimer] = {}
+
+    def stage(self, name: str) -> _StageTimer:
+        # `with instr.stage("predict"): ...`; stages must not nest under the same name.
+        t = self._timers.get(name)
+        if t is None:
+            self.stages[name] = h = Histogram(self.latency_buckets_us)
+            t = self._timers[name] = _StageTimer(h)
+        return t
+
+    def record(self, name: str, elapsed_us: float) -> None:
+        self.stage(name).hist.observe(elapsed_us)
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name: str, value: float) -> None:
+        h = self.values.get(name)
+        if h is None:
+            h = self.values[name] = Histogram(self.size_buckets)
+        h.observe(value)
+
+    def reset(self) -> None:
+        self.stages.clear()
+        self.values.clear()
+        self.counters.clear()
+        self._timers.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"stages_us": {k: h.snapshot() for k, h in self.stages.items()},
+                "values": {k: h.snapshot() for k, h in self.values.items()},
+                "counters": dict(self.counters)}
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "trischedrl") -> str:
+        # Text exposition format: stage timers as one seconds histogram labelled
+        # by stage, values as histograms labelled by name, counters as counters.
+        out = []
+        def _hist(metric: str, label: str, key: str, h: Histogram, scale: float) -> None:
+            acc = 0
+            for i, c in enumerate(h.counts):
+                acc += c
+                le = "+Inf" if i == len(h.bounds) else repr(h.bounds[i] * scale)
+                out.append(f'{metric}_bucket{{{label}="{key}",le="{le}"}} {acc}')
+            out.append(f'{metric}_sum{{{label}="{key}"}} {h.total * scale!r}')
+            out.append(f'{metric}_count{{{label}="{key}"}} {h.n}')
+        if self.stages:
+            out.append(f"# TYPE {prefix}_stage_seconds histogram")
+            for k, h in self.stages.items():
+                _hist(f"{prefix}_stage_seconds", "stage", k, h, 1e-6)
+        if self.values:
+            out.append(f"# TYPE {prefix}_value histogram")
+            for k, h in self.values.items():
+                _hist(f"{prefix}_value", "name", k, h, 1.0)
+        for k, v in self.counters.items():
+            name = f"{prefix}_{k.replace('.', '_')}_total"
+            out.append(f"# TYPE {name} counter")
+            out.append(f"{name} {v}")
+        return "\n".join(out) + "\n"
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class NullInstrumentation(Instrumentation):
+    # Disabled instrumentation: every hook is a constant-time no-op.
+    enabled = False
+
+    def stage(self, name: str) -> _NullTimer:
+        return _NULL_TIMER
+
+    def record(self, name: str, elapsed_us: float) -> None:
+        pass
+
+    def count(self, name: str, n: int = 1) -> None:
+        pass
+
+    def observe(self, name: str, value: float) -> None:
+        pass
+
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+@contextlib.contextmanager
+def profile_episode(path: Optional[str] = None, sort: str = "cumulative", limit: int = 30) -> Iterator[Dict[str, Any]]:
+    # cProfile scoped to one `with` block (e.g. one episode). The yielded dict
+    # gets "stats" (pstats.Stats) and "text" (top `limit` rows) on exit; `path`
+    # also dumps the raw profile for snakeviz/pstats.
+    prof = cProfile.Profile()
+    out: Dict[str, Any] = {}
+    prof.enable()
+    try:
+        yield out
+    finally:
+        prof.disable()
+        if path is not None:
+            prof.dump_stats(path)
+        buf = io.StringIO()
+        stats = pstats.Stats(prof, stream=buf).sort_stats(sort)
+        stats.print_stats(limit)
+        out["stats"], out["text"] = stats, buf.getvalue()
+
+class StackSampler:
+    # Low-overhead statistical profiler: a daemon thread samples the target
+    # thread's stack every interval_s and counts collapsed stacks
+    # ("file:func;file:func;..."), the input format of flamegraph tools.
+    def __init__(self, interval_s: float = 0.005, max_depth: int = 64, thread_id: Optional[int] = None):
+        self.interval_s = float(interval_s)
+        self.max_depth = int(max_depth)
+        self.thread_id = thread_id
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(f"{frame.f_code.co_filename}:{frame.f_code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self) -> "StackSampler":
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return self.samples
+
+    def __enter__(self) -> "StackSampler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{k} {v}" for k, v in self.samples.most_common())
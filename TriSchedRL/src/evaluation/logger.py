@@ -1,6 +1,7 @@
 from __future__ import annotations
-from typing import Any, Dict
-import csv, os
+from typing import Any, Dict, List, Optional, Sequence
+import csv, os, queue, threading
+import numpy as np
 
 class CSVLogger:
     def __init__(self, path: str, fieldnames: list[str]):
@@ -16,3 +17,151 @@ class CSVLogger:
         with open(self.path, "a", newline="") as f:
             w = csv.DictWriter(f, fieldnames=self.fieldnames)
             w.writerow(row)
+
+_STOP = object()
+
+def _column(values: Sequence[Any]) -> np.ndarray:
+    # Typed column for a batch: missing/None cells become NaN (numeric) or ""
+    # (text). Never an object array, which npz could only store pickled.
+    col = np.asarray(values)
+    if col.dtype != object:
+        return col
+    vals = list(values)
+    if all(v is None or isinstance(v, (bool, int, float, np.number, np.bool_)) for v in vals):
+        return np.array([np.nan if v is None else v for v in vals], dtype=np.float64)
+    return np.array(["" if v is None else str(v) for v in vals])
+
+class BufferedLogger:
+    # Keeps the output open and hands batches of batch_rows rows to a background
+    # writer thread. The hand-off queue holds at most max_pending batches, so a
+    # slow disk blocks log() (backpressure) instead of growing memory unbounded.
+    # fmt: "csv", "npz" (one columnar part file per batch under path/), or
+    # "parquet"/"arrow" (needs pyarrow).
+    def __init__(self, path: str, fieldnames: List[str], fmt: str = "csv", batch_rows: int = 4096, max_pending: int = 8):
+        if fmt not in ("csv", "npz", "parquet", "arrow"):
+            raise ValueError(f"Unknown log format: {fmt}")
+        if fmt in ("parquet", "arrow"):
+            # Fail here rather than in the writer thread, after rows were accepted.
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError as e:
+                raise ImportError(f"fmt={fmt!r} requires pyarrow") from e
+        self.path = path
+        self.fieldnames = list(fieldnames)
+        self.fmt = fmt
+        self.batch_rows = max(1, int(batch_rows))
+        self.rows_written = 0
+        self._rows: List[Dict[str, Any]] = []
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, int(max_pending)))
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._sink: Any = None
+        self._csv: Any = None
+        self._part = 0
+        parent = path if fmt == "npz" else os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name=f"BufferedLogger({os.path.basename(path)})", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "BufferedLogger":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def log(self, row: Dict[str, Any]) -> None:
+        self._rows.append(row)
+        if len(self._rows) >= self.batch_rows:
+            self.flush()
+
+    def log_result(self, res: Any, **extra: Any) -> None:
+        # StepResult (or any flat dataclass) plus extra columns, e.g. t=..., task_id=...
+        row = dict(res.__dict__)
+        row.update(extra)
+        self.log(row)
+
+    def log_columns(self, columns: Dict[str, Sequence[Any]]) -> None:
+        # Pre-batched columnar input (e.g. the fields of a VecStepResult) skips
+        # the per-row dicts entirely. Omitted fields are filled like log() does.
+        self._raise_pending()
+        self.flush()
+        n = len(next(iter(columns.values()))) if columns else 0
+        self._queue.put({k: _column(columns[k] if k in columns else [None] * n) for k in self.fieldnames})
+
+    def flush(self) -> None:
+        self._raise_pending()
+        if not self._rows:
+            return
+        rows, self._rows = self._rows, []
+        self._queue.put({k: _column([r.get(k) for r in rows]) for k in self.fieldnames})
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._closed = True
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._raise_pending()
+
+    def _raise_pending(self) -> None:
+        if self._error is not None:
+            err, self._error = self._error, None
+            raise RuntimeError(f"BufferedLogger writer for {self.path} failed") from err
+
+    def _run(self) -> None:
+        try:
+            while True:
+                batch = self._queue.get()
+                if batch is _STOP:
+                    break
+                if self._error is None:
+                    try:
+                        self._write(batch)
+                    except BaseException as e:
+                        self._error = e
+        finally:
+            self._close_sink()
+
+    def _write(self, cols: Dict[str, np.ndarray]) -> None:
+        n = len(cols[self.fieldnames[0]]) if self.fieldnames else 0
+        if self.fmt == "csv":
+            if self._sink is None:
+                exists = os.path.exists(self.path) and os.path.getsize(self.path) > 0
+                self._sink = open(self.path, "a", newline="")
+                self._csv = csv.writer(self._sink)
+                if not exists:
+                    self._csv.writerow(self.fieldnames)
+            self._csv.writerows(zip(*(cols[k].tolist() for k in self.fieldnames)))
+        elif self.fmt == "npz":
+            np.savez(os.path.join(self.path, f"part-{self._part:05d}.npz"), **cols)
+            self._part += 1
+        else:
+            import pyarrow as pa
+            table = pa.table({k: cols[k] for k in self.fieldnames})
+            if self._sink is None:
+                if self.fmt == "parquet":
+                    import pyarrow.parquet as pq
+                    self._sink = pq.ParquetWriter(self.path, table.schema)
+                else:
+                    self._sink = pa.ipc.new_file(self.path, table.schema)
+            self._sink.write_table(table)
+        self.rows_written += n
+
+    def _close_sink(self) -> None:
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+def load_npz_parts(path: str) -> Dict[str, np.ndarray]:
+    # Concatenates the part files written by BufferedLogger(fmt="npz").
+    parts = sorted(f for f in os.listdir(path) if f.startswith("part-") and f.endswith(".npz"))
+    cols: Dict[str, List[np.ndarray]] = {}
+    for name in parts:
+        with np.load(os.path.join(path, name), allow_pickle=False) as z:
+            for k in z.files:
+                cols.setdefault(k, []).append(z[k])
+    return {k: np.concatenate(v) for k, v in cols.items()}
@@ -1,6 +1,7 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+import math
+from typing import Dict, Iterable, List, Optional, Sequence
 import numpy as np
 
 @dataclass
@@ -12,6 +13,8 @@ class EpisodeStats:
     eng_mean: float
     eng_p95: float
     avg_reward: float
+    lat_p99: float = 0.0
+    eng_p99: float = 0.0
 
 def summarize(latencies: List[float], energies: List[float], violations: List[int], rewards: List[float]) -> EpisodeStats:
     n = len(latencies)
@@ -29,4 +32,208 @@ def summarize(latencies: List[float], energies: List[float], violations: List[in
         eng_mean=float(eng.mean()),
         eng_p95=float(np.quantile(eng, 0.95)),
         avg_reward=float(rew.mean()),
+        lat_p99=float(np.quantile(lat, 0.99)),
+        eng_p99=float(np.quantile(eng, 0.99)),
     )
+
+@dataclass
+class RunningMoments:
+    # Welford mean/variance; batches and merges use Chan et al.'s pairwise update.
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (x - self.mean)
+
+    def add_batch(self, xs: np.ndarray) -> None:
+        xs = np.asarray(xs, dtype=np.float64)
+        if xs.size:
+            self._combine(int(xs.size), float(xs.mean()), float(((xs - xs.mean()) ** 2).sum()))
+
+    def merge(self, other: "RunningMoments") -> None:
+        if other.n:
+            self._combine(other.n, other.mean, other.m2)
+
+    def _combine(self, n_b: int, mean_b: float, m2_b: float) -> None:
+        n = self.n + n_b
+        d = mean_b - self.mean
+        self.mean += d * n_b / n
+        self.m2 += m2_b + d * d * self.n * n_b / n
+        self.n = n
+
+    @property
+    def var(self) -> float:
+        return self.m2 / self.n if self.n else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.var)
+
+class QuantileSketch:
+    # Log-bucketed histogram (DDSketch-style) for non-negative values: every
+    # quantile is within rel_err relative error, memory grows with the log of the
+    # value range, and merging two sketches is adding their bucket counts.
+    def __init__(self, rel_err: float = 0.01, min_value: float = 1e-9):
+        self.rel_err = float(rel_err)
+        self.gamma = (1.0 + rel_err) / (1.0 - rel_err)
+        self._log_gamma = math.log(self.gamma)
+        self.min_value = float(min_value)
+        self.counts: Dict[int, int] = {}
+        self.zero_count = 0
+        self.n = 0
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        if x <= self.min_value:
+            self.zero_count += 1
+            return
+        k = math.ceil(math.log(x) / self._log_gamma)
+        self.counts[k] = self.counts.get(k, 0) + 1
+
+    def add_batch(self, xs: np.ndarray) -> None:
+        xs = np.asarray(xs, dtype=np.float64)
+        self.n += int(xs.size)
+        pos = xs > self.min_value
+        self.zero_count += int(xs.size - pos.sum())
+        if pos.any():
+            keys, cnt = np.unique(np.ceil(np.log(xs[pos]) / self._log_gamma).astype(np.int64), return_counts=True)
+            for k, c in zip(keys.tolist(), cnt.tolist()):
+                self.counts[k] = self.counts.get(k, 0) + c
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different rel_err")
+        self.n += other.n
+        self.zero_count += other.zero_count
+        for k, c in other.counts.items():
+            self.counts[k] = self.counts.get(k, 0) + c
+
+    def quantile(self, q: float) -> float:
+        if self.n == 0:
+            return 0.0
+        rank = q * (self.n - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for k in sorted(self.counts):
+            seen += self.counts[k]
+            if rank < seen:
+                return 2.0 * self.gamma ** k / (self.gamma + 1.0)
+        return 2.0 * self.gamma ** max(self.counts) / (self.gamma + 1.0)
+
+@dataclass
+class EpisodeAccumulator:
+    # Constant-memory replacement for summarize(): fed StepResults one at a time
+    # or in batches, mergeable across workers/seeds. Optionally keeps the same
+    # accumulator per node and per priority.
+    rel_err: float = 0.01
+    breakdown: bool = False
+    lat: RunningMoments = field(default_factory=RunningMoments)
+    eng: RunningMoments = field(default_factory=RunningMoments)
+    reward: RunningMoments = field(default_factory=RunningMoments)
+    violations: int = 0
+    lat_sketch: Optional[QuantileSketch] = None
+    eng_sketch: Optional[QuantileSketch] = None
+    by_node: Dict[str, "EpisodeAccumulator"] = field(default_factory=dict)
+    by_priority: Dict[int, "EpisodeAccumulator"] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.lat_sketch is None:
+            self.lat_sketch = QuantileSketch(self.rel_err)
+        if self.eng_sketch is None:
+            self.eng_sketch = QuantileSketch(self.rel_err)
+
+    @property
+    def n_tasks(self) -> int:
+        return self.lat.n
+
+    def _child(self, table: Dict, key) -> "EpisodeAccumulator":
+        acc = table.get(key)
+        if acc is None:
+            acc = table[key] = EpisodeAccumulator(rel_err=self.rel_err)
+        return acc
+
+    def update(self, res, reward: float = 0.0, priority: Optional[int] = None) -> None:
+        self.lat.add(float(res.latency_s))
+        self.eng.add(float(res.energy_j))
+        self.reward.add(float(reward))
+        self.violations += int(res.violation)
+        self.lat_sketch.add(float(res.latency_s))
+        self.eng_sketch.add(float(res.energy_j))
+        if self.breakdown:
+            self._child(self.by_node, res.node_id).update(res, reward)
+            if priority is not None:
+                self._child(self.by_priority, int(priority)).update(res, reward)
+
+    def update_batch(self, results, rewards=None, priorities=None, node_ids: Optional[Sequence[str]] = None) -> None:
+        # results: a VecStepResult (node_ids maps its node_idx) or a sequence of StepResults.
+        if isinstance(results, (list, tuple)):
+            lat = np.array([r.latency_s for r in results], dtype=np.float64)
+            eng = np.array([r.energy_j for r in results], dtype=np.float64)
+            vio = np.array([r.violation for r in results], dtype=np.int64)
+            nodes = np.array([r.node_id for r in results], dtype=object)
+        else:
+            lat = np.asarray(results.latency_s, dtype=np.float64)
+            eng = np.asarray(results.energy_j, dtype=np.float64)
+            vio = np.asarray(results.violation, dtype=np.int64)
+            nodes = None if node_ids is None else np.asarray(node_ids, dtype=object)[np.asarray(results.node_idx)]
+        rew = np.zeros_like(lat) if rewards is None else np.asarray(rewards, dtype=np.float64)
+        self._add_arrays(lat, eng, vio, rew)
+        if not self.breakdown:
+            return
+        groups = []
+        if nodes is not None:
+            groups.append((self.by_node, nodes))
+        if priorities is not None:
+            groups.append((self.by_priority, np.asarray(priorities, dtype=np.int64)))
+        for table, keys in groups:
+            for key in dict.fromkeys(keys.tolist()):
+                m = keys == key
+                self._child(table, key)._add_arrays(lat[m], eng[m], vio[m], rew[m])
+
+    def _add_arrays(self, lat: np.ndarray, eng: np.ndarray, vio: np.ndarray, rew: np.ndarray) -> None:
+        self.lat.add_batch(lat)
+        self.eng.add_batch(eng)
+        self.reward.add_batch(rew)
+        self.violations += int(vio.sum())
+        self.lat_sketch.add_batch(lat)
+        self.eng_sketch.add_batch(eng)
+
+    def merge(self, other: "EpisodeAccumulator") -> "EpisodeAccumulator":
+        self.lat.merge(other.lat)
+        self.eng.merge(other.eng)
+        self.reward.merge(other.reward)
+        self.violations += other.violations
+        self.lat_sketch.merge(other.lat_sketch)
+        self.eng_sketch.merge(other.eng_sketch)
+        for table, other_table in ((self.by_node, other.by_node), (self.by_priority, other.by_priority)):
+            for key, acc in other_table.items():
+                self._child(table, key).merge(acc)
+        return self
+
+    def stats(self) -> EpisodeStats:
+        n = self.n_tasks
+        if n == 0:
+            return EpisodeStats(0,0.0,0.0,0.0,0.0,0.0,0.0)
+        return EpisodeStats(
+            n_tasks=n,
+            sla_viol_rate=self.violations / n,
+            lat_mean=self.lat.mean,
+            lat_p95=self.lat_sketch.quantile(0.95),
+            eng_mean=self.eng.mean,
+            eng_p95=self.eng_sketch.quantile(0.95),
+            avg_reward=self.reward.mean,
+            lat_p99=self.lat_sketch.quantile(0.99),
+            eng_p99=self.eng_sketch.quantile(0.99),
+        )
+
+def merge_all(accs: Iterable[EpisodeAccumulator]) -> EpisodeAccumulator:
+    accs = list(accs)
+    out = EpisodeAccumulator(rel_err=accs[0].rel_err if accs else 0.01, breakdown=any(a.breakdown for a in accs))
+    for a in accs:
+        out.merge(a)
+    return out
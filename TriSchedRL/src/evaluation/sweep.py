@@ -0,0 +1,303 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+import functools
+import hashlib
+import itertools
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import numpy as np
+
+from src.env.config import build_env_components, load_yaml
+from src.env.array_env import ArrayEdgeCloudEnv
+from src.env.sla import reward_from_step
+from src.workloads.generators import WorkloadConfig, WorkloadGenerator
+from src.workloads.task import TaskBatch
+from src.predictors.feature_builder import FeatureBuilder
+from src.agents.state_vectorizer import StateVectorizer
+from src.predictors.latency_predictor import LatencyPredictor
+from src.predictors.energy_predictor import EnergyPredictor
+from src.predictors.sla_risk_predictor import SLARiskPredictor
+from src.predictors.fused import FusedPredictor
+from src.predictors.aggregator import AggregationConfig, PredictionAggregator
+from src.guard.feasibility import FeasibilityConfig
+from src.guard.fallback import FallbackConfig
+from src.guard.lazy import LazyGuard
+from src.meta.meta_controller import MetaConfig, MetaController
+from src.meta.signals import SignalConfig, IncrementalSignalTracker
+from src.baselines import choose_eft, choose_least_energy, choose_fixed_weight_sum, FixedWeights, schedule_batch
+from .metrics import EpisodeAccumulator
+
+BASELINES = ("eft", "least_energy", "fixed_weight_sum", "minmin", "maxmin")
+WINDOWED = ("minmin", "maxmin")   # batch heuristics over arrival windows
+RL_SCHEDULERS = ("rl_guarded", "rl_unguarded")
+SCHEDULERS = BASELINES + RL_SCHEDULERS
+
+@dataclass
+class SweepConfig:
+    seeds: Sequence[int] = (0, 1, 2)
+    modes: Sequence[str] = ("poisson", "bursty")
+    rates: Sequence[float] = (2.0, 3.0, 6.0)        # lambda_per_s; bursty keeps workload.yaml's burst/base ratio
+    schedulers: Sequence[str] = SCHEDULERS
+    horizon_s: Optional[float] = None               # None keeps workload.yaml's horizon
+    configs_dir: str = "configs"
+    cache_dir: str = ".sweep_cache"
+    workers: int = 0                                # 0 = os.cpu_count(); 1 = run in-process
+    checkpoint: Optional[str] = None                # train_trischedrl.py --save output for the RL schedulers
+    untrained_rl: bool = False                      # without a checkpoint, RL cells are skipped unless this is set
+    batch_window_s: float = 1.0                     # arrival window that minmin/maxmin schedule together
+    base_seed: int = 0
+    agg_cfg: AggregationConfig = field(default_factory=AggregationConfig)
+    feas_cfg: FeasibilityConfig = field(default_factory=FeasibilityConfig)
+    fall_cfg: FallbackConfig = field(default_factory=FallbackConfig)
+
+@functools.lru_cache(maxsize=None)
+def code_version(root: Optional[str] = None) -> str:
+    # Content hash of every .py file under src/, so edits invalidate the cache
+    # whether or not they are committed.
+    root = root or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    h = hashlib.sha256()
+    for dirpath, dirnames, files in os.walk(root):
+        dirnames.sort()
+        for name in sorted(files):
+            if name.endswith(".py"):
+                path = os.path.join(dirpath, name)
+                h.update(os.path.relpath(path, root).encode())
+                with open(path, "rb") as f:
+                    h.update(f.read())
+    return h.hexdigest()[:16]
+
+def _file_hash(path: Optional[str]) -> Optional[str]:
+    if path is None:
+        return None
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+def job_key(spec: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(spec, sort_keys=True, default=str).encode()).hexdigest()
+
+def workload_seed(base_seed: int, seed: int) -> int:
+    # Shared by every scheduler and workload cell of a seed, so comparisons
+    # are paired on the same arrival randomness.
+    return int(np.random.SeedSequence([int(base_seed), int(seed)]).generate_state(1)[0])
+
+def expand_grid(cfg: SweepConfig) -> List[Dict[str, Any]]:
+    # One fully resolved job spec per seed x mode x rate x scheduler cell. The
+    # spec is everything the result depends on, so its hash is the cache key.
+    unknown = [s for s in cfg.schedulers if s not in SCHEDULERS]
+    if unknown:
+        raise ValueError(f"Unknown schedulers: {unknown}")
+    schedulers = [s for s in cfg.schedulers if s not in skipped_schedulers(cfg)]
+    env_cfg = load_yaml(os.path.join(cfg.configs_dir, "env.yaml"))
+    wl_base = load_yaml(os.path.join(cfg.configs_dir, "workload.yaml"))
+    meta_cfg = load_yaml(os.path.join(cfg.configs_dir, "meta.yaml"))
+    window = int(meta_cfg.pop("signal_window", 50))
+    burst_ratio = float(wl_base.get("burst_lambda_per_s", 8.0)) / max(1e-9, float(wl_base.get("lambda_per_s", 2.0)))
+    shared = {
+        "env_cfg": env_cfg, "meta_cfg": meta_cfg, "signal_window": window,
+        "agg_cfg": asdict(cfg.agg_cfg), "feas_cfg": asdict(cfg.feas_cfg), "fall_cfg": asdict(cfg.fall_cfg),
+        "code": code_version(),
+    }
+    specs = []
+    for seed, mode, rate, sched in itertools.product(cfg.seeds, cfg.modes, cfg.rates, schedulers):
+        wl = dict(wl_base, seed=workload_seed(cfg.base_seed, seed), mode=mode, lambda_per_s=float(rate),
+                  burst_lambda_per_s=float(rate) * burst_ratio)
+        if cfg.horizon_s is not None:
+            wl["horizon_s"] = float(cfg.horizon_s)
+        spec = dict(shared, seed=int(seed), scheduler=sched, workload=wl)
+        if sched in RL_SCHEDULERS:
+            spec["checkpoint"] = cfg.checkpoint
+            spec["checkpoint_sha"] = _file_hash(cfg.checkpoint)
+        if sched in WINDOWED:
+            spec["batch_window_s"] = float(cfg.batch_window_s)
+        specs.append(spec)
+    return specs
+
+def skipped_schedulers(cfg: SweepConfig) -> List[str]:
+    # RL cells without a checkpoint would evaluate a random policy.
+    if cfg.checkpoint is None and not cfg.untrained_rl:
+        return [s for s in cfg.schedulers if s in RL_SCHEDULERS]
+    return []
+
+def run_job(spec: Dict[str, Any]) -> Dict[str, Any]:
+    # One evaluation episode. The meta-controller adapts (alpha, beta, gamma)
+    # for every scheduler so rewards are comparable; RL policies act greedily.
+    t0 = time.perf_counter()
+    pool, net, sla, dt_s = build_env_components(spec["env_cfg"])
+    env = ArrayEdgeCloudEnv(pool, net, sla, dt_s=dt_s)
+    wl = WorkloadConfig(**spec["workload"])
+    env.reset(wl.seed)
+    fb = FeatureBuilder()
+    lp, ep, rp = LatencyPredictor(), EnergyPredictor(), SLARiskPredictor()
+    fused = FusedPredictor(lp, ep, rp)
+    agg_cfg = AggregationConfig(**spec["agg_cfg"])
+    meta = MetaController(MetaConfig(**spec["meta_cfg"]))
+    signals = IncrementalSignalTracker(SignalConfig(window=spec["signal_window"]))
+    alpha, beta, gamma = meta.update(signals.phi())
+    sched = spec["scheduler"]
+    rl = sched in RL_SCHEDULERS
+    guard = None
+    if rl:
+        import torch   # only the RL cells pay for torch
+        from src.agents.networks import Actor
+        torch.set_num_threads(1)
+        agg = PredictionAggregator(agg_cfg)
+        vec = StateVectorizer(env.nodes.node_ids, agg.out_dim)
+        torch.manual_seed(int(spec["workload"]["seed"]) % (2**31))
+        actor = Actor(vec.state_dim, env.num_nodes)
+        if spec.get("checkpoint"):
+            actor.load_state_dict(torch.load(spec["checkpoint"], map_location="cpu")["actor"])
+        actor.eval()
+        if sched == "rl_guarded":
+            guard = LazyGuard(FeasibilityConfig(**spec["feas_cfg"]), FallbackConfig(**spec["fall_cfg"]), lp, ep, rp, fb)
+    weights = FixedWeights()
+    acc = EpisodeAccumulator()
+
+    def _place(task, j: int) -> None:
+        nonlocal alpha, beta, gamma
+        _, res, _, _ = env.step(task, j)
+        acc.update(res, reward_from_step(res, alpha, beta, gamma), task.p)
+        signals.update_from_step(res.latency_s, res.energy_j, res.violation)
+        signals.update_from_arrays(env.observe_arrays())
+        alpha, beta, gamma = meta.update(signals.phi())
+
+    # minmin/maxmin buffer each batch_window_s of arrivals and place the window
+    # with schedule_batch; the env has no arrival clock, so the wait is not charged.
+    window: List[Any] = []
+    window_end = spec.get("batch_window_s", 0.0)
+
+    def _flush() -> None:
+        if not window:
+            return
+        b = fb.build_batch(env.observe_arrays(), TaskBatch.from_tasks(window))
+        sch = schedule_batch(b, fused.predict(b), sched)
+        for t in sch.order.tolist():
+            _place(window[t], int(sch.node_idx[t]))
+        window.clear()
+
+    for chunk in WorkloadGenerator(wl).stream():
+        for t_arr, task in chunk.iter_tasks():
+            if sched in WINDOWED:
+                if t_arr >= window_end:
+                    _flush()
+                    while window_end <= t_arr:
+                        window_end += spec["batch_window_s"]
+                window.append(task)
+                continue
+            state = env.observe_arrays()
+            b = fb.build_batch(state, task)
+            pred = fused.predict(b)
+            if rl:
+                s = vec.vectorize_arrays(state, agg.aggregate_batch(pred.L_hat, pred.E_hat, pred.R_hat, alpha, beta, gamma)[0])
+                with torch.no_grad():
+                    j = int(torch.argmax(actor(torch.from_numpy(s).unsqueeze(0))).item())
+                if guard is not None:
+                    j = guard.decide(state, task, j, alpha, beta, gamma, precomputed=(b, pred)).node_idx
+            else:
+                L, E, R = pred.as_dicts()
+                if sched == "eft":
+                    nid = choose_eft(L)
+                elif sched == "least_energy":
+                    nid = choose_least_energy(E)
+                else:
+                    nid = choose_fixed_weight_sum(L, E, R, weights)
+                j = env.node_index[nid]
+            _place(task, j)
+    _flush()
+    out = {"stats": asdict(acc.stats()), "wall_s": time.perf_counter() - t0}
+    if guard is not None:
+        out["guard_paths"] = dict(guard.stats)
+    return out
+
+class ResultCache:
+    # One JSON file per job under cache_dir/<key[:2]>/<key>.json, written via
+    # rename so an interrupted sweep never leaves a partial entry.
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path(key)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(entry, f, default=str)
+        os.replace(tmp, path)
+
+def _init_worker() -> None:
+    try:
+        import torch
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
+
+def _row(spec: Dict[str, Any], result: Dict[str, Any], cached: bool) -> Dict[str, Any]:
+    wl = spec["workload"]
+    sched = spec["scheduler"]
+    row = {"seed": spec["seed"], "mode": wl["mode"], "rate": wl["lambda_per_s"], "scheduler": sched}
+    row["untrained"] = sched in RL_SCHEDULERS and not spec.get("checkpoint")
+    row["cached"] = cached
+    row.update(result["stats"])
+    row["wall_s"] = result["wall_s"]
+    if "guard_paths" in result:
+        row["guard_paths"] = result["guard_paths"]
+    return row
+
+def run_sweep(cfg: SweepConfig, progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+    # Returns one flat row per cell, in grid order. Cells already in the cache
+    # are loaded, not rerun; each finished cell is cached as soon as it lands.
+    cache = ResultCache(cfg.cache_dir)
+    specs = expand_grid(cfg)
+    keys = [job_key(s) for s in specs]
+    rows: List[Optional[Dict[str, Any]]] = [None] * len(specs)
+    todo = []
+    for i, (spec, key) in enumerate(zip(specs, keys)):
+        hit = cache.get(key)
+        if hit is not None:
+            rows[i] = _row(spec, hit["result"], cached=True)
+            if progress is not None:
+                progress(rows[i])
+        else:
+            todo.append(i)
+
+    def _done(i: int, result: Dict[str, Any]) -> None:
+        cache.put(keys[i], {"spec": specs[i], "result": result})
+        rows[i] = _row(specs[i], result, cached=False)
+        if progress is not None:
+            progress(rows[i])
+
+    workers = cfg.workers or os.cpu_count() or 1
+    if workers == 1 or len(todo) <= 1:
+        for i in todo:
+            _done(i, run_job(specs[i]))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(todo)), initializer=_init_worker) as ex:
+            futs = {ex.submit(run_job, specs[i]): i for i in todo}
+            for fut in as_completed(futs):
+                _done(futs[fut], fut.result())
+    return rows
+
+def summarize_rows(rows: Sequence[Dict[str, Any]], metrics: Sequence[str] = ("sla_viol_rate", "lat_mean", "lat_p95", "eng_mean", "avg_reward")) -> List[Dict[str, Any]]:
+    # Mean and std over seeds per (mode, rate, scheduler).
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for r in rows:
+        groups.setdefault((r["mode"], r["rate"], r["scheduler"]), []).append(r)
+    out = []
+    for (mode, rate, sched), rs in groups.items():
+        row = {"mode": mode, "rate": rate, "scheduler": sched, "n_seeds": len(rs)}
+        for m in metrics:
+            v = np.array([r[m] for r in rs], dtype=float)
+            row[m], row[m + "_std"] = float(v.mean()), float(v.std())
+        out.append(row)
+    return out
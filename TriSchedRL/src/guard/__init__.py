@@ -1,3 +1,5 @@
 from .feasibility import FeasibilityConfig
 from .repair import feasible_set, repair_action
 from .fallback import FallbackConfig, fallback_action
+from .vectorized import ACCEPT, REPAIR, FALLBACK, GuardDecision, feasibility_mask, guard_arrays, guard_batch
+from .lazy import LazyGuard, LazyDecision
@@ -0,0 +1,118 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Union
+from src.workloads.task import IoTTask
+from src.env.arrays import ArrayState
+from src.predictors.feature_builder import CandidateBatch, FeatureBuilder
+from src.predictors.latency_predictor import LatencyPredictor
+from src.predictors.energy_predictor import EnergyPredictor
+from src.predictors.sla_risk_predictor import SLARiskPredictor
+from src.predictors.fused import FusedPredictor, Predictions
+from src.evaluation.instrumentation import NULL_INSTRUMENTATION, Instrumentation
+from .feasibility import FeasibilityConfig, is_feasible
+from .fallback import FallbackConfig
+from .vectorized import PATH_NAMES, batch_feasibility_mask, feasibility_mask, guard_arrays
+
+@dataclass
+class LazyDecision:
+    node_idx: int
+    node_id: str
+    path: str  # "accept" | "repair" | "fallback"
+
+class LazyGuard:
+    # Scores only the proposed node first; the full candidate set is predicted
+    # (in one fused pass) only when the proposal is rejected.
+    def __init__(
+        self,
+        feas_cfg: FeasibilityConfig,
+        fall_cfg: FallbackConfig,
+        latency: LatencyPredictor,
+        energy: EnergyPredictor,
+        risk: SLARiskPredictor,
+        feature_builder: Optional[FeatureBuilder] = None,
+        instr: Instrumentation = NULL_INSTRUMENTATION,
+    ):
+        self.feas_cfg = feas_cfg
+        self.fall_cfg = fall_cfg
+        self.latency = latency
+        self.energy = energy
+        self.risk = risk
+        self.fb = feature_builder or FeatureBuilder()
+        self.fused = FusedPredictor(latency, energy, risk)
+        self.instr = instr
+        self.stats: Dict[str, int] = {name: 0 for name in PATH_NAMES}
+        self._index_cache: Tuple[Optional[list], Dict[str, int]] = (None, {})
+
+    def reset_stats(self) -> None:
+        for k in self.stats:
+            self.stats[k] = 0
+
+    def hit_rates(self) -> Dict[str, float]:
+        total = sum(self.stats.values())
+        return {k: (v / total if total else 0.0) for k, v in self.stats.items()}
+
+    def _node_index(self, state: Union[ArrayState, Dict[str, Any]], node: Union[int, str]) -> int:
+        if not isinstance(node, str):
+            return int(node)
+        ids = state.node_ids if isinstance(state, ArrayState) else None
+        if ids is None:
+            return next(i for i, n in enumerate(state["nodes"]) if str(n["node_id"]) == node)
+        if self._index_cache[0] is not ids:
+            self._index_cache = (ids, {nid: i for i, nid in enumerate(ids)})
+        return self._index_cache[1][node]
+
+    def decide(
+        self,
+        state: Union[ArrayState, Dict[str, Any]],
+        task: IoTTask,
+        proposed: Union[int, str],
+        alpha: float,
+        beta: float,
+        gamma: float,
+        precomputed: Optional[Tuple[CandidateBatch, Predictions]] = None,
+    ) -> LazyDecision:
+        # precomputed: the caller's (batch, predictions) for every candidate of
+        # this task (e.g. built for kappa); the guard then predicts nothing.
+        instr = self.instr
+        i = self._node_index(state, proposed)
+        if precomputed is not None:
+            b, pred = precomputed
+            with instr.stage("guard.check_proposed"):
+                ok = bool(feasibility_mask(self.feas_cfg, b.c_mi, b.d_s, b.p, b.capacity_mi_step[i], b.energy_budget_j_step[i],
+                                           pred.L_hat[i], pred.E_hat[i], pred.R_hat[i]))
+            if ok:
+                self.stats["accept"] += 1
+                instr.count("guard.accept")
+                return LazyDecision(node_idx=i, node_id=b.node_ids[i], path="accept")
+            with instr.stage("guard.full_scan"):
+                mask = batch_feasibility_mask(self.feas_cfg, b, pred)
+                dec = guard_arrays(self.fall_cfg, mask, pred.L_hat, pred.E_hat, pred.R_hat, i, alpha, beta, gamma)
+            return self._record(b, mask, dec)
+        with instr.stage("guard.check_proposed"):
+            nid, x = self.fb.build_candidate(state, task, i)
+            L = self.latency.predict_one(x)
+            E = self.energy.predict_one(x)
+            R = self.risk.predict_one(task.d_s, L)
+            budget = x.node["energy_budget_j_step"]
+            ok = is_feasible(self.feas_cfg, task, x.node["capacity_mi_step"], None if budget < 0 else budget, L, E, R)
+        if ok:
+            self.stats["accept"] += 1
+            instr.count("guard.accept")
+            return LazyDecision(node_idx=i, node_id=nid, path="accept")
+
+        with instr.stage("guard.full_scan"):
+            b = self.fb.build_batch(state, task)
+            pred = self.fused.predict(b)
+            mask = batch_feasibility_mask(self.feas_cfg, b, pred)
+            dec = guard_arrays(self.fall_cfg, mask, pred.L_hat, pred.E_hat, pred.R_hat, i, alpha, beta, gamma)
+        return self._record(b, mask, dec)
+
+    def _record(self, b: CandidateBatch, mask, dec) -> LazyDecision:
+        instr = self.instr
+        j = int(dec.chosen[0])
+        path = PATH_NAMES[int(dec.path[0])]
+        self.stats[path] += 1
+        instr.count(f"guard.{path}")
+        if instr.enabled:
+            instr.observe("feasible_set_size", int(mask.sum()))
+        return LazyDecision(node_idx=j, node_id=b.node_ids[j], path=path)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict
+import numpy as np
+from src.predictors.feature_builder import CandidateBatch
+from src.predictors.fused import Predictions
+from .feasibility import FeasibilityConfig
+from .fallback import FallbackConfig
+
+ACCEPT, REPAIR, FALLBACK = 0, 1, 2
+PATH_NAMES = ("accept", "repair", "fallback")
+
+def feasibility_mask(cfg: FeasibilityConfig, c_mi, d_s, p, capacity_mi_step, energy_budget_j_step, L_hat, E_hat, R_hat) -> np.ndarray:
+    # Array form of is_feasible; task columns (T, 1) against node columns (N,).
+    # A negative energy budget means "no budget", as in FeatureBuilder.
+    ok = ~(c_mi > capacity_mi_step)
+    if cfg.enforce_deadline:
+        ok = ok & ~(L_hat > d_s)
+    if cfg.enforce_energy_budget:
+        ok = ok & ~((energy_budget_j_step >= 0) & (E_hat > energy_budget_j_step))
+    if cfg.use_risk_threshold:
+        ok = ok & ~((p >= cfg.high_priority_min_p) & (R_hat > cfg.risk_threshold_high_priority))
+    return np.broadcast_to(ok, np.broadcast_shapes(np.shape(ok), np.shape(L_hat)))
+
+def batch_feasibility_mask(cfg: FeasibilityConfig, b: CandidateBatch, pred: Predictions) -> np.ndarray:
+    return feasibility_mask(cfg, b.c_mi, b.d_s, b.p, b.capacity_mi_step, b.energy_budget_j_step, pred.L_hat, pred.E_hat, pred.R_hat)
+
+def masked_argmin(score: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    # First minimum among masked entries per row, like the strict "<" scans in repair_action.
+    masked = np.where(mask & ~np.isnan(score), score, np.inf)
+    idx = np.argmin(masked, axis=-1)
+    rows = np.arange(mask.shape[0])
+    stuck = ~mask[rows, idx] & mask.any(axis=-1)
+    if stuck.any():
+        idx[stuck] = np.argmax(mask[stuck], axis=-1)
+    return idx
+
+def _col(x, T: int) -> np.ndarray:
+    return np.broadcast_to(np.asarray(x, dtype=np.float64).reshape(-1, 1), (T, 1))
+
+def fallback_scores(cfg: FallbackConfig, L_hat: np.ndarray, E_hat: np.ndarray, R_hat: np.ndarray) -> np.ndarray:
+    if cfg.mode == "eft":
+        return L_hat
+    if cfg.mode == "least_energy":
+        return E_hat
+    if cfg.mode == "weighted":
+        return cfg.alpha * R_hat + cfg.beta * L_hat + cfg.gamma * E_hat
+    raise ValueError(f"Unknown fallback mode: {cfg.mode}")
+
+@dataclass
+class GuardDecision:
+    chosen: np.ndarray   # (T,) node index
+    path: np.ndarray     # (T,) ACCEPT | REPAIR | FALLBACK
+    mask: np.ndarray     # (T, N) feasibility mask
+
+    def counts(self) -> Dict[str, int]:
+        c = np.bincount(self.path, minlength=3)
+        return {name: int(c[i]) for i, name in enumerate(PATH_NAMES)}
+
+def guard_arrays(
+    fall_cfg: FallbackConfig,
+    mask: np.ndarray,
+    L_hat: np.ndarray,
+    E_hat: np.ndarray,
+    R_hat: np.ndarray,
+    proposed,
+    alpha,
+    beta,
+    gamma,
+) -> GuardDecision:
+    mask = np.atleast_2d(mask)
+    L_hat, E_hat, R_hat = np.atleast_2d(L_hat), np.atleast_2d(E_hat), np.atleast_2d(R_hat)
+    T = mask.shape[0]
+    rows = np.arange(T)
+    proposed = np.broadcast_to(np.asarray(proposed, dtype=np.int64), (T,))
+
+    accept = mask[rows, proposed]
+    has_feasible = mask.any(axis=-1)
+    repair_score = _col(alpha, T) * R_hat + _col(beta, T) * L_hat + _col(gamma, T) * E_hat
+    repaired = masked_argmin(repair_score, mask)
+    fallback = masked_argmin(fallback_scores(fall_cfg, L_hat, E_hat, R_hat), np.ones_like(mask))
+
+    chosen = np.where(accept, proposed, np.where(has_feasible, repaired, fallback))
+    path = np.where(accept, ACCEPT, np.where(has_feasible, REPAIR, FALLBACK)).astype(np.int64)
+    return GuardDecision(chosen=chosen, path=path, mask=mask)
+
+def guard_batch(
+    feas_cfg: FeasibilityConfig,
+    fall_cfg: FallbackConfig,
+    b: CandidateBatch,
+    pred: Predictions,
+    proposed,
+    alpha,
+    beta,
+    gamma,
+) -> GuardDecision:
+    mask = batch_feasibility_mask(feas_cfg, b, pred)
+    return guard_arrays(fall_cfg, mask, pred.L_hat, pred.E_hat, pred.R_hat, proposed, alpha, beta, gamma)
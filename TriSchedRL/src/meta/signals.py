@@ -1,12 +1,16 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from collections import deque
-from typing import Deque, Dict, Any
+from typing import Deque, Dict, Any, List, Optional
+import bisect
+import math
 import numpy as np
+from src.env.arrays import ArrayState
 
 @dataclass
 class SignalConfig:
     window: int = 50
+    quantile_mode: str = "exact"  # "exact" | "p2" (IncrementalSignalTracker only; approximate window)
 
 class SignalTracker:
     def __init__(self, cfg: SignalConfig):
@@ -26,7 +30,7 @@ class SignalTracker:
         nodes = state["nodes"]
         rtts = [float(n["rtt_ms"]) for n in nodes]
         bws = [max(1e-6, float(n["bandwidth_mbps"])) for n in nodes]
-        cong = (np.mean(rtts) / 1000.0) / (np.mean(bws))
+        cong = (np.mean(rtts) / 1000.0) / (np.mean(bws)) if nodes else 0.0
         self.cong_q.append(float(cong))
         utils = [float(n["util"]) for n in nodes if n["energy_budget_j_step"] is not None]
         ep = float(np.mean(utils)) if utils else 0.0
@@ -42,3 +46,197 @@ class SignalTracker:
             "congestion": _mean(self.cong_q),
             "energy_pressure": _mean(self.energy_pressure_q),
         }
+
+class WindowMean:
+    # Ring buffer with a running sum: O(1) push and mean. The sum is rebuilt once
+    # per full wrap so floating-point drift stays bounded.
+    def __init__(self, window: int):
+        self.window = max(1, int(window))
+        self.buf: List[float] = []
+        self.pos = 0
+        self.total = 0.0
+
+    def __len__(self) -> int:
+        return len(self.buf)
+
+    def push(self, x: float) -> Optional[float]:
+        x = float(x)
+        if len(self.buf) < self.window:
+            self.buf.append(x)
+            self.total += x
+            return None
+        old = self.buf[self.pos]
+        self.buf[self.pos] = x
+        self.pos += 1
+        if self.pos == self.window:
+            self.pos = 0
+            self.total = math.fsum(self.buf)
+        else:
+            self.total += x - old
+        return old
+
+    def mean(self) -> float:
+        return self.total / len(self.buf) if self.buf else 0.0
+
+class WindowQuantile:
+    # Exact windowed quantile: the window is kept sorted alongside the ring, so an
+    # update is one bisect insert/remove and a query is O(1). Interpolation matches
+    # np.quantile's default ("linear") method.
+    def __init__(self, window: int, p: float):
+        self.ring = WindowMean(window)
+        self.p = float(p)
+        self.sorted: List[float] = []
+
+    def push(self, x: float) -> None:
+        old = self.ring.push(x)
+        if old is not None:
+            del self.sorted[bisect.bisect_left(self.sorted, old)]
+        bisect.insort(self.sorted, float(x))
+
+    def value(self) -> float:
+        return _interp_quantile(self.sorted, self.p)
+
+def _interp_quantile(s: List[float], p: float) -> float:
+    n = len(s)
+    if not n:
+        return 0.0
+    h = p * (n - 1)
+    lo = int(h)
+    if lo + 1 >= n:
+        return float(s[-1])
+    return float(s[lo] + (h - lo) * (s[lo + 1] - s[lo]))
+
+class P2Quantile:
+    # P-square estimator (Jain & Chlamtac, 1985): five markers, O(1) memory and
+    # update. It summarizes the whole stream rather than a sliding window.
+    def __init__(self, p: float):
+        self.p = float(p)
+        self.q: List[float] = []
+        self.n = [0, 1, 2, 3, 4]
+        self.np = [0.0, 2.0 * p, 4.0 * p, 2.0 + 2.0 * p, 4.0]
+        self.dn = [0.0, p / 2.0, p, (1.0 + p) / 2.0, 1.0]
+
+    def push(self, x: float) -> None:
+        x = float(x)
+        q = self.q
+        if len(q) < 5:
+            bisect.insort(q, x)
+            return
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = max(q[4], x)
+            k = 3
+        else:
+            k = bisect.bisect_right(q, x) - 1
+        n = self.n
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.np[i] += self.dn[i]
+        for i in (1, 2, 3):
+            d = self.np[i] - n[i]
+            if (d >= 1.0 and n[i + 1] - n[i] > 1) or (d <= -1.0 and n[i - 1] - n[i] < -1):
+                s = 1 if d > 0 else -1
+                qp = q[i] + s / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < qp < q[i + 1]:
+                    qp = q[i] + s * (q[i + s] - q[i]) / (n[i + s] - n[i])
+                q[i] = qp
+                n[i] += s
+
+    def value(self) -> float:
+        if len(self.q) < 5:
+            return _interp_quantile(self.q, self.p)
+        return float(self.q[2])
+
+class WindowP2Quantile:
+    # Approximate sliding-window P-square: two estimators restart every `window`
+    # pushes, staggered by half a window. The older one answers queries, so the
+    # estimate always covers the last window/2 to window samples.
+    def __init__(self, window: int, p: float):
+        self.window = max(2, int(window))
+        self.p = float(p)
+        self.est = [P2Quantile(p), P2Quantile(p)]
+        self.count = 0
+
+    def push(self, x: float) -> None:
+        half = self.window // 2
+        if self.count >= half and (self.count - half) % self.window == 0:
+            self.est[1] = P2Quantile(self.p)
+        if self.count and self.count % self.window == 0:
+            self.est[0] = P2Quantile(self.p)
+        self.count += 1
+        for e in self.est:
+            e.push(x)
+
+    def value(self) -> float:
+        # est[0] restarted at the last multiple of window, est[1] half a window off.
+        half = self.window // 2
+        age0 = (self.count - 1) % self.window + 1 if self.count else 0
+        age1 = (self.count - half - 1) % self.window + 1 if self.count > half else 0
+        return (self.est[0] if age0 >= age1 else self.est[1]).value()
+
+class IncrementalSignalTracker:
+    # Drop-in for SignalTracker with O(1) means and incremental p90s.
+    # quantile_mode="exact" reproduces SignalTracker.phi(); "p2" uses
+    # constant-memory P-square estimators over an approximate window instead.
+    def __init__(self, cfg: SignalConfig):
+        mode = cfg.quantile_mode
+        if mode not in ("exact", "p2"):
+            raise ValueError(f"Unknown quantile mode: {mode}")
+        w = int(cfg.window)
+        self.mode = mode
+        self.viol = WindowMean(w)
+        self.cong = WindowMean(w)
+        self.energy_pressure = WindowMean(w)
+        if mode == "exact":
+            self.lat_p90: Any = WindowQuantile(w, 0.90)
+            self.eng_p90: Any = WindowQuantile(w, 0.90)
+        else:
+            self.lat_p90 = WindowP2Quantile(w, 0.90)
+            self.eng_p90 = WindowP2Quantile(w, 0.90)
+
+    def update_from_step(self, latency_s: float, energy_j: float, violation: int) -> None:
+        self.lat_p90.push(latency_s)
+        self.eng_p90.push(energy_j)
+        self.viol.push(violation)
+
+    def update_from_state(self, state: Dict[str, Any]) -> None:
+        nodes = state["nodes"]
+        if not nodes:
+            self.cong.push(0.0)
+            self.energy_pressure.push(0.0)
+            return
+        rtt = bw = util = 0.0
+        n_budget = 0
+        for n in nodes:
+            rtt += float(n["rtt_ms"])
+            bw += max(1e-6, float(n["bandwidth_mbps"]))
+            if n["energy_budget_j_step"] is not None:
+                util += float(n["util"])
+                n_budget += 1
+        self.cong.push((rtt / len(nodes) / 1000.0) / (bw / len(nodes)))
+        self.energy_pressure.push(util / n_budget if n_budget else 0.0)
+
+    def update_from_arrays(self, state: ArrayState) -> None:
+        if not state.rtt_ms.size:
+            self.cong.push(0.0)
+            self.energy_pressure.push(0.0)
+            return
+        bw = np.maximum(1e-6, state.bandwidth_mbps)
+        self.cong.push((float(state.rtt_ms.mean()) / 1000.0) / float(bw.mean()))
+        has_budget = state.energy_budget_j_step >= 0
+        self.energy_pressure.push(float(state.util[has_budget].mean()) if has_budget.any() else 0.0)
+
+    def phi(self) -> Dict[str, float]:
+        return {
+            "viol_rate": self.viol.mean(),
+            "lat_p90": self.lat_p90.value(),
+            "eng_p90": self.eng_p90.value(),
+            "congestion": self.cong.mean(),
+            "energy_pressure": self.energy_pressure.mean(),
+        }
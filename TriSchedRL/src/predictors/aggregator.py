@@ -13,6 +13,11 @@ class PredictionAggregator:
     def __init__(self, cfg: AggregationConfig):
         self.cfg = cfg
 
+    @property
+    def out_dim(self) -> int:
+        # Width of the kappa vector: k (L, E, R) triples plus the optional node count.
+        return 3 * max(1, int(self.cfg.k)) + (1 if self.cfg.include_counts else 0)
+
     def aggregate_topk(self, L: Dict[str, float], E: Dict[str, float], R: Dict[str, float], alpha: float, beta: float, gamma: float) -> np.ndarray:
         items: List[Tuple[str, float]] = []
         for nid in L.keys():
@@ -32,3 +37,23 @@ class PredictionAggregator:
 
     def aggregate(self, L: Dict[str, float], E: Dict[str, float], R: Dict[str, float], alpha: float, beta: float, gamma: float) -> np.ndarray:
         return self.aggregate_topk(L, E, R, alpha, beta, gamma)
+
+    def aggregate_batch(self, L: np.ndarray, E: np.ndarray, R: np.ndarray, alpha, beta, gamma) -> np.ndarray:
+        # Row-wise aggregate_topk for (T, N) predictions -> (T, kappa_dim). A stable
+        # argsort keeps the dict version's tie order.
+        L, E, R = np.atleast_2d(L), np.atleast_2d(E), np.atleast_2d(R)
+        T, N = L.shape
+        a, b, g = (np.asarray(x, dtype=np.float64).reshape(-1, 1) for x in (alpha, beta, gamma))
+        score = a * R + b * L + g * E
+        k = max(1, int(self.cfg.k))
+        top = np.argsort(score, axis=1, kind="stable")[:, :k]
+        rows = np.arange(T)[:, None]
+        out = np.zeros((T, self.out_dim), dtype=np.float32)
+        m = top.shape[1]
+        trip = out[:, : 3 * k].reshape(T, k, 3)
+        trip[:, :m, 0] = L[rows, top]
+        trip[:, :m, 1] = E[rows, top]
+        trip[:, :m, 2] = R[rows, top]
+        if self.cfg.include_counts:
+            out[:, -1] = N
+        return out
@@ -1,6 +1,9 @@
 from __future__ import annotations
-from typing import Dict
-from .feature_builder import CandidateFeatures
+from typing import Dict, Optional
+import numpy as np
+from src.env.network import comm_time, comm_time_cached
+from .feature_builder import CandidateFeatures, CandidateBatch
+from .latency_predictor import LatencyPredictor
 
 class EnergyPredictor:
     def __init__(
@@ -47,5 +50,22 @@ class EnergyPredictor:
         p_w = p_idle + util * p_dyn
         return float(p_w * t_exec + self.nic_power_w * t_comm)
 
+    def t_comm_batch(self, b: CandidateBatch) -> np.ndarray:
+        if b.tx_coef is not None:
+            return comm_time_cached(b.s_mb, b.tx_coef, b.inflation, b.prop_s, self.comm_overhead_ms)
+        return comm_time(b.s_mb, b.bandwidth_mbps, b.rtt_ms, b.loss, self.comm_overhead_ms)
+
+    def predict_batch(self, b: CandidateBatch, t_exec: Optional[np.ndarray] = None, t_comm: Optional[np.ndarray] = None) -> np.ndarray:
+        if t_exec is None:
+            t_exec = LatencyPredictor.t_exec_batch(b.c_mi, b.f_mi_s)
+        if t_comm is None:
+            t_comm = self.t_comm_batch(b)
+        is_cloud = b.kind_is_cloud >= 0.5
+        p_idle = np.where(is_cloud, self.power_idle_cloud_w, self.power_idle_edge_w)
+        p_dyn = np.where(is_cloud, self.power_dyn_cloud_w, self.power_dyn_edge_w)
+        p_w = p_idle + b.util * p_dyn
+        return p_w * t_exec + self.nic_power_w * t_comm
+
     def predict(self, candidates: Dict[str, CandidateFeatures]) -> Dict[str, float]:
-        return {nid: self.predict_one(x) for nid, x in candidates.items()}
+        b = CandidateBatch.from_candidates(candidates)
+        return dict(zip(b.node_ids, self.predict_batch(b).tolist()))
@@ -1,7 +1,9 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Dict, Any
-from src.workloads.task import IoTTask
+from dataclasses import dataclass, fields
+from typing import Dict, Any, List, Optional, Tuple, Union
+import numpy as np
+from src.workloads.task import IoTTask, TaskBatch
+from src.env.arrays import ArrayState
 
 @dataclass
 class CandidateFeatures:
@@ -9,23 +11,193 @@ class CandidateFeatures:
     node: Dict[str, float]
     link: Dict[str, float]
 
+_TASK_COLUMNS = ("c_mi", "d_s", "s_mb", "p")
+
+@dataclass
+class CandidateBatch:
+    # Columnar candidates: task columns are scalars for one task or (T, 1) for a
+    # TaskBatch; node columns are (N,), link columns (N,) or, for a batch from
+    # several sources, (T, N). Everything broadcasts to (N,) or (T, N).
+    node_ids: List[str]
+    c_mi: np.ndarray
+    d_s: np.ndarray
+    s_mb: np.ndarray
+    p: np.ndarray
+    f_mi_s: np.ndarray
+    capacity_mi_step: np.ndarray
+    queue_work_mi: np.ndarray
+    util: np.ndarray
+    energy_budget_j_step: np.ndarray
+    kind_is_cloud: np.ndarray
+    bandwidth_mbps: np.ndarray
+    rtt_ms: np.ndarray
+    loss: np.ndarray
+    # Cached comm-time coefficients shaped like the link columns (from
+    # ArrayState.comm); when set, t_comm_batch is one affine evaluation.
+    tx_coef: Optional[np.ndarray] = None
+    inflation: Optional[np.ndarray] = None
+    prop_s: Optional[np.ndarray] = None
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return np.broadcast_shapes(np.shape(self.c_mi), np.shape(self.f_mi_s))
+
+    def select(self, k: int, cols: np.ndarray) -> "CandidateBatch":
+        # Task k of a (T, N) batch against the node columns in cols only.
+        out = {"node_ids": [self.node_ids[j] for j in cols]}
+        for f in fields(self)[1:]:
+            x = getattr(self, f.name)
+            if x is None:
+                out[f.name] = None
+            elif f.name in _TASK_COLUMNS:
+                out[f.name] = x[k, 0] if np.ndim(x) == 2 else x
+            else:
+                out[f.name] = (x[k] if np.ndim(x) == 2 else x)[cols]
+        return CandidateBatch(**out)
+
+    @classmethod
+    def from_candidates(cls, candidates: Dict[str, CandidateFeatures]) -> "CandidateBatch":
+        ids = list(candidates.keys())
+        xs = [candidates[nid] for nid in ids]
+        def _col(part: str, key: str) -> np.ndarray:
+            return np.array([getattr(x, part)[key] for x in xs], dtype=np.float64)
+        return cls(
+            node_ids=ids,
+            c_mi=_col("task", "c_mi"), d_s=_col("task", "d_s"), s_mb=_col("task", "s_mb"), p=_col("task", "p"),
+            f_mi_s=_col("node", "f_mi_s"),
+            capacity_mi_step=_col("node", "capacity_mi_step"),
+            queue_work_mi=_col("node", "queue_work_mi"),
+            util=_col("node", "util"),
+            energy_budget_j_step=_col("node", "energy_budget_j_step"),
+            kind_is_cloud=_col("node", "kind_is_cloud"),
+            bandwidth_mbps=_col("link", "bandwidth_mbps"),
+            rtt_ms=_col("link", "rtt_ms"),
+            loss=_col("link", "loss"),
+        )
+
 class FeatureBuilder:
+    # Link features come from each task's source: ArrayState.sources on the
+    # array env, the per-node "source_links" rows on a multi-source dict state.
     def __init__(self, iot_src_id: str = "iot"):
+        # Kept for API compatibility; the source now comes from each task.
         self.iot_src_id = iot_src_id
 
+    @staticmethod
+    def _task_features(task: IoTTask) -> Dict[str, float]:
+        return {"c_mi": float(task.c_mi), "d_s": float(task.d_s), "s_mb": float(task.s_mb), "p": float(task.p)}
+
+    @staticmethod
+    def _link_row(n: Dict[str, Any], src: int) -> Tuple[float, float, float]:
+        rows = n.get("source_links")
+        if src and rows is not None:
+            bw, rtt, loss = rows[src]
+            return float(bw), float(rtt), float(loss)
+        return float(n["bandwidth_mbps"]), float(n["rtt_ms"]), float(n["loss"])
+
+    @staticmethod
+    def _node_features(n: Dict[str, Any], src: int = 0) -> Tuple[Dict[str, float], Dict[str, float]]:
+        psi = {
+            "f_mi_s": float(n["f_mi_s"]),
+            "capacity_mi_step": float(n["capacity_mi_step"]),
+            "queue_work_mi": float(n["queue_work_mi"]),
+            "util": float(n["util"]),
+            "energy_budget_j_step": float(n["energy_budget_j_step"]) if n["energy_budget_j_step"] is not None else -1.0,
+            "kind_is_cloud": 1.0 if str(n["kind"]).lower() == "cloud" else 0.0,
+        }
+        bw, rtt, loss = FeatureBuilder._link_row(n, src)
+        link = {"bandwidth_mbps": bw, "rtt_ms": rtt, "loss": loss}
+        return psi, link
+
     def build_candidates(self, state: Dict[str, Any], task: IoTTask) -> Dict[str, CandidateFeatures]:
         feats: Dict[str, CandidateFeatures] = {}
-        phi = {"c_mi": float(task.c_mi), "d_s": float(task.d_s), "s_mb": float(task.s_mb), "p": float(task.p)}
+        phi = self._task_features(task)
+        src = getattr(task, "source", 0)
         for n in state["nodes"]:
-            nid = str(n["node_id"])
+            psi, link = self._node_features(n, src)
+            feats[str(n["node_id"])] = CandidateFeatures(task=phi, node=psi, link=link)
+        return feats
+
+    def build_candidate(self, state: Union[Dict[str, Any], ArrayState], task: IoTTask, i: int) -> Tuple[str, CandidateFeatures]:
+        # Features for the i-th node only; O(1) for an ArrayState.
+        phi = self._task_features(task)
+        if isinstance(state, ArrayState):
             psi = {
-                "f_mi_s": float(n["f_mi_s"]),
-                "capacity_mi_step": float(n["capacity_mi_step"]),
-                "queue_work_mi": float(n["queue_work_mi"]),
-                "util": float(n["util"]),
-                "energy_budget_j_step": float(n["energy_budget_j_step"]) if n["energy_budget_j_step"] is not None else -1.0,
-                "kind_is_cloud": 1.0 if str(n["kind"]).lower() == "cloud" else 0.0,
+                "f_mi_s": float(state.f_mi_s[i]),
+                "capacity_mi_step": float(state.capacity_mi_step[i]),
+                "queue_work_mi": float(state.queue_work_mi[i]),
+                "util": float(state.util[i]),
+                "energy_budget_j_step": float(state.energy_budget_j_step[i]),
+                "kind_is_cloud": 1.0 if state.is_cloud[i] else 0.0,
             }
-            link = {"bandwidth_mbps": float(n["bandwidth_mbps"]), "rtt_ms": float(n["rtt_ms"]), "loss": float(n["loss"])}
-            feats[nid] = CandidateFeatures(task=phi, node=psi, link=link)
-        return feats
+            src = getattr(task, "source", 0)
+            if state.sources is not None and src:
+                bw, rtt, loss = (float(c[i]) for c in state.sources.gather(src))
+            else:
+                bw, rtt, loss = float(state.bandwidth_mbps[i]), float(state.rtt_ms[i]), float(state.loss[i])
+            link = {"bandwidth_mbps": bw, "rtt_ms": rtt, "loss": loss}
+            return state.node_ids[i], CandidateFeatures(task=phi, node=psi, link=link)
+        n = state["nodes"][i]
+        psi, link = self._node_features(n, getattr(task, "source", 0))
+        return str(n["node_id"]), CandidateFeatures(task=phi, node=psi, link=link)
+
+    @staticmethod
+    def _task_columns(task: Union[IoTTask, TaskBatch]) -> Tuple[np.ndarray, ...]:
+        if isinstance(task, TaskBatch):
+            return tuple(np.asarray(c, dtype=np.float64)[:, None] for c in (task.c_mi, task.d_s, task.s_mb, task.p))
+        return tuple(np.float64(v) for v in (task.c_mi, task.d_s, task.s_mb, task.p))
+
+    def build_batch(self, state: Union[Dict[str, Any], ArrayState], task: Union[IoTTask, TaskBatch]) -> CandidateBatch:
+        c_mi, d_s, s_mb, p = self._task_columns(task)
+        if isinstance(state, ArrayState):
+            bw, rtt, loss = state.bandwidth_mbps, state.rtt_ms, state.loss
+            src = task.source if isinstance(task, TaskBatch) else getattr(task, "source", 0)
+            multi = state.sources is not None and src is not None and np.any(src)
+            if multi:
+                # One gather of each task's source row: (T, N) link columns.
+                bw, rtt, loss = state.sources.gather(src)
+            tx = infl = prop = None
+            if state.comm is not None:
+                tx, infl, prop = state.comm.comm_coefficients(src if multi else 0)
+            return CandidateBatch(
+                node_ids=state.node_ids,
+                c_mi=c_mi, d_s=d_s, s_mb=s_mb, p=p,
+                f_mi_s=state.f_mi_s,
+                capacity_mi_step=state.capacity_mi_step,
+                queue_work_mi=state.queue_work_mi,
+                util=state.util,
+                energy_budget_j_step=state.energy_budget_j_step,
+                kind_is_cloud=state.is_cloud.astype(np.float64),
+                bandwidth_mbps=bw,
+                rtt_ms=rtt,
+                loss=loss,
+                tx_coef=tx,
+                inflation=infl,
+                prop_s=prop,
+            )
+        nodes = state["nodes"]
+        def _col(key: str) -> np.ndarray:
+            return np.array([float(n[key]) for n in nodes], dtype=np.float64)
+        bw, rtt, loss = _col("bandwidth_mbps"), _col("rtt_ms"), _col("loss")
+        src = task.source if isinstance(task, TaskBatch) else getattr(task, "source", 0)
+        if src is not None and np.any(src) and nodes and "source_links" in nodes[0]:
+            # (S, N, 3) table, then one row per task source.
+            table = np.array([n["source_links"] for n in nodes], dtype=np.float64).transpose(1, 0, 2)
+            rows = table[np.asarray(src, dtype=np.int64)]
+            bw, rtt, loss = rows[..., 0], rows[..., 1], rows[..., 2]
+        return CandidateBatch(
+            node_ids=[str(n["node_id"]) for n in nodes],
+            c_mi=c_mi, d_s=d_s, s_mb=s_mb, p=p,
+            f_mi_s=_col("f_mi_s"),
+            capacity_mi_step=_col("capacity_mi_step"),
+            queue_work_mi=_col("queue_work_mi"),
+            util=_col("util"),
+            energy_budget_j_step=np.array([-1.0 if n["energy_budget_j_step"] is None else float(n["energy_budget_j_step"]) for n in nodes], dtype=np.float64),
+            kind_is_cloud=np.array([1.0 if str(n["kind"]).lower() == "cloud" else 0.0 for n in nodes], dtype=np.float64),
+            bandwidth_mbps=bw,
+            rtt_ms=rtt,
+            loss=loss,
+        )
@@ -0,0 +1,45 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, Tuple
+import numpy as np
+from .feature_builder import CandidateBatch
+from .latency_predictor import LatencyPredictor
+from .energy_predictor import EnergyPredictor
+from .sla_risk_predictor import SLARiskPredictor
+
+@dataclass
+class Predictions:
+    node_ids: list
+    L_hat: np.ndarray
+    E_hat: np.ndarray
+    R_hat: np.ndarray
+    t_exec: np.ndarray
+    t_queue: np.ndarray
+    t_comm: np.ndarray
+
+    def as_dicts(self) -> Tuple[Dict[str, float], Dict[str, float], Dict[str, float]]:
+        if self.L_hat.ndim != 1:
+            raise ValueError("as_dicts() needs single-task predictions; index the task row first.")
+        ids = self.node_ids
+        return dict(zip(ids, self.L_hat.tolist())), dict(zip(ids, self.E_hat.tolist())), dict(zip(ids, self.R_hat.tolist()))
+
+class FusedPredictor:
+    # Computes L_hat, E_hat and R_hat in one vectorized pass over (N,) or (T, N)
+    # candidates, sharing t_exec and (when the overheads agree) t_comm.
+    def __init__(self, latency: LatencyPredictor, energy: EnergyPredictor, risk: SLARiskPredictor):
+        self.latency = latency
+        self.energy = energy
+        self.risk = risk
+
+    def predict(self, b: CandidateBatch) -> Predictions:
+        t_exec = LatencyPredictor.t_exec_batch(b.c_mi, b.f_mi_s)
+        t_queue = LatencyPredictor.t_queue_batch(b.queue_work_mi, b.f_mi_s)
+        t_comm = self.latency.t_comm_batch(b)
+        L = t_exec + t_queue + t_comm
+        if self.energy.comm_overhead_ms == self.latency.overhead_ms:
+            t_comm_e = t_comm
+        else:
+            t_comm_e = self.energy.t_comm_batch(b)
+        E = self.energy.predict_batch(b, t_exec=t_exec, t_comm=t_comm_e)
+        R = self.risk.predict_batch(b, L)
+        return Predictions(node_ids=b.node_ids, L_hat=L, E_hat=E, R_hat=R, t_exec=t_exec, t_queue=t_queue, t_comm=t_comm)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 from typing import Dict
-from .feature_builder import CandidateFeatures
+import numpy as np
+from src.env.network import comm_time, comm_time_cached
+from .feature_builder import CandidateFeatures, CandidateBatch
 
 class LatencyPredictor:
     def __init__(self, overhead_ms: float = 1.0):
@@ -30,5 +32,24 @@ class LatencyPredictor:
         bw = x.link["bandwidth_mbps"]; rtt = x.link["rtt_ms"]; loss = x.link["loss"]
         return float(self._t_exec(c_mi, f) + self._t_queue(q, f) + self._t_comm(s_mb, bw, rtt, loss))
 
+    @staticmethod
+    def t_exec_batch(c_mi, f_mi_s) -> np.ndarray:
+        ok = f_mi_s > 0
+        return np.where(ok, c_mi / np.where(ok, f_mi_s, 1.0), np.inf)
+
+    @staticmethod
+    def t_queue_batch(queue_work_mi, f_mi_s) -> np.ndarray:
+        ok = f_mi_s > 0
+        return np.where(ok, np.maximum(0.0, queue_work_mi) / np.where(ok, f_mi_s, 1.0), np.inf)
+
+    def t_comm_batch(self, b: CandidateBatch) -> np.ndarray:
+        if b.tx_coef is not None:
+            return comm_time_cached(b.s_mb, b.tx_coef, b.inflation, b.prop_s, self.overhead_ms)
+        return comm_time(b.s_mb, b.bandwidth_mbps, b.rtt_ms, b.loss, self.overhead_ms)
+
+    def predict_batch(self, b: CandidateBatch) -> np.ndarray:
+        return self.t_exec_batch(b.c_mi, b.f_mi_s) + self.t_queue_batch(b.queue_work_mi, b.f_mi_s) + self.t_comm_batch(b)
+
     def predict(self, candidates: Dict[str, CandidateFeatures]) -> Dict[str, float]:
-        return {nid: self.predict_one(x) for nid, x in candidates.items()}
+        b = CandidateBatch.from_candidates(candidates)
+        return dict(zip(b.node_ids, self.predict_batch(b).tolist()))
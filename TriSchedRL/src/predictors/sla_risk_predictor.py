@@ -1,7 +1,8 @@
 from __future__ import annotations
 from typing import Dict
 import math
-from .feature_builder import CandidateFeatures
+import numpy as np
+from .feature_builder import CandidateFeatures, CandidateBatch
 
 class SLARiskPredictor:
     def __init__(self, tau_s: float = 0.25):
@@ -15,11 +16,18 @@ class SLARiskPredictor:
         ez = math.exp(z)
         return ez / (1.0 + ez)
 
+    @staticmethod
+    def _sigmoid_batch(z: np.ndarray) -> np.ndarray:
+        ez = np.exp(-np.abs(z))
+        return np.where(z >= 0, 1.0 / (1.0 + ez), ez / (1.0 + ez))
+
+    def predict_one(self, d_s: float, latency_hat: float) -> float:
+        return float(self._sigmoid((float(latency_hat) - float(d_s)) / self.tau_s))
+
+    def predict_batch(self, b: CandidateBatch, latency_hat: np.ndarray) -> np.ndarray:
+        return self._sigmoid_batch((latency_hat - b.d_s) / self.tau_s)
+
     def predict_from_latency(self, candidates: Dict[str, CandidateFeatures], latency_hat: Dict[str, float]) -> Dict[str, float]:
-        out: Dict[str, float] = {}
-        for nid, x in candidates.items():
-            d = float(x.task["d_s"])
-            L = float(latency_hat[nid])
-            z = (L - d) / self.tau_s
-            out[nid] = float(self._sigmoid(z))
-        return out
+        b = CandidateBatch.from_candidates(candidates)
+        L = np.array([float(latency_hat[nid]) for nid in b.node_ids], dtype=np.float64)
+        return dict(zip(b.node_ids, self.predict_batch(b, L).tolist()))
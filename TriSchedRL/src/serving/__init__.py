@@ -0,0 +1 @@
+from .scheduler_service import ServiceConfig, Placement, SchedulingService, LocalClient, run_load
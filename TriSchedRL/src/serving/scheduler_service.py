@@ -0,0 +1,255 @@
+from __future__ import annotations
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+from src.workloads.task import IoTTask, TaskBatch
+from src.env.array_env import ArrayEdgeCloudEnv
+from src.env.edgecloud_env import StepResult
+from src.predictors.feature_builder import FeatureBuilder
+from src.predictors.latency_predictor import LatencyPredictor
+from src.predictors.energy_predictor import EnergyPredictor
+from src.predictors.sla_risk_predictor import SLARiskPredictor
+from src.predictors.fused import FusedPredictor
+from src.predictors.aggregator import AggregationConfig, PredictionAggregator
+from src.guard.feasibility import FeasibilityConfig
+from src.guard.fallback import FallbackConfig
+from src.guard.vectorized import PATH_NAMES, batch_feasibility_mask, guard_arrays, masked_argmin
+from src.agents.inference import BatchedPolicy
+from src.agents.state_vectorizer import StateVectorizer
+from src.evaluation.metrics import QuantileSketch
+from src.evaluation.instrumentation import NULL_INSTRUMENTATION, Instrumentation
+
+@dataclass
+class ServiceConfig:
+    max_batch: int = 64
+    window_ms: float = 2.0     # how long the first task of a batch waits for company
+    max_queue: int = 10_000
+    greedy: bool = True
+    alpha: float = 0.40
+    beta: float = 0.35
+    gamma: float = 0.25
+    agg_cfg: AggregationConfig = field(default_factory=AggregationConfig)
+    feas_cfg: FeasibilityConfig = field(default_factory=FeasibilityConfig)
+    fall_cfg: FallbackConfig = field(default_factory=FallbackConfig)
+
+@dataclass
+class Placement:
+    task_id: str
+    node_id: str
+    node_idx: int
+    path: str            # "accept" | "repair" | "fallback"
+    decision_s: float    # submit -> placement wall time
+    batch_size: int
+    result: StepResult
+
+class SchedulingService:
+    # Long-lived guarded scheduler. Submissions are gathered for up to window_ms
+    # (or max_batch tasks) and then decided together: one feature build, one fused
+    # prediction pass, one policy forward and one vectorized guard per batch. All
+    # tasks in a batch are proposed and guarded on the same cluster snapshot;
+    # placements are applied in submission order, and a task whose node already
+    # took work in the batch is re-guarded against the updated queues.
+    def __init__(self, env: ArrayEdgeCloudEnv, policy: Optional[BatchedPolicy], cfg: ServiceConfig = ServiceConfig(),
+                 latency: Optional[LatencyPredictor] = None, energy: Optional[EnergyPredictor] = None,
+                 risk: Optional[SLARiskPredictor] = None, instr: Instrumentation = NULL_INSTRUMENTATION):
+        self.env = env
+        self.instr = instr
+        self.policy = policy
+        self.cfg = cfg
+        self.fb = FeatureBuilder()
+        self.fused = FusedPredictor(latency or LatencyPredictor(), energy or EnergyPredictor(), risk or SLARiskPredictor())
+        self.agg = PredictionAggregator(cfg.agg_cfg)
+        self.vec = StateVectorizer(env.nodes.node_ids, self.agg.out_dim)
+        if policy is not None and policy.state_dim != self.vec.state_dim:
+            raise ValueError(f"Policy expects state_dim={policy.state_dim}, service builds {self.vec.state_dim}")
+        self._states = np.zeros((cfg.max_batch, self.vec.state_dim), dtype=np.float32)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._gathered: List[Tuple[IoTTask, asyncio.Future, float]] = []  # taken off the queue, not yet resolved
+        self.latency_sketch = QuantileSketch(rel_err=0.01)
+        self.path_counts: Dict[str, int] = {name: 0 for name in PATH_NAMES}
+        self.n_done = 0
+        self.n_batches = 0
+        self._t_start = 0.0
+
+    async def start(self) -> "SchedulingService":
+        self._queue = asyncio.Queue(maxsize=self.cfg.max_queue)
+        self._t_start = time.perf_counter()
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def stop(self) -> None:
+        # Cancels the batching loop and fails every submission it has not
+        # resolved, gathered or still queued; later submit() calls raise.
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        queue, self._queue = self._queue, None
+        items, self._gathered = self._gathered, []
+        while queue is not None and not queue.empty():
+            items.append(queue.get_nowait())
+        for _, fut, _ in items:
+            if not fut.done():
+                fut.set_exception(RuntimeError("SchedulingService stopped"))
+
+    async def __aenter__(self) -> "SchedulingService":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    async def submit(self, task: IoTTask) -> Placement:
+        if self._queue is None:
+            raise RuntimeError("SchedulingService is not running; call start() first")
+        queue = self._queue
+        fut = asyncio.get_running_loop().create_future()
+        await queue.put((task, fut, time.perf_counter()))
+        if self._queue is not queue and not fut.done():
+            # stop() ran while this put was blocked on a full queue.
+            fut.set_exception(RuntimeError("SchedulingService stopped"))
+        return await fut
+
+    async def _gather(self) -> List[Tuple[IoTTask, asyncio.Future, float]]:
+        items = self._gathered = []
+        items.append(await self._queue.get())
+        deadline = time.perf_counter() + self.cfg.window_ms / 1000.0
+        while len(items) < self.cfg.max_batch:
+            try:
+                items.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            left = deadline - time.perf_counter()
+            if left <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self._queue.get(), left))
+            except asyncio.TimeoutError:
+                break
+        return items
+
+    async def _run(self) -> None:
+        while True:
+            items = await self._gather()
+            try:
+                placements = self.decide([t for t, _, _ in items], [t0 for _, _, t0 in items])
+            except Exception as e:
+                for _, fut, _ in items:
+                    if not fut.done():
+                        fut.set_exception(e)
+                self._gathered = []
+                continue
+            for (_, fut, _), pl in zip(items, placements):
+                if not fut.done():
+                    fut.set_result(pl)
+            self._gathered = []
+
+    def decide(self, tasks: List[IoTTask], t_submit: Optional[List[float]] = None) -> List[Placement]:
+        # Synchronous core of one micro-batch; also usable without the event loop.
+        T = len(tasks)
+        cfg = self.cfg
+        instr = self.instr
+        state = self.env.observe_arrays()
+        with instr.stage("features"):
+            b = self.fb.build_batch(state, TaskBatch.from_tasks(tasks))
+        with instr.stage("predict"):
+            pred = self.fused.predict(b)
+            mask = batch_feasibility_mask(cfg.feas_cfg, b, pred)
+        if self.policy is not None:
+            with instr.stage("aggregate"):
+                kappa = self.agg.aggregate_batch(pred.L_hat, pred.E_hat, pred.R_hat, cfg.alpha, cfg.beta, cfg.gamma)
+            with instr.stage("vectorize"):
+                states = self._states[:T]
+                self.vec.vectorize_arrays(state, kappa[0], out=states[0])
+                states[1:] = states[0]
+                states[:, self.vec.state_dim - self.vec.kappa_dim:] = kappa
+            with instr.stage("policy"):
+                proposed = self.policy.act_batch(states, greedy=cfg.greedy)[0].copy()
+        else:
+            score = cfg.alpha * pred.R_hat + cfg.beta * pred.L_hat + cfg.gamma * pred.E_hat
+            proposed = masked_argmin(score, np.ones_like(mask))
+        with instr.stage("guard"):
+            dec = guard_arrays(cfg.fall_cfg, mask, pred.L_hat, pred.E_hat, pred.R_hat, proposed, cfg.alpha, cfg.beta, cfg.gamma)
+        if instr.enabled:
+            for n in mask.sum(axis=1):
+                instr.observe("feasible_set_size", int(n))
+            instr.observe("batch_size", T)
+
+        now = time.perf_counter()
+        out: List[Placement] = []
+        chosen, paths = dec.chosen, dec.path
+        placed = np.zeros(state.num_nodes, dtype=bool)
+        for k, task in enumerate(tasks):
+            j = int(chosen[k])
+            if placed[j]:
+                j, path_k = self._recheck(b, pred, mask, placed, k, int(proposed[k]))
+            else:
+                path_k = int(paths[k])
+            with instr.stage("env_step"):
+                _, res, _, _ = self.env.step(task, j)
+            placed[j] = True
+            path = PATH_NAMES[path_k]
+            instr.count(f"guard.{path}")
+            waited = now - t_submit[k] if t_submit is not None else 0.0
+            self.path_counts[path] += 1
+            self.latency_sketch.add(waited)
+            out.append(Placement(task.task_id, state.node_ids[j], j, path, waited, T, res))
+        self.n_done += T
+        self.n_batches += 1
+        return out
+
+    def _recheck(self, b, pred, mask: np.ndarray, placed: np.ndarray, k: int, proposed: int) -> Tuple[int, int]:
+        # Task k's snapshot choice already took work earlier in this batch: the
+        # columns of nodes placed so far are re-predicted against the live queues
+        # (b's node columns are views of the env state) and task k is re-guarded.
+        cols = np.flatnonzero(placed)
+        sub = b.select(k, cols)
+        p = self.fused.predict(sub)
+        L, E, R, m = pred.L_hat[k].copy(), pred.E_hat[k].copy(), pred.R_hat[k].copy(), mask[k].copy()
+        L[cols], E[cols], R[cols] = p.L_hat, p.E_hat, p.R_hat
+        m[cols] = batch_feasibility_mask(self.cfg.feas_cfg, sub, p)
+        cfg = self.cfg
+        dec = guard_arrays(cfg.fall_cfg, m[None], L[None], E[None], R[None], proposed, cfg.alpha, cfg.beta, cfg.gamma)
+        return int(dec.chosen[0]), int(dec.path[0])
+
+    def metrics(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self._t_start if self._t_start else 0.0
+        return {
+            "decisions": self.n_done,
+            "batches": self.n_batches,
+            "mean_batch": self.n_done / self.n_batches if self.n_batches else 0.0,
+            "decision_p50_ms": 1000.0 * self.latency_sketch.quantile(0.50),
+            "decision_p99_ms": 1000.0 * self.latency_sketch.quantile(0.99),
+            "throughput_per_s": self.n_done / elapsed if elapsed > 0 else 0.0,
+            "paths": dict(self.path_counts),
+        }
+
+class LocalClient:
+    # In-process client; stands in for a network front end in tests and demos.
+    def __init__(self, service: SchedulingService):
+        self.service = service
+
+    async def schedule(self, task: IoTTask) -> Placement:
+        return await self.service.submit(task)
+
+    async def schedule_many(self, tasks: Iterable[IoTTask]) -> List[Placement]:
+        return list(await asyncio.gather(*(self.service.submit(t) for t in tasks)))
+
+async def run_load(client: LocalClient, arrivals: Iterable[Tuple[float, IoTTask]], time_scale: float = 1.0) -> List[Placement]:
+    # Open-loop load generator: submits each task at its (scaled) arrival time,
+    # without waiting for earlier placements.
+    t0 = time.perf_counter()
+    pending = []
+    for t, task in arrivals:
+        delay = t * time_scale - (time.perf_counter() - t0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        pending.append(asyncio.ensure_future(client.schedule(task)))
+    return list(await asyncio.gather(*pending))
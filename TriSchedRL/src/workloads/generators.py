@@ -1,8 +1,8 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Generator, Iterator, List, Tuple
 import numpy as np
-from .task import IoTTask
+from .task import IoTTask, TaskBatch
 
 @dataclass
 class WorkloadConfig:
@@ -13,6 +13,22 @@ class WorkloadConfig:
     burst_lambda_per_s: float = 8.0
     on_mean_s: float = 4.0
     off_mean_s: float = 3.0
+    num_sources: int = 1          # IoT gateways; rates below are totals split across them
+    source_skew: float = 0.0      # Zipf exponent of the per-source rate split (0 = equal)
+    source_window_s: float = 0.1  # bursty mode: per-source on/off states switch on this grid
+
+@dataclass
+class ArrivalChunk:
+    t: np.ndarray
+    tasks: TaskBatch
+    start_index: int = 0
+
+    def __len__(self) -> int:
+        return int(self.t.shape[0])
+
+    def iter_tasks(self) -> Iterator[Tuple[float, IoTTask]]:
+        for i in range(len(self)):
+            yield float(self.t[i]), self.tasks.task(i, f"t{self.start_index + i}")
 
 class WorkloadGenerator:
     def __init__(self, cfg: WorkloadConfig):
@@ -29,6 +45,8 @@ class WorkloadGenerator:
 
     def generate(self) -> List[Tuple[float, IoTTask]]:
         cfg = self.cfg
+        if cfg.num_sources > 1:
+            return [x for chunk in self.stream() for x in chunk.iter_tasks()]
         arrivals: List[Tuple[float, IoTTask]] = []
         t = 0.0
         i = 0
@@ -62,3 +80,117 @@ class WorkloadGenerator:
             return arrivals
 
         raise ValueError(f"Unknown workload mode: {cfg.mode}")
+
+    @staticmethod
+    def _sample_tasks(rng: np.random.Generator, n: int) -> TaskBatch:
+        c_mi = rng.lognormal(mean=5.2, sigma=0.5, size=n)
+        s_mb = rng.lognormal(mean=0.0, sigma=0.8, size=n)
+        p = rng.integers(0, 3, size=n)
+        d_s = np.maximum(0.2, 0.8 + 0.004 * c_mi + 0.03 * s_mb - 0.1 * p)
+        return TaskBatch(c_mi=c_mi, d_s=d_s, s_mb=s_mb, p=p)
+
+    @staticmethod
+    def _segment_arrivals(rng: np.random.Generator, t: float, seg_end: float, lam: float, block: int) -> Generator[np.ndarray, None, float]:
+        # Yields arrivals in (t, seg_end] block by block; like generate(), the
+        # first overshooting arrival is dropped and returned as the next start.
+        scale = 1.0 / max(1e-6, lam)
+        while True:
+            ts = t + np.cumsum(rng.exponential(scale, size=block))
+            n_in = int(np.searchsorted(ts, seg_end, side="right"))
+            if n_in:
+                yield ts[:n_in]
+            if n_in < block:
+                return float(ts[n_in])
+            t = float(ts[-1])
+
+    def _arrival_times(self, rng: np.random.Generator, block: int) -> Iterator[np.ndarray]:
+        cfg = self.cfg
+        t = 0.0
+        if cfg.mode == "poisson":
+            while t < cfg.horizon_s:
+                t = yield from self._segment_arrivals(rng, t, cfg.horizon_s, cfg.lambda_per_s, block)
+            return
+        if cfg.mode == "bursty":
+            on = True
+            while t < cfg.horizon_s:
+                seg = float(rng.exponential(cfg.on_mean_s if on else cfg.off_mean_s))
+                seg_end = min(cfg.horizon_s, t + seg)
+                lam = cfg.burst_lambda_per_s if on else max(1e-6, cfg.lambda_per_s * 0.2)
+                if t < seg_end:
+                    n_exp = lam * (seg_end - t)
+                    t = yield from self._segment_arrivals(rng, t, seg_end, lam, max(8, int(n_exp + 3.0 * np.sqrt(n_exp)) + 1))
+                on = not on
+            return
+        raise ValueError(f"Unknown workload mode: {cfg.mode}")
+
+    def source_weights(self) -> np.ndarray:
+        w = 1.0 / np.arange(1, max(1, self.cfg.num_sources) + 1) ** self.cfg.source_skew
+        return w / w.sum()
+
+    def _multi_source_arrivals(self, time_rng: np.random.Generator, src_rng: np.random.Generator, block: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        # Per-source arrival processes, vectorized over sources. Poisson: the
+        # superposition is Poisson at the total rate with i.i.d. source labels.
+        # Bursty: every source runs its own on/off chain, switching on a
+        # source_window_s grid, with Poisson arrivals at its share of the rate.
+        cfg = self.cfg
+        w = self.source_weights()
+        if cfg.mode == "poisson":
+            cum = np.cumsum(w)
+            for ts in self._arrival_times(time_rng, block):
+                yield ts, np.minimum(np.searchsorted(cum, src_rng.random(ts.shape[0]), side="right"), w.shape[0] - 1)
+            return
+        if cfg.mode == "bursty":
+            S = w.shape[0]
+            on = src_rng.random(S) < cfg.on_mean_s / (cfg.on_mean_s + cfg.off_mean_s)
+            lam_on, lam_off = cfg.burst_lambda_per_s * w, max(1e-6, cfg.lambda_per_s * 0.2) * w
+            leave_on = -np.expm1(-cfg.source_window_s / cfg.on_mean_s)
+            leave_off = -np.expm1(-cfg.source_window_s / cfg.off_mean_s)
+            t = 0.0
+            while t < cfg.horizon_s:
+                t1 = min(cfg.horizon_s, t + cfg.source_window_s)
+                counts = time_rng.poisson(np.where(on, lam_on, lam_off) * (t1 - t))
+                if counts.any():
+                    ts = t + time_rng.random(int(counts.sum())) * (t1 - t)
+                    order = np.argsort(ts, kind="stable")
+                    yield ts[order], np.repeat(np.arange(S), counts)[order]
+                on ^= src_rng.random(S) < np.where(on, leave_on, leave_off)
+                t = t1
+            return
+        raise ValueError(f"Unknown workload mode: {cfg.mode}")
+
+    def stream(self, chunk_size: int = 4096) -> Iterator[ArrivalChunk]:
+        # Lazily yields columnar chunks of exactly chunk_size arrivals (the last
+        # may be shorter). horizon_s may be float("inf") for an open-ended stream.
+        # Uses its own seeded streams, so it is reproducible and independent of generate().
+        chunk_size = int(chunk_size)
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        time_rng, task_rng, src_rng = (np.random.default_rng(s) for s in np.random.SeedSequence(self.cfg.seed).spawn(3))
+        if self.cfg.num_sources > 1:
+            arrivals = self._multi_source_arrivals(time_rng, src_rng, chunk_size)
+        else:
+            arrivals = ((ts, None) for ts in self._arrival_times(time_rng, chunk_size))
+        pending: List[np.ndarray] = []
+        pending_src: List[np.ndarray] = []
+        n_pending = 0
+        start = 0
+        def _chunk(n: int, ts: np.ndarray, src) -> ArrivalChunk:
+            tasks = self._sample_tasks(task_rng, n)
+            tasks.source = src
+            return ArrivalChunk(t=ts, tasks=tasks, start_index=start)
+        for ts, src in arrivals:
+            pending.append(ts)
+            if src is not None:
+                pending_src.append(src)
+            n_pending += ts.shape[0]
+            while n_pending >= chunk_size:
+                buf = np.concatenate(pending)
+                sbuf = np.concatenate(pending_src) if pending_src else None
+                yield _chunk(chunk_size, buf[:chunk_size], None if sbuf is None else sbuf[:chunk_size])
+                start += chunk_size
+                pending = [buf[chunk_size:]]
+                pending_src = [] if sbuf is None else [sbuf[chunk_size:]]
+                n_pending -= chunk_size
+        if n_pending:
+            buf = np.concatenate(pending)
+            yield _chunk(n_pending, buf, np.concatenate(pending_src) if pending_src else None)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from typing import Optional, Sequence
+import numpy as np
 
 @dataclass
 class IoTTask:
@@ -8,3 +10,35 @@ class IoTTask:
     d_s: float
     s_mb: float
     p: int
+    source: int = 0   # row of the originating gateway in the env's sources x nodes links
+
+@dataclass
+class TaskBatch:
+    # Columnar tasks: one array per IoTTask field (ids are positional).
+    c_mi: np.ndarray
+    d_s: np.ndarray
+    s_mb: np.ndarray
+    p: np.ndarray
+    source: Optional[np.ndarray] = None  # int64 source rows; None means all from source 0
+
+    @classmethod
+    def from_tasks(cls, tasks: Sequence) -> "TaskBatch":
+        src = np.array([getattr(t, "source", 0) for t in tasks], dtype=np.int64)
+        return cls(
+            c_mi=np.array([t.c_mi for t in tasks], dtype=np.float64),
+            d_s=np.array([t.d_s for t in tasks], dtype=np.float64),
+            s_mb=np.array([t.s_mb for t in tasks], dtype=np.float64),
+            p=np.array([t.p for t in tasks], dtype=np.int64),
+            source=src if src.any() else None,
+        )
+
+    def __len__(self) -> int:
+        return int(self.c_mi.shape[0])
+
+    def __getitem__(self, idx) -> "TaskBatch":
+        return TaskBatch(c_mi=self.c_mi[idx], d_s=self.d_s[idx], s_mb=self.s_mb[idx], p=self.p[idx],
+                         source=None if self.source is None else self.source[idx])
+
+    def task(self, i: int, task_id: str = "") -> IoTTask:
+        return IoTTask(task_id=task_id or f"t{i}", c_mi=float(self.c_mi[i]), d_s=float(self.d_s[i]), s_mb=float(self.s_mb[i]), p=int(self.p[i]),
+                       source=0 if self.source is None else int(self.source[i]))
@@ -0,0 +1,163 @@
+from __future__ import annotations
+import csv
+import os
+from typing import Dict, Iterator, List, Optional
+import numpy as np
+
+from .task import TaskBatch
+from .generators import ArrivalChunk
+
+# On-disk layout: a 64-byte header (magic, version, row count) followed by one
+# contiguous little-endian column per field, in TRACE_COLUMNS order.
+TRACE_MAGIC = b"TSRTRACE"
+TRACE_VERSION = 1
+HEADER_BYTES = 64
+TRACE_COLUMNS = (("t", "<f8"), ("c_mi", "<f8"), ("d_s", "<f8"), ("s_mb", "<f8"), ("p", "<i1"))
+_HEADER = np.dtype([("magic", "S8"), ("version", "<u4"), ("pad", "<u4"), ("n_rows", "<u8")])
+
+def _column_offsets(n_rows: int) -> Dict[str, int]:
+    offsets = {}
+    off = HEADER_BYTES
+    for name, dt in TRACE_COLUMNS:
+        offsets[name] = off
+        off += n_rows * np.dtype(dt).itemsize
+    return offsets
+
+def _create(path: str, n_rows: int) -> Dict[str, np.ndarray]:
+    header = np.zeros(1, dtype=_HEADER)
+    header["magic"] = TRACE_MAGIC
+    header["version"] = TRACE_VERSION
+    header["n_rows"] = n_rows
+    with open(path, "wb") as fh:
+        fh.write(header.tobytes().ljust(HEADER_BYTES, b"\0"))
+        fh.truncate(_column_offsets(n_rows)["p"] + n_rows)
+    if n_rows == 0:
+        return {name: np.zeros(0, dtype=dt) for name, dt in TRACE_COLUMNS}
+    offsets = _column_offsets(n_rows)
+    return {name: np.memmap(path, dtype=dt, mode="r+", offset=offsets[name], shape=(n_rows,)) for name, dt in TRACE_COLUMNS}
+
+def _check_priority(p: np.ndarray) -> None:
+    # p is stored as int8; reject values that would wrap or truncate on the cast.
+    info = np.iinfo(dict(TRACE_COLUMNS)["p"])
+    p = np.asarray(p)
+    if p.size and (np.any(p < info.min) or np.any(p > info.max) or np.any(p != np.round(p))):
+        raise ValueError(f"Trace priorities must be integers in [{info.min}, {info.max}]")
+
+def write_trace(path: str, t, c_mi, d_s, s_mb, p) -> int:
+    t = np.asarray(t, dtype=np.float64)
+    if t.size > 1 and np.any(np.diff(t) < 0):
+        raise ValueError("Trace arrival times must be non-decreasing")
+    _check_priority(p)
+    cols = _create(path, int(t.shape[0]))
+    for name, src in zip(("t", "c_mi", "d_s", "s_mb", "p"), (t, c_mi, d_s, s_mb, p)):
+        cols[name][:] = np.asarray(src)
+    for arr in cols.values():
+        if isinstance(arr, np.memmap):
+            arr.flush()
+    return int(t.shape[0])
+
+def import_csv(csv_path: str, out_path: str, columns: Optional[Dict[str, str]] = None, chunk_rows: int = 1 << 20) -> int:
+    # Two streaming passes (count, then parse in chunk_rows blocks) so the CSV is
+    # never held in memory. columns maps trace field -> CSV header name.
+    names = {name: name for name, _ in TRACE_COLUMNS}
+    names.update(columns or {})
+    with open(csv_path, newline="") as fh:
+        n_rows = max(0, sum(1 for line in fh if line.strip()) - 1)
+    cols = _create(out_path, n_rows)
+    with open(csv_path, newline="") as fh:
+        reader = csv.reader(fh)
+        header = next(reader, [])
+        try:
+            pos = [header.index(names[name]) for name, _ in TRACE_COLUMNS]
+        except ValueError as e:
+            raise ValueError(f"CSV {csv_path} is missing a trace column: {e}") from None
+        row = 0
+        last_t = -np.inf
+        buf: List[List[str]] = []
+        for rec in reader:
+            if not rec:
+                continue
+            buf.append([rec[j] for j in pos])
+            if len(buf) == chunk_rows:
+                row, last_t = _flush_rows(cols, buf, row, last_t)
+                buf = []
+        if buf:
+            row, last_t = _flush_rows(cols, buf, row, last_t)
+    for arr in cols.values():
+        if isinstance(arr, np.memmap):
+            arr.flush()
+    if row != n_rows:
+        raise ValueError(f"Expected {n_rows} rows in {csv_path}, parsed {row}")
+    return row
+
+def _flush_rows(cols: Dict[str, np.ndarray], buf: List[List[str]], row: int, last_t: float):
+    block = np.array(buf, dtype=np.float64)
+    t = block[:, 0]
+    if t[0] < last_t or np.any(np.diff(t) < 0):
+        raise ValueError("Trace arrival times must be non-decreasing")
+    _check_priority(block[:, -1])
+    end = row + block.shape[0]
+    for k, (name, dt) in enumerate(TRACE_COLUMNS):
+        cols[name][row:end] = block[:, k].astype(dt)
+    return end, float(t[-1])
+
+class TraceReader:
+    # Read-only memory map over a trace file. Columns are np.memmap views, and
+    # batches are slices of them, so rows are only paged in as they are consumed.
+    def __init__(self, path: str):
+        self.path = path
+        raw = np.fromfile(path, dtype=_HEADER, count=1)
+        if raw.shape[0] != 1 or raw["magic"][0] != TRACE_MAGIC:
+            raise ValueError(f"{path} is not a trace file")
+        if int(raw["version"][0]) != TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version {int(raw['version'][0])}")
+        self.n_rows = int(raw["n_rows"][0])
+        expected = _column_offsets(self.n_rows)["p"] + self.n_rows
+        if os.path.getsize(path) < expected:
+            raise ValueError(f"{path} is truncated")
+        offsets = _column_offsets(self.n_rows)
+        self.columns: Dict[str, np.ndarray] = {}
+        for name, dt in TRACE_COLUMNS:
+            if self.n_rows:
+                self.columns[name] = np.memmap(path, dtype=dt, mode="r", offset=offsets[name], shape=(self.n_rows,))
+            else:
+                self.columns[name] = np.zeros(0, dtype=dt)
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    @property
+    def t(self) -> np.ndarray:
+        return self.columns["t"]
+
+    def duration_s(self) -> float:
+        return float(self.t[-1]) if self.n_rows else 0.0
+
+    def window(self, t_start: Optional[float] = None, t_end: Optional[float] = None):
+        # Row range [lo, hi) of arrivals in (t_start, t_end], matching generate()'s
+        # inclusive horizon. Binary search on the sorted time column.
+        lo = 0 if t_start is None else int(np.searchsorted(self.t, t_start, side="right"))
+        hi = self.n_rows if t_end is None else int(np.searchsorted(self.t, t_end, side="right"))
+        return lo, max(lo, hi)
+
+    def batch(self, lo: int, hi: int, time_scale: float = 1.0, t_offset: float = 0.0) -> ArrivalChunk:
+        c = self.columns
+        tasks = TaskBatch(c_mi=c["c_mi"][lo:hi], d_s=c["d_s"][lo:hi], s_mb=c["s_mb"][lo:hi], p=c["p"][lo:hi])
+        t = c["t"][lo:hi]
+        if time_scale != 1.0 or t_offset != 0.0:
+            t = (t - t_offset) * time_scale
+        return ArrivalChunk(t=t, tasks=tasks, start_index=lo)
+
+    def iter_batches(self, batch_size: int = 4096, t_start: Optional[float] = None, t_end: Optional[float] = None,
+                     time_scale: float = 1.0, rebase: bool = False) -> Iterator[ArrivalChunk]:
+        # time_scale > 1 slows the trace down, < 1 speeds it up. rebase shifts the
+        # window so its first arrival is measured from t_start (or 0).
+        batch_size = int(batch_size)
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        if time_scale <= 0:
+            raise ValueError("time_scale must be positive")
+        lo, hi = self.window(t_start, t_end)
+        t_offset = (t_start or 0.0) if rebase else 0.0
+        for a in range(lo, hi, batch_size):
+            yield self.batch(a, min(hi, a + batch_size), time_scale, t_offset)
@@ -0,0 +1,30 @@
+from dataclasses import replace
+import pytest
+from src.env.resources import ResourcePool, Node
+from src.env.network import NetworkModel, Link
+
+# Small hand-written cluster shared by the env/predictor/guard tests.
+NODE_SPECS = {
+    "edge1": Node("edge1","edge",800.0,1200.0,4.0,12.0,40.0),
+    "edge2": Node("edge2","edge",600.0,900.0,4.0,10.0,35.0),
+    "edge3": Node("edge3","edge",450.0,700.0,3.5,9.0,30.0),
+    "cloud1": Node("cloud1","cloud",2500.0,6000.0,20.0,60.0,None),
+}
+LINK_SPECS = {
+    "edge1": Link(80.0,12.0,0.01,1.0),
+    "edge2": Link(60.0,15.0,0.01,1.2),
+    "edge3": Link(40.0,18.0,0.02,1.5),
+    "cloud1": Link(30.0,60.0,0.01,2.0),
+}
+
+@pytest.fixture
+def make_components():
+    # Factory for fresh (pool, net) pairs over the named nodes, in order, each
+    # linked from "iot". Call it once per env: envs must not share a pool.
+    def _make(*node_ids):
+        pool, net = ResourcePool(), NetworkModel()
+        for nid in node_ids or ("edge1", "cloud1"):
+            pool.add_node(replace(NODE_SPECS[nid]))
+            net.set_link("iot", nid, replace(LINK_SPECS[nid]))
+        return pool, net
+    return _make
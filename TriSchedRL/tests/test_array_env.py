@@ -0,0 +1,15 @@
+from src.env.sla import SLAConfig
+from src.env.edgecloud_env import EdgeCloudEnv, Task
+from src.env.array_env import ArrayEdgeCloudEnv
+
+def test_array_env_matches_dict_env(make_components):
+    ref = EdgeCloudEnv(*make_components(), SLAConfig(True), dt_s=0.1)
+    env = ArrayEdgeCloudEnv(*make_components(), SLAConfig(True), dt_s=0.1)
+    ref.reset(1); env.reset(1)
+    for k in range(20):
+        task = Task(f"t{k}", c_mi=150.0 + 10 * k, d_s=0.5, s_mb=1.5, p=k % 3)
+        nid = "edge1" if k % 3 else "cloud1"
+        _, a, _, _ = ref.step(task, nid)
+        _, b, _, _ = env.step(task, nid)
+        assert a == b
+        assert env.observe_state() == ref.observe_state()
@@ -0,0 +1,19 @@
+from src.env.config import build_env_components, synthetic_env_cfg
+from src.evaluation.benchmark import CASES, BenchConfig, compare, run_suite
+
+def test_synthetic_cluster_shape():
+    pool, net, _, _ = build_env_components(synthetic_env_cfg(40, seed=1))
+    ids = pool.all_ids()
+    assert len(ids) == 40 and sum(i.startswith("cloud") for i in ids) == 2
+    assert net.get_link("iot", "cloud15").rtt_ms == 60.0
+
+def test_suite_runs_every_case_and_flags_regressions():
+    cfg = BenchConfig(node_counts=(4, 8), batch_sizes=(16,), rates=(5.0,), min_time_s=1e-4, repeat=2, agent_max_nodes=4)
+    report = run_suite(cfg)
+    assert {r["case"] for r in report["results"]} == set(CASES)
+    assert all(r["median_us"] > 0 for r in report["results"])
+    assert any(k.startswith("agent.update[") and "nodes=8" in k for k in report["skipped"])
+    slower = {"results": [dict(r, median_us=r["median_us"] / 2) for r in report["results"]]}
+    rows = compare(report, slower, threshold=0.5)
+    assert len(rows) == len(report["results"]) and all(r["regressed"] for r in rows)
+    assert not any(r["regressed"] for r in compare(report, report))
@@ -0,0 +1,43 @@
+import numpy as np
+from src.env.network import Link
+from src.env.sla import SLAConfig
+from src.env.edgecloud_env import Task
+from src.env.array_env import ArrayEdgeCloudEnv
+from src.env.des import DiscreteEventEnv
+from src.workloads.generators import WorkloadConfig, WorkloadGenerator
+
+def test_des_matches_fixed_step_env_on_uniform_arrivals(make_components):
+    ref = ArrayEdgeCloudEnv(*make_components(), SLAConfig(True), dt_s=0.1)
+    des = DiscreteEventEnv(*make_components(), SLAConfig(True))
+    tasks = [Task(f"t{k}", 150.0 + 10 * k, 0.5, 1.5, k % 3) for k in range(20)]
+    ref.reset(1)
+    des.reset(1, arrivals=[(0.1 * (k + 1), x) for k, x in enumerate(tasks)])
+    for k, (_, _, got) in enumerate(des.run(lambda env, task: "edge1" if int(task.task_id[1:]) % 3 else "cloud1")):
+        _, want, _, _ = ref.step(tasks[k], "edge1" if k % 3 else "cloud1")
+        assert got.node_id == want.node_id and got.violation == want.violation
+        assert np.isclose(got.latency_s, want.latency_s) and np.isclose(got.energy_j, want.energy_j)
+    assert des.completed == len(tasks) and des.in_flight.sum() == 0
+
+def test_des_follows_generator_timestamps_and_link_changes(make_components):
+    des = DiscreteEventEnv(*make_components(), SLAConfig(True))
+    arrivals = WorkloadGenerator(WorkloadConfig(seed=2, horizon_s=30.0, lambda_per_s=2.0)).generate()
+    des.reset(0, arrivals=arrivals)
+    des.schedule_link_change(10.0, "edge1", Link(8.0, 12.0, 0.01, 1.0))
+    seen = [(t, res) for t, _, res in des.run(lambda env, task: 0)]
+    assert [t for t, _ in seen] == [t for t, _ in arrivals]
+    slow = [r.t_comm_s for t, r in seen if t > 10.0]
+    fast = [r.t_comm_s for t, r in seen if t < 10.0]
+    assert np.mean(slow) > 5 * np.mean(fast)
+    assert des.now >= arrivals[-1][0] and not des.events
+
+def test_des_reset_restores_links_after_change(make_components):
+    des = DiscreteEventEnv(*make_components(), SLAConfig(True))
+    arrivals = [(1.0, Task("a", 100.0, 1.0, 1.0, 0)), (3.0, Task("b", 100.0, 1.0, 1.0, 0))]
+    des.reset(0, arrivals=arrivals)
+    des.schedule_link_change(2.0, "edge1", Link(8.0, 12.0, 0.01, 1.0))
+    first = [r.t_comm_s for _, _, r in des.run(lambda env, task: "edge1")]
+    assert des.links.bandwidth_mbps[0] == 8.0
+    des.reset(0, arrivals=arrivals)
+    assert des.links.bandwidth_mbps[0] == 80.0
+    second = [r.t_comm_s for _, _, r in des.run(lambda env, task: "edge1")]
+    assert np.isclose(second[0], first[0]) and np.isclose(second[1], first[0]) and first[1] > 5 * first[0]
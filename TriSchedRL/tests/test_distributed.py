@@ -0,0 +1,26 @@
+import numpy as np
+from src.env.config import load_yaml
+from src.workloads.generators import WorkloadConfig
+from src.agents.actor_critic import ACTrainConfig
+from src.agents.replay_buffer import ReplayBuffer, ReplayBufferConfig
+from src.agents.distributed import DistributedConfig, WorkerSpec, TransitionRing, train_distributed
+
+def test_transition_ring_wraps_and_drains():
+    ring = TransitionRing(2, 4)
+    buf = ReplayBuffer(2, ReplayBufferConfig(capacity=16))
+    try:
+        for k in range(10):
+            ring.put(np.full(2, k), k, float(k), np.full(2, k + 1), 0.0)
+            if k % 3 == 2:
+                ring.drain_into(buf)
+        ring.drain_into(buf)
+        assert buf.size == 10 and buf.a[:10].tolist() == list(range(10))
+    finally:
+        ring.close(unlink=True)
+
+def test_train_distributed_smoke():
+    spec = WorkerSpec(env_cfg=load_yaml("configs/env.yaml"), workload=WorkloadConfig(horizon_s=20.0))
+    cfg = DistributedConfig(num_workers=2, total_env_steps=300, warmup_steps=64, publish_every=2, max_wall_s=120.0)
+    out = train_distributed(spec, cfg, ACTrainConfig(batch_size=32))
+    assert out["env_steps"] >= 300 and out["updates"] > 0 and out["weight_versions"] > 1
+    assert out["env_steps_per_s"] > 0
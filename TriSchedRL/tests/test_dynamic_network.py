@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from src.env.config import build_env_components, synthetic_env_cfg
+from src.env.array_env import ArrayEdgeCloudEnv
+from src.env.arrays import LinkArrays
+from src.env.edgecloud_env import Task
+from src.env.network import comm_time
+from src.workloads.task import TaskBatch
+from src.predictors.feature_builder import FeatureBuilder
+from src.predictors.latency_predictor import LatencyPredictor
+from src.env.dynamic_network import DynamicNetwork, GilbertElliottLoss, LinkProcess, MarkovModulatedLink, TraceLinkProcess
+
+def _links(n=50, seed=0):
+    rng = np.random.default_rng(seed)
+    return LinkArrays(rng.uniform(20, 100, n), rng.uniform(5, 60, n), rng.uniform(0, 0.05, n), rng.uniform(0.5, 2, n))
+
+def _ref(l, s_mb, overhead=None):
+    return comm_time(s_mb, l.bandwidth_mbps, l.rtt_ms, l.loss, l.overhead_ms if overhead is None else overhead)
+
+def test_cached_coefficients_track_bulk_updates():
+    l = _links()
+    net = DynamicNetwork(l)
+    s = np.array([[0.0], [1.5], [7.0]])
+    np.testing.assert_allclose(net.comm_time(s), _ref(l, s))
+    before = net.n_refreshed
+    net.update([3, 7], bandwidth_mbps=[5.0, 9.0], loss=0.2)
+    np.testing.assert_allclose(net.comm_time(s), _ref(l, s))
+    np.testing.assert_allclose(net.comm_time(s, overhead_ms=1.0), _ref(l, s, 1.0))
+    assert net.n_refreshed - before == 2
+    assert np.isclose(net.comm_time_one(2.0, 7), _ref(l, 2.0)[7])
+
+def test_stochastic_processes():
+    l = _links(2000)
+    ge = GilbertElliottLoss(good_to_bad_per_s=0.2, bad_to_good_per_s=0.8, loss_bad=0.3)
+    mm = MarkovModulatedLink(switch_per_s=0.5)
+    net = DynamicNetwork(l, [ge, mm], seed=1)
+    base_bw = net.base_bandwidth_mbps.copy()
+    for _ in range(200):
+        net.advance(0.1)
+    assert abs(ge.bad.mean() - 0.2) < 0.05
+    assert np.allclose(l.loss[ge.bad], 0.3) and np.allclose(l.loss[~ge.bad], net.base_loss[~ge.bad])
+    np.testing.assert_allclose(l.bandwidth_mbps, base_bw * np.asarray(mm.bw_levels)[mm.level])
+    np.testing.assert_allclose(net.comm_time(np.array([[2.0]])), _ref(l, np.array([[2.0]])))
+
+def test_trace_replay_updates_only_changed_links():
+    l = _links(4)
+    bw = np.array([[10.0, 20.0, 30.0, 40.0], [10.0, 5.0, 30.0, 40.0]])
+    net = DynamicNetwork(l, [TraceLinkProcess(times=np.array([0.0, 2.0]), bandwidth_mbps=bw)])
+    assert list(l.bandwidth_mbps) == list(bw[0])
+    n0 = net.n_refreshed
+    net.advance(1.0)
+    net.advance(1.5)
+    net.refresh()
+    assert list(l.bandwidth_mbps) == list(bw[1]) and net.n_refreshed - n0 == 1
+
+def test_env_with_dynamic_links():
+    pool, netm, sla, _ = build_env_components(synthetic_env_cfg(8, seed=2))
+    env = ArrayEdgeCloudEnv(pool, netm, sla, dt_s=0.5)
+    env.enable_dynamics([MarkovModulatedLink(switch_per_s=2.0)], seed=3)
+    state = env.observe_arrays()
+    seen = set()
+    for k in range(50):
+        i = k % env.num_nodes
+        expect = float(comm_time(1.0, state.bandwidth_mbps[i], state.rtt_ms[i], state.loss[i], env.links.overhead_ms[i]))
+        _, res, _, _ = env.step(Task(f"t{k}", 100.0, 1.0, 1.0, 0), i)
+        assert np.isclose(res.t_comm_s, expect)
+        seen.add(round(float(state.bandwidth_mbps[0]), 6))
+    assert len(seen) > 1
+    env.reset(0)
+    np.testing.assert_allclose(env.links.bandwidth_mbps, env.dynamics.base_bandwidth_mbps)
+
+def test_predictors_use_cached_coefficients():
+    pool, netm, sla, _ = build_env_components(synthetic_env_cfg(8, seed=2))
+    env = ArrayEdgeCloudEnv(pool, netm, sla, dt_s=0.5)
+    fb, lp = FeatureBuilder(), LatencyPredictor()
+    tasks = TaskBatch.from_tasks([Task(f"t{k}", 100.0, 1.0, 0.5 * k, 0) for k in range(4)])
+    b = fb.build_batch(env.observe_arrays(), tasks)
+    assert b.tx_coef is not None
+    ref = comm_time(b.s_mb, b.bandwidth_mbps, b.rtt_ms, b.loss, lp.overhead_ms)
+    np.testing.assert_allclose(lp.t_comm_batch(b), ref)
+    env.update_links([1], bandwidth_mbps=0.5)
+    b = fb.build_batch(env.observe_arrays(), tasks)
+    np.testing.assert_allclose(lp.t_comm_batch(b), comm_time(b.s_mb, b.bandwidth_mbps, b.rtt_ms, b.loss, lp.overhead_ms))
+    assert b.bandwidth_mbps[1] == 0.5
+    _, res, _, _ = env.step(Task("x", 100.0, 1.0, 2.0, 0), 1)
+    assert np.isclose(res.t_comm_s, comm_time(2.0, 0.5, env.links.rtt_ms[1], env.links.loss[1], env.links.overhead_ms[1]))
+
+def test_link_process_contract_is_enforced():
+    with pytest.raises(TypeError):
+        LinkProcess()
+    with pytest.raises(ValueError):
+        TraceLinkProcess()
+    with pytest.raises(ValueError):
+        TraceLinkProcess(times=np.array([0.0, 1.0]), bandwidth_mbps=np.ones((3, 2)))
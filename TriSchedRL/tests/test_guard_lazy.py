@@ -0,0 +1,44 @@
+import numpy as np
+from src.env.sla import SLAConfig
+from src.env.array_env import ArrayEdgeCloudEnv
+from src.env.edgecloud_env import Task
+from src.workloads.generators import WorkloadConfig, WorkloadGenerator
+from src.predictors.feature_builder import FeatureBuilder
+from src.predictors.latency_predictor import LatencyPredictor
+from src.predictors.energy_predictor import EnergyPredictor
+from src.predictors.sla_risk_predictor import SLARiskPredictor
+from src.guard.feasibility import FeasibilityConfig, is_feasible
+from src.guard.repair import feasible_set, repair_action
+from src.guard.fallback import FallbackConfig, fallback_action
+from src.guard.lazy import LazyGuard
+
+def test_lazy_guard_matches_eager_flow(make_components):
+    env = ArrayEdgeCloudEnv(*make_components("edge1", "edge3", "cloud1"), SLAConfig(True), dt_s=0.05)
+    env.reset(0)
+    fb, lp, ep, rp = FeatureBuilder(), LatencyPredictor(1.0), EnergyPredictor(), SLARiskPredictor(0.25)
+    feas, fall = FeasibilityConfig(), FallbackConfig(mode="eft")
+    guard = LazyGuard(feas, fall, lp, ep, rp, fb)
+    reuse = LazyGuard(feas, fall, lp, ep, rp, fb)
+    rng = np.random.default_rng(5)
+    arrivals = WorkloadGenerator(WorkloadConfig(seed=3, horizon_s=20.0, lambda_per_s=4.0)).generate()
+    for _, tsk in arrivals:
+        state = env.observe_state()
+        cand = fb.build_candidates(state, tsk)
+        L = lp.predict(cand); E = ep.predict(cand); R = rp.predict_from_latency(cand, L)
+        caps = {nid: cand[nid].node["capacity_mi_step"] for nid in cand}
+        budget = {nid: (None if cand[nid].node["energy_budget_j_step"] < 0 else cand[nid].node["energy_budget_j_step"]) for nid in cand}
+        proposed = int(rng.integers(0, env.num_nodes))
+        pid = env.nodes.node_ids[proposed]
+        if is_feasible(feas, tsk, caps[pid], budget[pid], L[pid], E[pid], R[pid]):
+            want = pid
+        else:
+            nf = feasible_set(feas, tsk, caps, budget, L, E, R)
+            want = repair_action(tsk, nf, L, E, R, 1.0, 1.0, 1.0) if nf else fallback_action(fall, tsk, list(cand), L, E, R)
+        dec = guard.decide(env.observe_arrays(), tsk, proposed, 1.0, 1.0, 1.0)
+        assert dec.node_id == want
+        b = fb.build_batch(env.observe_arrays(), tsk)
+        assert reuse.decide(env.observe_arrays(), tsk, proposed, 1.0, 1.0, 1.0, precomputed=(b, guard.fused.predict(b))) == dec
+        env.step(Task(tsk.task_id, tsk.c_mi, tsk.d_s, tsk.s_mb, tsk.p), dec.node_idx)
+    assert sum(guard.stats.values()) == len(arrivals)
+    assert guard.stats["accept"] > 0 and guard.stats["accept"] < len(arrivals)
+    assert reuse.stats == guard.stats
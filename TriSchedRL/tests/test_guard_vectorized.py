@@ -0,0 +1,31 @@
+import numpy as np
+from src.workloads.task import IoTTask, TaskBatch
+from src.guard.feasibility import FeasibilityConfig
+from src.guard.repair import feasible_set, repair_action
+from src.guard.fallback import FallbackConfig, fallback_action
+from src.guard.vectorized import ACCEPT, REPAIR, FALLBACK, feasibility_mask, guard_arrays
+
+def test_guard_batch_matches_scalar_guard():
+    rng = np.random.default_rng(0)
+    T, N = 64, 7
+    tasks = [IoTTask(f"t{i}", float(rng.uniform(50, 900)), float(rng.uniform(0.2, 1.5)), 1.0, int(rng.integers(0, 3))) for i in range(T)]
+    tb = TaskBatch.from_tasks(tasks)
+    caps = rng.uniform(300, 1000, N)
+    budgets = np.where(rng.random(N) < 0.3, -1.0, rng.uniform(2, 10, N))
+    L, E, R = rng.uniform(0.1, 2.0, (T, N)), rng.uniform(1, 12, (T, N)), rng.random((T, N))
+    proposed = rng.integers(0, N, T)
+    feas, fall = FeasibilityConfig(), FallbackConfig(mode="weighted")
+    mask = feasibility_mask(feas, tb.c_mi[:, None], tb.d_s[:, None], tb.p[:, None], caps, budgets, L, E, R)
+    dec = guard_arrays(fall, mask, L, E, R, proposed, 0.4, 0.35, 0.25)
+    ids = [f"n{j}" for j in range(N)]
+    for i, t in enumerate(tasks):
+        Ld, Ed, Rd = (dict(zip(ids, m[i])) for m in (L, E, R))
+        nf = feasible_set(feas, t, dict(zip(ids, caps)), {nid: (None if b < 0 else b) for nid, b in zip(ids, budgets)}, Ld, Ed, Rd)
+        if ids[proposed[i]] in nf:
+            want, path = ids[proposed[i]], ACCEPT
+        elif nf:
+            want, path = repair_action(t, nf, Ld, Ed, Rd, 0.4, 0.35, 0.25), REPAIR
+        else:
+            want, path = fallback_action(fall, t, ids, Ld, Ed, Rd), FALLBACK
+        assert ids[dec.chosen[i]] == want and dec.path[i] == path
+    assert sum(dec.counts().values()) == T
@@ -0,0 +1,32 @@
+import numpy as np
+import torch
+from src.agents.actor_critic import ActorCriticAgent, ACTrainConfig
+
+def test_batched_policy_matches_actor_and_exports(tmp_path):
+    torch.manual_seed(0)
+    agent = ActorCriticAgent(12, 5, ACTrainConfig())
+    pol = agent.inference_policy(max_batch=64, seed=1)
+    states = np.random.default_rng(0).normal(size=(40, 12)).astype(np.float32)
+    acts, probs = (x.copy() for x in pol.act_batch(states, greedy=True, return_probs=True))
+    with torch.no_grad():
+        ref = torch.softmax(agent.actor(torch.from_numpy(states)), dim=-1).numpy()
+    np.testing.assert_array_equal(acts, ref.argmax(axis=1))
+    np.testing.assert_allclose(probs, ref, rtol=1e-5, atol=1e-6)
+    assert pol.act(states[3], greedy=True) == ref[3].argmax()
+
+    sampled = np.concatenate([pol.act_batch(np.repeat(states[:1], 64, 0))[0].copy() for _ in range(50)])
+    freq = np.bincount(sampled, minlength=5) / sampled.size
+    assert np.abs(freq - ref[0]).max() < 0.05
+
+    path = str(tmp_path / "actor.pt")
+    pol.export(path)
+    loaded = torch.jit.load(path)
+    np.testing.assert_allclose(loaded(torch.from_numpy(states)).detach().numpy().argmax(1), acts)
+
+def test_quantized_policy_agrees_mostly():
+    torch.manual_seed(0)
+    agent = ActorCriticAgent(12, 5, ACTrainConfig())
+    states = np.random.default_rng(1).normal(size=(200, 12)).astype(np.float32)
+    full, _ = agent.inference_policy(max_batch=256).act_batch(states, greedy=True)
+    q, _ = agent.inference_policy(max_batch=256, quantize=True).act_batch(states, greedy=True)
+    assert np.mean(full == q) > 0.8
@@ -0,0 +1,49 @@
+import time
+from src.env.config import build_env_components, load_yaml
+from src.env.array_env import ArrayEdgeCloudEnv
+from src.workloads.generators import WorkloadConfig, WorkloadGenerator
+from src.serving import SchedulingService
+from src.evaluation.instrumentation import Instrumentation, NULL_INSTRUMENTATION, StackSampler, profile_episode
+
+def test_stage_histograms_and_exports():
+    instr = Instrumentation()
+    for _ in range(10):
+        with instr.stage("predict"):
+            pass
+    instr.record("predict", 3000.0)
+    instr.count("guard.accept", 3)
+    instr.observe("feasible_set_size", 5)
+    snap = instr.snapshot()
+    h = snap["stages_us"]["predict"]
+    assert h["count"] == 11 and sum(h["buckets"].values()) == 11 and h["max"] >= 3000.0
+    assert snap["values"]["feasible_set_size"]["buckets"]["8.0"] == 1
+    text = instr.to_prometheus()
+    assert 'trischedrl_stage_seconds_bucket{stage="predict",le="+Inf"} 11' in text
+    assert "trischedrl_guard_accept_total 3" in text
+
+def test_service_stages_and_disabled_noop():
+    pool, net, sla, dt_s = build_env_components(load_yaml("configs/env.yaml"))
+    tasks = [x for _, x in WorkloadGenerator(WorkloadConfig(seed=2, horizon_s=30.0)).generate()][:24]
+    instr = Instrumentation()
+    svc = SchedulingService(ArrayEdgeCloudEnv(pool, net, sla, dt_s), None, instr=instr)
+    for i in range(0, 24, 8):
+        svc.decide(tasks[i:i + 8])
+    snap = instr.snapshot()
+    assert snap["stages_us"]["env_step"]["count"] == 24 and snap["stages_us"]["features"]["count"] == 3
+    assert sum(v for k, v in snap["counters"].items() if k.startswith("guard.")) == 24
+    assert snap["values"]["feasible_set_size"]["count"] == 24
+    with NULL_INSTRUMENTATION.stage("x"):
+        NULL_INSTRUMENTATION.count("y")
+    assert NULL_INSTRUMENTATION.snapshot() == {"stages_us": {}, "values": {}, "counters": {}}
+
+def test_episode_profilers():
+    def busy():
+        t0 = time.perf_counter()
+        while time.perf_counter() - t0 < 0.05:
+            sum(range(100))
+    with profile_episode() as prof:
+        busy()
+    assert "busy" in prof["text"]
+    with StackSampler(interval_s=0.001) as s:
+        busy()
+    assert any("busy" in k for k in s.samples)
@@ -0,0 +1,53 @@
+import csv
+import pytest
+import numpy as np
+from src.env.edgecloud_env import StepResult
+from src.evaluation.logger import BufferedLogger, load_npz_parts
+
+FIELDS = ["t", "node_id", "latency_s", "violation"]
+
+def _results(n):
+    return [StepResult(f"n{k % 3}", 0.01 * k, 1.0, k % 2, 0.0, 0.0, 0.0, 0.0) for k in range(n)]
+
+def test_csv_backend_writes_all_rows_in_order(tmp_path):
+    path = str(tmp_path / "logs" / "steps.csv")
+    with BufferedLogger(path, FIELDS, batch_rows=16, max_pending=2) as log:
+        for k, r in enumerate(_results(100)):
+            log.log_result(r, t=float(k))
+    assert log.rows_written == 100
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 100 and list(rows[0].keys()) == FIELDS
+    assert [float(r["t"]) for r in rows] == [float(k) for k in range(100)]
+
+def test_npz_backend_roundtrips_columns(tmp_path):
+    path = str(tmp_path / "steps")
+    with BufferedLogger(path, FIELDS, fmt="npz", batch_rows=32) as log:
+        for k, r in enumerate(_results(50)):
+            log.log_result(r, t=float(k))
+        log.log_columns({"t": np.arange(50, 60.0), "node_id": ["n0"] * 10, "latency_s": np.zeros(10), "violation": np.ones(10, dtype=int)})
+    cols = load_npz_parts(path)
+    assert cols["t"].tolist() == [float(k) for k in range(60)]
+    assert cols["violation"].sum() == 25 + 10
+
+def test_missing_fields_stay_loadable(tmp_path):
+    path = str(tmp_path / "sparse")
+    with BufferedLogger(path, ["a", "b", "node_id"], fmt="npz") as log:
+        log.log({"a": 1.0})
+        log.log({"a": 2.0, "b": 3, "node_id": "n1"})
+    cols = load_npz_parts(path)
+    assert cols["a"].tolist() == [1.0, 2.0] and np.isnan(cols["b"][0]) and cols["b"][1] == 3.0
+    assert cols["node_id"].tolist() == ["", "n1"]
+    with BufferedLogger(path + "_cols", ["a", "b"], fmt="npz") as log:
+        log.log_columns({"a": np.arange(3.0)})
+    cols = load_npz_parts(path + "_cols")
+    assert cols["a"].tolist() == [0.0, 1.0, 2.0] and np.isnan(cols["b"]).all()
+
+def test_parquet_without_pyarrow_fails_at_construction(tmp_path):
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        with pytest.raises(ImportError):
+            BufferedLogger(str(tmp_path / "steps.parquet"), FIELDS, fmt="parquet")
+    else:
+        pytest.skip("pyarrow is installed")
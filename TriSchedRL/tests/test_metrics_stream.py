@@ -0,0 +1,43 @@
+import numpy as np
+from src.env.edgecloud_env import StepResult
+from src.env.vec_env import VecStepResult
+from src.evaluation.metrics import EpisodeAccumulator, merge_all, summarize
+
+def _results(seed, n):
+    rng = np.random.default_rng(seed)
+    lat = rng.lognormal(-1.0, 0.6, size=n)
+    eng = rng.lognormal(1.0, 0.4, size=n)
+    vio = (lat > 0.5).astype(int)
+    nodes = rng.integers(0, 3, size=n)
+    return [StepResult(f"n{k}", float(l), float(e), int(v), 0.0, 0.0, 0.0, 0.0) for k, l, e, v in zip(nodes, lat, eng, vio)]
+
+def test_streaming_accumulator_matches_summarize_and_merges():
+    parts = [_results(s, 3000) for s in range(3)]
+    flat = [r for p in parts for r in p]
+    rewards = [-r.latency_s for r in flat]
+    ref = summarize([r.latency_s for r in flat], [r.energy_j for r in flat], [r.violation for r in flat], rewards)
+
+    accs = []
+    for p in parts:
+        acc = EpisodeAccumulator(breakdown=True)
+        for r in p[:100]:
+            acc.update(r, -r.latency_s, priority=0)
+        acc.update_batch(p[100:], rewards=[-r.latency_s for r in p[100:]])
+        accs.append(acc)
+    got = merge_all(accs)
+    st = got.stats()
+    assert st.n_tasks == ref.n_tasks and np.isclose(st.sla_viol_rate, ref.sla_viol_rate)
+    assert np.isclose(st.lat_mean, ref.lat_mean) and np.isclose(st.avg_reward, ref.avg_reward)
+    assert np.isclose(got.lat.var, np.var([r.latency_s for r in flat]))
+    for a, b in ((st.lat_p95, ref.lat_p95), (st.eng_p99, ref.eng_p99)):
+        assert abs(a - b) <= 0.03 * b
+    assert sum(a.n_tasks for a in got.by_node.values()) == len(flat)
+    assert got.by_priority[0].n_tasks == 300
+
+def test_update_batch_from_vec_step_result():
+    res = VecStepResult(np.array([0, 1, 1]), np.array([0.1, 0.2, 0.3]), np.array([1.0, 2.0, 3.0]), np.array([0, 0, 1]),
+                        np.zeros(3), np.zeros(3), np.zeros(3), np.zeros(3))
+    acc = EpisodeAccumulator(breakdown=True)
+    acc.update_batch(res, priorities=[2, 2, 0], node_ids=["a", "b"])
+    assert acc.by_node["b"].n_tasks == 2 and acc.by_priority[2].violations == 0
+    assert np.isclose(acc.stats().lat_mean, 0.2)
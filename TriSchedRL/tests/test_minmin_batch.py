@@ -0,0 +1,46 @@
+import numpy as np
+from src.env.config import build_env_components, load_yaml
+from src.env.array_env import ArrayEdgeCloudEnv
+from src.workloads.generators import WorkloadConfig, WorkloadGenerator
+from src.predictors.feature_builder import FeatureBuilder
+from src.predictors.latency_predictor import LatencyPredictor
+from src.predictors.energy_predictor import EnergyPredictor
+from src.predictors.sla_risk_predictor import SLARiskPredictor
+from src.predictors.fused import FusedPredictor
+from src.baselines import minmin_batch, maxmin_batch, schedule_batch
+
+def _reference(exec_s, ready, comm, max_min):
+    # Textbook version: full completion-time recompute every round.
+    ready = ready.astype(float).copy()
+    left = list(range(exec_s.shape[0]))
+    order, nodes = [], {}
+    while left:
+        ct = ready[None, :] + exec_s[left] + comm[left]
+        best = ct.min(axis=1)
+        k = int(np.argmax(best) if max_min else np.argmin(best))
+        t, n = left[k], int(np.argmin(ct[k]))
+        order.append(t); nodes[t] = n
+        ready[n] += exec_s[t, n]
+        left.pop(k)
+    return order, [nodes[t] for t in range(exec_s.shape[0])], ready
+
+def test_incremental_heuristics_match_full_recompute():
+    rng = np.random.default_rng(0)
+    exec_s, comm = rng.uniform(0.1, 2.0, (60, 7)), rng.uniform(0.0, 0.3, (60, 7))
+    ready = rng.uniform(0.0, 1.0, 7)
+    for fn, mm in ((minmin_batch, False), (maxmin_batch, True)):
+        got = fn(exec_s, ready, comm)
+        order, nodes, ready_ref = _reference(exec_s, ready, comm, mm)
+        assert got.order.tolist() == order and got.node_idx.tolist() == nodes
+        np.testing.assert_allclose(got.ready_s, ready_ref)
+
+def test_schedule_batch_from_predictions():
+    pool, net, sla, dt_s = build_env_components(load_yaml("configs/env.yaml"))
+    env = ArrayEdgeCloudEnv(pool, net, sla, dt_s)
+    tasks = WorkloadGenerator(WorkloadConfig(seed=3, horizon_s=400.0)).stream(chunk_size=1000)
+    tb = next(tasks).tasks
+    b = FeatureBuilder().build_batch(env.observe_arrays(), tb)
+    pred = FusedPredictor(LatencyPredictor(), EnergyPredictor(), SLARiskPredictor()).predict(b)
+    mm = schedule_batch(b, pred, "minmin")
+    assert sorted(mm.order.tolist()) == list(range(len(tb)))
+    assert schedule_batch(b, pred, "maxmin").makespan > 0
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from src.env.config import build_env_components, synthetic_env_cfg
+from src.env.array_env import ArrayEdgeCloudEnv
+from src.env.edgecloud_env import EdgeCloudEnv
+from src.env.network import NetworkModel, Link, comm_time
+from src.env.sources import SourceLinks
+from src.workloads.generators import WorkloadConfig, WorkloadGenerator
+from src.workloads.task import IoTTask, TaskBatch
+from src.predictors.feature_builder import FeatureBuilder
+from src.predictors.latency_predictor import LatencyPredictor
+from src.predictors.energy_predictor import EnergyPredictor
+from src.predictors.sla_risk_predictor import SLARiskPredictor
+from src.predictors.fused import FusedPredictor
+
+def test_source_link_matrix_dense_and_sparse():
+    net = NetworkModel()
+    nodes = ["a", "b", "c"]
+    for k, g in enumerate(["g0", "g1"]):
+        for j, n in enumerate(nodes):
+            if not (k == 1 and n == "b"):
+                net.set_link(g, n, Link(20.0 + 10 * j + k, 5.0 + j, 0.01 * k, 1.0))
+    sparse = SourceLinks.from_network(net, ["g0", "g1"], nodes, sparse=True)
+    src, s = np.array([0, 1, 1]), np.array([1.0, 2.0, 0.5])
+    t = sparse.comm_time(s, src)
+    for r in range(3):
+        for j, n in enumerate(nodes):
+            key = (["g0", "g1"][src[r]], n)
+            expect = comm_time(s[r], *(getattr(net.links[key], f) for f in ("bandwidth_mbps", "rtt_ms", "loss", "overhead_ms"))) if key in net.links else np.inf
+            assert np.isclose(t[r, j], expect) or (np.isinf(expect) and np.isinf(t[r, j]))
+    sparse.update([1], [0], bandwidth_mbps=1.0)   # node "a" is also g1's padding slot
+    assert np.isclose(sparse.comm_time_one(1.0, 1, 0), comm_time(1.0, 1.0, 5.0, 0.01, 1.0))
+    assert np.isclose(sparse.comm_time(np.array([1.0]), np.array([1]))[0, 0], sparse.comm_time_one(1.0, 1, 0))
+
+def test_mixed_source_batch_predictions_match_per_task():
+    cfg = synthetic_env_cfg(12, seed=4, n_sources=5)
+    pool, net, sla, dt_s = build_env_components(cfg)
+    env = ArrayEdgeCloudEnv(pool, net, sla, dt_s, source_ids=cfg["sources"])
+    tasks = [IoTTask(f"t{i}", 150.0 + 20 * i, 1.0, 0.4 * i + 0.1, i % 3, source=i % 5) for i in range(10)]
+    fb = FeatureBuilder()
+    fused = FusedPredictor(LatencyPredictor(), EnergyPredictor(), SLARiskPredictor())
+    state = env.observe_arrays()
+    pred = fused.predict(fb.build_batch(state, TaskBatch.from_tasks(tasks)))
+    for i, t in enumerate(tasks):
+        one = fused.predict(fb.build_batch(state, t))
+        np.testing.assert_allclose(pred.L_hat[i], one.L_hat)
+        np.testing.assert_allclose(pred.E_hat[i], one.E_hat)
+        j = 3
+        _, x = fb.build_candidate(state, t, j)
+        link = net.get_link(cfg["sources"][t.source], env.nodes.node_ids[j])
+        assert x.link["bandwidth_mbps"] == link.bandwidth_mbps
+    _, res, _, _ = env.step(tasks[7], 3)
+    link = net.get_link(cfg["sources"][2], env.nodes.node_ids[3])
+    assert np.isclose(res.t_comm_s, comm_time(tasks[7].s_mb, link.bandwidth_mbps, link.rtt_ms, link.loss, link.overhead_ms))
+
+def test_dict_env_features_use_task_source():
+    cfg = synthetic_env_cfg(8, seed=2, n_sources=3)
+    pool, net, sla, dt_s = build_env_components(cfg)
+    env = EdgeCloudEnv(pool, net, sla, dt_s, source_ids=cfg["sources"])
+    arr = ArrayEdgeCloudEnv(pool, net, sla, dt_s, source_ids=cfg["sources"])
+    task = IoTTask("t", 200.0, 1.0, 1.5, 1, source=2)
+    fb = FeatureBuilder()
+    state = env.observe_state()
+    b = fb.build_batch(state, task)
+    for j, nid in enumerate(b.node_ids):
+        assert b.bandwidth_mbps[j] == net.get_link(cfg["sources"][2], nid).bandwidth_mbps
+        assert fb.build_candidates(state, task)[nid].link["rtt_ms"] == net.get_link(cfg["sources"][2], nid).rtt_ms
+    np.testing.assert_allclose(b.bandwidth_mbps, fb.build_batch(arr.observe_arrays(), task).bandwidth_mbps)
+    batch = TaskBatch.from_tasks([task, IoTTask("u", 100.0, 1.0, 0.5, 0, source=1)])
+    np.testing.assert_allclose(fb.build_batch(state, batch).rtt_ms, fb.build_batch(arr.observe_state(), batch).rtt_ms)
+
+def test_dynamics_with_sources_refreshes_comm_cache():
+    cfg = synthetic_env_cfg(6, seed=5, n_sources=2)
+    pool, net, sla, dt_s = build_env_components(cfg)
+    env = ArrayEdgeCloudEnv(pool, net, sla, dt_s, source_ids=cfg["sources"])
+    dyn = env.enable_dynamics()
+    dyn.update([2], bandwidth_mbps=0.5)
+    task = IoTTask("t", 100.0, 1.0, 4.0, 0, source=0)
+    _, res, _, _ = env.step(task, 2)
+    link = net.get_link(cfg["sources"][0], env.nodes.node_ids[2])
+    assert np.isclose(res.t_comm_s, comm_time(4.0, 0.5, link.rtt_ms, link.loss, link.overhead_ms))
+    env.reset(0)
+    _, res, _, _ = env.step(task, 2)
+    assert np.isclose(res.t_comm_s, comm_time(4.0, link.bandwidth_mbps, link.rtt_ms, link.loss, link.overhead_ms))
+    sparse = ArrayEdgeCloudEnv(pool, net, sla, dt_s, source_ids=cfg["sources"], sparse_sources=True)
+    with pytest.raises(ValueError):
+        sparse.enable_dynamics()
+
+def test_per_source_arrivals():
+    for mode in ("poisson", "bursty"):
+        cfg = WorkloadConfig(seed=3, mode=mode, horizon_s=300.0, lambda_per_s=40.0, burst_lambda_per_s=80.0,
+                             num_sources=50, source_skew=1.0)
+        gen = WorkloadGenerator(cfg)
+        chunks = list(gen.stream(chunk_size=1000))
+        t = np.concatenate([c.t for c in chunks])
+        src = np.concatenate([c.tasks.source for c in chunks])
+        assert np.all(np.diff(t) >= 0) and src.min() >= 0 and src.max() < 50
+        freq = np.bincount(src, minlength=50) / src.size
+        assert abs(freq[0] - gen.source_weights()[0]) < 0.03 and freq[0] > freq[10] > freq[49]
+    arrivals = WorkloadGenerator(WorkloadConfig(seed=1, horizon_s=20.0, num_sources=4)).generate()
+    assert {task.source for _, task in arrivals} == {0, 1, 2, 3}
+
+def test_feature_builder_accepts_legacy_source_keyword():
+    assert FeatureBuilder(iot_src_id="gw").iot_src_id == "gw"
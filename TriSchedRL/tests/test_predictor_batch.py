@@ -0,0 +1,39 @@
+import numpy as np
+from src.env.sla import SLAConfig
+from src.env.array_env import ArrayEdgeCloudEnv
+from src.env.edgecloud_env import Task
+from src.workloads.task import IoTTask, TaskBatch
+from src.predictors.feature_builder import FeatureBuilder
+from src.predictors.latency_predictor import LatencyPredictor
+from src.predictors.energy_predictor import EnergyPredictor
+from src.predictors.sla_risk_predictor import SLARiskPredictor
+from src.predictors.fused import FusedPredictor
+from src.predictors.aggregator import AggregationConfig, PredictionAggregator
+
+def test_fused_predictions_match_per_node_predictors(make_components):
+    env = ArrayEdgeCloudEnv(*make_components("edge1", "edge2", "cloud1"), SLAConfig(True))
+    env.step(Task("w", 900.0, 1.0, 2.0, 0), "edge2")
+    tasks = [IoTTask(f"t{i}", 120.0 + 40 * i, 0.3 + 0.1 * i, 0.5 * i, i % 3) for i in range(4)]
+    fb = FeatureBuilder()
+    lp, ep, rp = LatencyPredictor(1.0), EnergyPredictor(), SLARiskPredictor(0.25)
+    fused = FusedPredictor(lp, ep, rp).predict(fb.build_batch(env.observe_arrays(), TaskBatch.from_tasks(tasks)))
+    assert fused.L_hat.shape == (4, env.num_nodes)
+    for i, t in enumerate(tasks):
+        cand = fb.build_candidates(env.observe_state(), t)
+        L = {nid: lp.predict_one(x) for nid, x in cand.items()}
+        E = {nid: ep.predict_one(x) for nid, x in cand.items()}
+        for j, nid in enumerate(fused.node_ids):
+            assert np.isclose(fused.L_hat[i, j], L[nid])
+            assert np.isclose(fused.E_hat[i, j], E[nid])
+            assert np.isclose(fused.R_hat[i, j], rp.predict_one(t.d_s, L[nid]))
+
+def test_aggregate_batch_matches_dict_aggregate():
+    rng = np.random.default_rng(0)
+    L, E, R = rng.random((3, 5, 4))
+    ids = [f"n{j}" for j in range(4)]
+    for k in (2, 6):
+        agg = PredictionAggregator(AggregationConfig(k=k))
+        got = agg.aggregate_batch(L, E, R, 0.4, 0.35, 0.25)
+        for i in range(5):
+            row = lambda X: dict(zip(ids, X[i]))
+            np.testing.assert_allclose(got[i], agg.aggregate(row(L), row(E), row(R), 0.4, 0.35, 0.25))
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from src.agents.prioritized_replay import SegmentTree, PrioritizedReplayBuffer, PrioritizedReplayConfig
+from src.agents.actor_critic import ActorCriticAgent, ACTrainConfig
+
+def test_segment_trees_match_numpy():
+    rng = np.random.default_rng(0)
+    vals = rng.random(37)
+    st, mt = SegmentTree(37, "sum"), SegmentTree(37, "min")
+    st.update(np.arange(37), vals)
+    mt.update(np.arange(37), vals)
+    idx = rng.integers(0, 37, size=10)
+    vals[idx] = rng.random(10)
+    st.update(idx, vals[idx]); mt.update(idx, vals[idx])
+    assert np.isclose(st.root, vals.sum()) and np.isclose(mt.root, vals.min())
+    u = rng.random(200) * vals.sum()
+    np.testing.assert_array_equal(st.find_prefixsum(u), np.searchsorted(np.cumsum(vals), u, side="right"))
+
+def test_prioritized_sampling_follows_td_errors_and_feeds_update():
+    dim = 3
+    buf = PrioritizedReplayBuffer(dim, PrioritizedReplayConfig(capacity=64, alpha=1.0))
+    n = 50
+    buf.add_batch(np.zeros((n, dim)), np.zeros(n, dtype=int), np.zeros(n), np.zeros((n, dim)), np.zeros(n))
+    td = np.full(n, 0.01)
+    td[7] = 10.0
+    buf.update_priorities(np.arange(n), td)
+    b = buf.sample(1000)
+    assert np.mean(b["idx"] == 7) > 0.9
+    assert b["w"].max() <= 1.0 + 1e-6 and b["w"][b["idx"] == 7].max() < b["w"].max()
+
+    agent = ActorCriticAgent(dim, 2, ACTrainConfig(batch_size=16))
+    batch = buf.sample(16)
+    agent.update(batch)
+    buf.update_priorities(batch["idx"], agent.last_td_errors)
+    assert agent.last_td_errors.shape == (16,)
+
+def test_sampling_empty_buffer_raises():
+    with pytest.raises(ValueError):
+        PrioritizedReplayBuffer(2, PrioritizedReplayConfig(capacity=4)).sample(2)
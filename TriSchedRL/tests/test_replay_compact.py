@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from src.agents.replay_buffer import ReplayBuffer, ReplayBufferConfig, CompactReplayBuffer, CompactReplayConfig
+
+def _episodes(n_eps, ep_len, dim):
+    # state row = [step id, ...]; transition k goes step k -> k+1 with action k.
+    out = []
+    sid = 0
+    for _ in range(n_eps):
+        for j in range(ep_len):
+            out.append((np.full(dim, sid, np.float32), sid, 1.0, np.full(dim, sid + 1, np.float32), j == ep_len - 1))
+            sid += 1
+        sid += 1
+    return out
+
+def _check(batch):
+    np.testing.assert_array_equal(batch["s"][:, 0], batch["a"])
+    np.testing.assert_array_equal(batch["sp"][:, 0], batch["a"] + 1)
+
+def test_compact_buffer_dedups_states_and_evicts_consistently():
+    dim = 6
+    buf = CompactReplayBuffer(dim, CompactReplayConfig(capacity=64))
+    data = _episodes(20, 10, dim)
+    for k, (s, a, r, sp, d) in enumerate(data):
+        if k % 3:
+            buf.add(s, a, r, sp, d)
+        else:
+            buf.add_batch(s[None], [a], [r], sp[None], [d])
+    assert buf.size == 64
+    _check(buf.sample(256))
+    ref = ReplayBuffer(dim, ReplayBufferConfig(capacity=64))
+    assert buf.obs.nbytes < 0.7 * (ref.s.nbytes + ref.sp.nbytes)
+
+def test_compact_buffer_batched_float16_and_shared_memmap(tmp_path):
+    dim = 4
+    cfg = CompactReplayConfig(capacity=100, storage_dtype="float16", memmap_dir=str(tmp_path))
+    buf = CompactReplayBuffer(dim, cfg)
+    data = _episodes(5, 30, dim)
+    cols = [np.array(c) for c in zip(*data)]
+    buf.add_batch(*cols)
+    assert buf.size == 100 and buf.obs.dtype == np.float16
+    buf.flush()
+    reader = CompactReplayBuffer(dim, cfg, readonly=True)
+    assert reader.size == 100
+    _check(reader.sample(64))
+
+def test_uint8_quantized_storage():
+    buf = CompactReplayBuffer(2, CompactReplayConfig(capacity=8, storage_dtype="uint8", quant_low=0.0, quant_high=10.0))
+    buf.add([1.0, 2.0], 0, 0.0, [3.0, 9.5], False)
+    b = buf.sample(1)
+    np.testing.assert_allclose(b["sp"][0], [3.0, 9.5], atol=10.0 / 255)
+
+def test_reopened_memmap_keeps_the_dedup_chain(tmp_path):
+    dim = 4
+    cfg = CompactReplayConfig(capacity=50, memmap_dir=str(tmp_path))
+    s, a, r, sp, d = (np.array(c) for c in zip(*_episodes(1, 6, dim)))
+    buf = CompactReplayBuffer(dim, cfg)
+    buf.add_batch(s[:3], a[:3], r[:3], sp[:3], d[:3])
+    buf.flush()
+    del buf
+    reopened = CompactReplayBuffer(dim, cfg)
+    reopened.add_batch(s[3:], a[3:], r[3:], sp[3:], d[3:])
+    assert int(reopened.meta[0]) == 6 + 1   # one slot per state, no duplicate at the seam
+    _check(reopened.sample(32))
+    with pytest.raises(ValueError):
+        CompactReplayBuffer(dim, CompactReplayConfig(capacity=50), readonly=True)
@@ -0,0 +1,66 @@
+import asyncio
+import pytest
+import torch
+from src.env.config import build_env_components, load_yaml
+from src.env.array_env import ArrayEdgeCloudEnv
+from src.workloads.generators import WorkloadConfig, WorkloadGenerator
+from src.workloads.task import IoTTask
+from src.agents.actor_critic import ActorCriticAgent, ACTrainConfig
+from src.serving import ServiceConfig, SchedulingService, LocalClient, run_load
+
+def _env():
+    pool, net, sla, dt_s = build_env_components(load_yaml("configs/env.yaml"))
+    return ArrayEdgeCloudEnv(pool, net, sla, dt_s=dt_s)
+
+def test_service_micro_batches_policy_decisions():
+    torch.manual_seed(0)
+    env = _env()
+    state_dim = SchedulingService(env, None).vec.state_dim
+    agent = ActorCriticAgent(state_dim, env.num_nodes, ACTrainConfig())
+    svc = SchedulingService(env, agent.inference_policy(max_batch=16), ServiceConfig(max_batch=16, window_ms=5.0))
+    tasks = [x for _, x in WorkloadGenerator(WorkloadConfig(seed=5, horizon_s=20.0)).generate()][:40]
+
+    async def main():
+        async with svc:
+            return await LocalClient(svc).schedule_many(tasks)
+
+    out = asyncio.run(main())
+    assert [p.task_id for p in out] == [t.task_id for t in tasks]
+    assert max(p.batch_size for p in out) > 1 and all(p.batch_size <= 16 for p in out)
+    m = svc.metrics()
+    assert m["decisions"] == 40 and m["batches"] < 40 and sum(m["paths"].values()) == 40
+    assert m["decision_p99_ms"] >= m["decision_p50_ms"] >= 0.0
+
+def test_open_loop_load_without_policy():
+    svc = SchedulingService(_env(), None, ServiceConfig(window_ms=1.0))
+    arrivals = WorkloadGenerator(WorkloadConfig(seed=1, horizon_s=5.0, lambda_per_s=20.0)).generate()
+
+    async def main():
+        async with svc:
+            return await run_load(LocalClient(svc), arrivals, time_scale=0.01)
+
+    out = asyncio.run(main())
+    assert len(out) == len(arrivals) and svc.metrics()["throughput_per_s"] > 0
+
+def test_batch_accounts_for_earlier_placements():
+    svc = SchedulingService(_env(), None, ServiceConfig(max_batch=8))
+    # Each task fits edge1 alone; a third back-to-back one would miss its deadline there.
+    out = svc.decide([IoTTask(f"t{i}", 1100.0, 2.0, 0.5, 2) for i in range(6)])
+    assert all(p.result.violation == 0 for p in out)
+    assert {p.node_id for p in out} == {"edge1", "cloud1"} and svc.path_counts["repair"] == 2
+
+def test_stop_fails_pending_submissions():
+    svc = SchedulingService(_env(), None, ServiceConfig(window_ms=50.0))
+
+    async def main():
+        await svc.start()
+        pending = [asyncio.ensure_future(svc.submit(IoTTask(f"t{i}", 100.0, 1.0, 0.5, 0))) for i in range(5)]
+        await asyncio.sleep(0.01)   # first task is gathered, the batch window is still open
+        await svc.stop()
+        results = await asyncio.gather(*pending, return_exceptions=True)
+        with pytest.raises(RuntimeError):
+            await svc.submit(IoTTask("late", 100.0, 1.0, 0.5, 0))
+        return results
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
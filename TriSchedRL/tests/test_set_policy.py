@@ -0,0 +1,45 @@
+import numpy as np
+import torch
+from src.agents.networks import SetActor, SetCritic
+from src.agents.actor_critic import ActorCriticAgent, ACTrainConfig
+from src.agents.state_vectorizer import StateVectorizer
+
+def test_set_actor_is_permutation_equivariant_and_size_agnostic():
+    torch.manual_seed(0)
+    F, K = 9, 4
+    actor, critic = SetActor(F, K, hidden=32), SetCritic(F, K, hidden=32)
+    nodes, kappa = torch.randn(3, 6, F), torch.randn(3, K)
+    perm = torch.randperm(6)
+    out = actor(nodes, kappa)
+    assert out.shape == (3, 6)
+    torch.testing.assert_close(actor(nodes[:, perm], kappa), out[:, perm])
+    torch.testing.assert_close(critic(nodes[:, perm], kappa), critic(nodes, kappa))
+    flat = torch.cat([nodes.reshape(3, -1), kappa], dim=-1)
+    torch.testing.assert_close(actor(flat), out)
+    assert actor(torch.randn(2, 50, F), torch.randn(2, K)).shape == (2, 50)
+
+    mask = torch.ones(3, 6, dtype=torch.bool)
+    mask[:, 4:] = False
+    masked = actor(nodes, kappa, mask)
+    assert torch.isinf(masked[:, 4:]).all()
+    torch.testing.assert_close(masked[:, :4], actor(nodes[:, :4], kappa))
+
+def test_agent_trains_with_set_networks():
+    vec = StateVectorizer([f"n{i}" for i in range(5)], kappa_dim=4)
+    F = vec.per_node_dim
+    agent = ActorCriticAgent(vec.state_dim, 5, ACTrainConfig(), networks=(SetActor(F, 4, 16), SetCritic(F, 4, 16)))
+    rng = np.random.default_rng(0)
+    s = rng.normal(size=(8, vec.state_dim)).astype(np.float32)
+    a, probs = agent.act(s[0])
+    assert 0 <= a < 5 and probs.shape == (5,)
+    out = agent.update({"s": s, "a": rng.integers(0, 5, 8), "r": rng.normal(size=8), "sp": s, "done": np.zeros(8)})
+    assert np.isfinite(out["critic_loss"])
+
+def test_vectorize_nodes_matches_flat_layout():
+    vec = StateVectorizer(["a", "b"], kappa_dim=2)
+    node = {"util": 0.1, "queue_work_mi": 5.0, "f_mi_s": 100.0, "capacity_mi_step": 50.0, "bandwidth_mbps": 10.0,
+            "rtt_ms": 3.0, "loss": 0.0, "energy_budget_j_step": None, "kind": "edge"}
+    state = {"nodes": [{**node, "node_id": "b", "util": 0.9}, {**node, "node_id": "a"}]}
+    nodes, kappa = vec.vectorize_nodes(state, np.array([1.0, 2.0]))
+    assert nodes.shape == (2, vec.per_node_dim) and nodes[1, 0] == np.float32(0.9)
+    np.testing.assert_array_equal(np.concatenate([nodes.ravel(), kappa]), vec.vectorize(state, np.array([1.0, 2.0])))
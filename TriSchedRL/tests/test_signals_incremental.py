@@ -0,0 +1,44 @@
+import numpy as np
+from src.env.sla import SLAConfig
+from src.env.array_env import ArrayEdgeCloudEnv
+from src.env.edgecloud_env import Task
+from src.meta.signals import SignalConfig, SignalTracker, IncrementalSignalTracker, P2Quantile, WindowP2Quantile
+
+def test_exact_mode_matches_signal_tracker(make_components):
+    env = ArrayEdgeCloudEnv(*make_components(), SLAConfig(True), dt_s=0.1)
+    env.reset(0)
+    ref = SignalTracker(SignalConfig(window=7))
+    inc = IncrementalSignalTracker(SignalConfig(window=7))
+    rng = np.random.default_rng(0)
+    for k in range(40):
+        _, res, _, _ = env.step(Task(f"t{k}", float(rng.uniform(50, 900)), 0.5, 1.0, 0), k % 2)
+        ref.update_from_step(res.latency_s, res.energy_j, res.violation)
+        inc.update_from_step(res.latency_s, res.energy_j, res.violation)
+        ref.update_from_state(env.observe_state())
+        inc.update_from_arrays(env.observe_arrays())
+        a, b = ref.phi(), inc.phi()
+        assert a.keys() == b.keys()
+        for key in a:
+            assert np.isclose(a[key], b[key]), key
+
+def test_p2_quantile_tracks_stream_p90():
+    est = P2Quantile(0.9)
+    xs = np.random.default_rng(1).lognormal(0.0, 0.5, size=20000)
+    for x in xs:
+        est.push(x)
+    assert abs(est.value() - np.quantile(xs, 0.9)) < 0.02 * np.quantile(xs, 0.9)
+
+def test_p2_mode_follows_a_window():
+    est = WindowP2Quantile(200, 0.9)
+    rng = np.random.default_rng(2)
+    for x in rng.uniform(0.0, 1.0, size=2000):
+        est.push(x)
+    for x in rng.uniform(10.0, 11.0, size=400):
+        est.push(x)
+    # Only the shifted regime is left in the window.
+    assert 10.7 < est.value() < 11.0
+
+def test_empty_node_set_does_not_divide_by_zero():
+    for tracker in (SignalTracker(SignalConfig()), IncrementalSignalTracker(SignalConfig())):
+        tracker.update_from_state({"nodes": []})
+        assert tracker.phi()["congestion"] == 0.0 and tracker.phi()["energy_pressure"] == 0.0
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+import torch
+from src.env.sla import SLAConfig
+from src.env.edgecloud_env import Task
+from src.env.array_env import ArrayEdgeCloudEnv
+from src.env.vec_env import VecEdgeCloudEnv
+from src.agents.state_vectorizer import StateVectorizer, VectorizerConfig
+from src.agents.replay_buffer import ReplayBuffer, ReplayBufferConfig
+
+NODES = ("edge1", "edge2", "cloud1")
+
+def test_vectorize_arrays_matches_dict_path_with_reordered_ids(make_components):
+    env = ArrayEdgeCloudEnv(*make_components(*NODES), SLAConfig(True), dt_s=0.1)
+    env.reset(0)
+    env.step(Task("t0", 900.0, 1.0, 1.0, 0), "edge2")
+    vec = StateVectorizer(["cloud1", "edge1", "edge2"], kappa_dim=3)
+    kappa = np.array([0.5, 1.5, 2.5])
+    out = np.zeros(vec.state_dim, dtype=np.float32)
+    got = vec.vectorize_arrays(env.observe_arrays(), kappa, out=out)
+    assert got is out
+    np.testing.assert_array_equal(out, vec.vectorize(env.observe_state(), kappa))
+
+def test_batched_vectorize_into_replay_and_torch(make_components):
+    vec_env = VecEdgeCloudEnv(*make_components(*NODES), SLAConfig(True), num_envs=4, dt_s=0.1)
+    vec_env.reset(seed=0)
+    vec_env.step([Task("t", 500.0, 1.0, 1.0, 0)] * 4, np.array([0, 1, 2, 0]))
+    vec = StateVectorizer(vec_env.nodes.node_ids, kappa_dim=2)
+    block = vec.vectorize_arrays(vec_env.observe_arrays(), np.ones((4, 2)))
+    assert block.shape == (4, vec.state_dim)
+    for b in range(4):
+        np.testing.assert_array_equal(block[b], vec.vectorize(vec_env.observe_state(b), np.ones(2)))
+    buf = ReplayBuffer(vec.state_dim, ReplayBufferConfig(capacity=8))
+    buf.add_batch(block, np.zeros(4, dtype=int), np.zeros(4), block, np.zeros(4))
+    assert torch.from_numpy(block).data_ptr() == block.ctypes.data
+
+def test_running_normalization(make_components):
+    env = ArrayEdgeCloudEnv(*make_components(*NODES), SLAConfig(True), dt_s=0.1)
+    env.reset(0)
+    vec = StateVectorizer(env.nodes.node_ids, kappa_dim=1, cfg=VectorizerConfig(normalize=True))
+    rng = np.random.default_rng(0)
+    raw = []
+    for k in range(200):
+        env.step(Task(f"t{k}", float(rng.uniform(100, 2000)), 1.0, 1.0, 0), int(rng.integers(0, 3)))
+        raw.append(StateVectorizer(env.nodes.node_ids, 1).vectorize_arrays(env.observe_arrays(), [float(k)]).copy())
+        out = vec.vectorize_arrays(env.observe_arrays(), [float(k)])
+    raw = np.array(raw)
+    np.testing.assert_allclose(vec.norm_mean, raw.mean(axis=0), rtol=1e-5, atol=1e-6)
+    assert np.all(np.abs(out) <= 10.0)
+
+def test_out_must_be_contiguous(make_components):
+    env = ArrayEdgeCloudEnv(*make_components(*NODES), SLAConfig(True), dt_s=0.1)
+    env.reset(0)
+    vec = StateVectorizer(env.nodes.node_ids, kappa_dim=1)
+    big = np.zeros((2, vec.state_dim), dtype=np.float32)
+    with pytest.raises(ValueError):
+        vec.vectorize_arrays(env.observe_arrays(), [1.0], out=np.zeros((vec.state_dim, 2), dtype=np.float32)[:, 0])
+    with pytest.raises(ValueError):
+        vec.vectorize_arrays(env.observe_arrays(), [1.0], out=big)
+    vec.vectorize_arrays(env.observe_arrays(), [1.0], out=big[1])
+    np.testing.assert_array_equal(big[1], vec.vectorize_arrays(env.observe_arrays(), [1.0]))
@@ -0,0 +1,50 @@
+import os
+from src.evaluation.sweep import SweepConfig, ResultCache, expand_grid, job_key, run_sweep, skipped_schedulers, summarize_rows
+
+def _cfg(tmp_path, **kw):
+    base = dict(seeds=(0, 1), modes=("poisson",), rates=(3.0,), schedulers=("eft", "least_energy", "rl_guarded"),
+                horizon_s=5.0, cache_dir=str(tmp_path / "cache"), workers=1, untrained_rl=True)
+    return SweepConfig(**{**base, **kw})
+
+def test_grid_keys_are_stable_and_seeds_paired(tmp_path):
+    specs = expand_grid(_cfg(tmp_path))
+    assert len(specs) == 6
+    keys = [job_key(s) for s in specs]
+    assert len(set(keys)) == 6 and keys == [job_key(s) for s in expand_grid(_cfg(tmp_path))]
+    by_seed = {}
+    for s in specs:
+        by_seed.setdefault(s["seed"], set()).add(s["workload"]["seed"])
+    assert all(len(v) == 1 for v in by_seed.values()) and by_seed[0] != by_seed[1]
+
+def test_sweep_is_deterministic_and_resumes_from_cache(tmp_path):
+    cfg = _cfg(tmp_path)
+    first = run_sweep(cfg)
+    assert not any(r["cached"] for r in first) and all(r["n_tasks"] > 0 for r in first)
+    assert all("guard_paths" in r for r in first if r["scheduler"] == "rl_guarded")
+    # Simulate an interrupted sweep: drop two cells, rerun in a process pool.
+    cache = ResultCache(cfg.cache_dir)
+    for spec in expand_grid(cfg)[2:4]:
+        os.remove(cache.path(job_key(spec)))
+    second = run_sweep(_cfg(tmp_path, workers=2))
+    assert [r["cached"] for r in second] == [True, True, False, False, True, True]
+    strip = lambda rows: [{k: v for k, v in r.items() if k not in ("cached", "wall_s")} for r in rows]
+    assert strip(first) == strip(second)
+    summary = summarize_rows(second)
+    assert len(summary) == 3 and all(s["n_seeds"] == 2 for s in summary)
+
+def test_rl_cells_need_a_checkpoint(tmp_path):
+    cfg = _cfg(tmp_path, untrained_rl=False)
+    assert skipped_schedulers(cfg) == ["rl_guarded"]
+    assert [s["scheduler"] for s in expand_grid(cfg)] == ["eft", "least_energy"] * 2
+    rows = run_sweep(_cfg(tmp_path, seeds=(0,), schedulers=("eft", "rl_guarded")))
+    assert [r["untrained"] for r in rows] == [False, True]
+
+def test_minmin_maxmin_schedule_arrival_windows(tmp_path):
+    rows = run_sweep(_cfg(tmp_path, seeds=(0,), schedulers=("eft", "minmin", "maxmin"), batch_window_s=2.0))
+    assert len({r["n_tasks"] for r in rows}) == 1
+    # A whole window is placed against the same snapshot, so the batch
+    # heuristics no longer reduce to per-task EFT.
+    stats = [(r["lat_mean"], r["eng_mean"]) for r in rows]
+    assert stats[1] != stats[0] and stats[2] != stats[1]
+    specs = expand_grid(_cfg(tmp_path, schedulers=("minmin", "eft"), batch_window_s=0.5))
+    assert [s.get("batch_window_s") for s in specs[:2]] == [0.5, None]
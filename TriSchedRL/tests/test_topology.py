@@ -0,0 +1,81 @@
+import numpy as np
+from src.env.network import Link, comm_time
+from src.env.arrays import LinkArrays
+from src.env.config import build_env_components
+from src.env.array_env import ArrayEdgeCloudEnv
+from src.env.edgecloud_env import Task
+from src.env.topology import Topology
+from src.predictors.feature_builder import FeatureBuilder
+from src.predictors.latency_predictor import LatencyPredictor
+
+def _hop(l, s):
+    return comm_time(s, l.bandwidth_mbps, l.rtt_ms, l.loss, l.overhead_ms)
+
+def test_multihop_route_cost_and_effective_link():
+    hops = {("iot", "gw"): Link(100.0, 4.0, 0.0, 0.5), ("gw", "edge1"): Link(80.0, 6.0, 0.01, 1.0),
+            ("edge1", "cloud1"): Link(200.0, 30.0, 0.02, 1.0), ("iot", "cloud1"): Link(5.0, 90.0, 0.05, 2.0)}
+    topo = Topology.from_links([(u, v, l) for (u, v), l in hops.items()])
+    assert topo.path("iot", "cloud1") == ["iot", "gw", "edge1", "cloud1"]
+    s = 2.5
+    expect = sum(_hop(hops[k], s) for k in [("iot", "gw"), ("gw", "edge1"), ("edge1", "cloud1")])
+    assert np.isclose(topo.comm_time(s, "iot", "cloud1"), expect)
+    eff = topo.effective_links("iot", ["edge1", "cloud1"])
+    np.testing.assert_allclose(comm_time(s, eff.bandwidth_mbps, eff.rtt_ms, eff.loss, eff.overhead_ms),
+                               topo.comm_time(s, "iot", ["edge1", "cloud1"]))
+    assert np.isinf(topo.comm_time(1.0, "cloud1", "iot"))
+
+def _random_graph(V, E, seed):
+    rng = np.random.default_rng(seed)
+    src, dst = rng.integers(V, size=E), rng.integers(V, size=E)
+    links = LinkArrays(rng.uniform(10, 200, E), rng.uniform(1, 40, E), rng.uniform(0, 0.05, E), np.ones(E))
+    return [f"v{i}" for i in range(V)], src, dst, links
+
+def test_incremental_invalidation_matches_rebuild():
+    V, E = 2000, 20000
+    verts, src, dst, links = _random_graph(V, E, 0)
+    topo = Topology(verts, src, dst, links)
+    sources = list(range(0, V, 100))
+    topo.precompute(sources)
+    n0 = topo.n_dijkstra
+    r0 = topo.routes(0)
+    off_tree = int(np.flatnonzero(~np.any([topo.routes(s).tree for s in sources], axis=0))[0])
+    topo.update_edges([off_tree], bandwidth_mbps=1.0)   # slower, used by no tree
+    topo.precompute(sources)
+    assert topo.n_dijkstra == n0
+    on_tree = int(np.flatnonzero(r0.tree)[0])
+    topo.update_edges([on_tree], rtt_ms=500.0)
+    topo.precompute(sources)
+    assert n0 < topo.n_dijkstra < n0 + len(sources)
+    rng = np.random.default_rng(1)
+    idx = rng.integers(E, size=300)
+    topo.update_edges(idx, bandwidth_mbps=rng.uniform(5, 400, 300), rtt_ms=rng.uniform(0.5, 60, 300))
+    fresh = Topology(verts, src, dst, LinkArrays(links.bandwidth_mbps.copy(), links.rtt_ms.copy(), links.loss.copy(), links.overhead_ms.copy()))
+    for s in sources:
+        np.testing.assert_allclose(topo.comm_time(1.0, s, np.arange(V)), fresh.comm_time(1.0, s, np.arange(V)))
+
+def test_env_config_multihop_routing():
+    node = lambda nid, kind, f: {"node_id": nid, "kind": kind, "f_mi_s": f, "capacity_mi_per_step": 2 * f,
+                                 "power_idle_w": 4.0, "power_dyn_w": 10.0, "energy_budget_j_per_step": None}
+    link = lambda u, v, bw, rtt: {"src": u, "dst": v, "bandwidth_mbps": bw, "rtt_ms": rtt, "loss": 0.01}
+    cfg = {"routing": "multihop", "nodes": [node("edge1", "edge", 600.0), node("edge2", "edge", 500.0), node("cloud1", "cloud", 2500.0)],
+           "links": [link("iot", "gw1", 100.0, 5.0), link("gw1", "edge1", 80.0, 8.0), link("edge1", "edge2", 60.0, 4.0),
+                     link("edge1", "cloud1", 300.0, 40.0)]}
+    pool, net, sla, dt_s = build_env_components(cfg)
+    env = ArrayEdgeCloudEnv(pool, net, sla, dt_s)
+    for j, nid in enumerate(env.nodes.node_ids):
+        _, res, _, _ = env.step(Task(f"t{j}", 100.0, 5.0, 1.5, 0), nid)
+        assert np.isclose(res.t_comm_s, net.topology.comm_time(1.5, "iot", nid))
+    assert net.topology.path("iot", "edge2") == ["iot", "gw1", "edge1", "edge2"]
+    # Edge updates reach the env's links and the NetworkModel through the binding.
+    topo = net.topology
+    topo.update_edges([topo.edge_index("edge1", "edge2")], bandwidth_mbps=2.0, rtt_ms=50.0)
+    j = env.node_index["edge2"]
+    _, res, _, _ = env.step(Task("slow", 100.0, 5.0, 1.5, 0), j)
+    assert np.isclose(res.t_comm_s, topo.comm_time(1.5, "iot", "edge2"))
+    assert res.t_comm_s > 0.5 and np.isclose(net.get_link("iot", "edge2").bandwidth_mbps, env.links.bandwidth_mbps[j])
+    L = LatencyPredictor(overhead_ms=0.0).t_comm_batch(FeatureBuilder().build_batch(env.observe_arrays(), Task("p", 1.0, 1.0, 1.5, 0)))
+    assert np.isclose(L[j], res.t_comm_s)
+    n = topo.n_dijkstra
+    topo.update_edges([topo.edge_index("edge1", "cloud1")], rtt_ms=40.0)   # same value: route costs unchanged
+    assert np.isclose(env.step(Task("c", 1.0, 5.0, 1.5, 0), "cloud1")[1].t_comm_s, topo.comm_time(1.5, "iot", "cloud1"))
+    assert topo.n_dijkstra <= n + 1
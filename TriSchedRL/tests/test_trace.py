@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from src.workloads.generators import WorkloadConfig, WorkloadGenerator
+from src.workloads.trace import TraceReader, import_csv, write_trace
+
+def test_csv_roundtrip_and_windowed_batches(tmp_path):
+    arrivals = WorkloadGenerator(WorkloadConfig(seed=3, horizon_s=20.0, lambda_per_s=5.0)).generate()
+    csv_path = tmp_path / "trace.csv"
+    with open(csv_path, "w") as fh:
+        fh.write("ts,c_mi,d_s,s_mb,priority\n")
+        for t, x in arrivals:
+            fh.write(f"{t!r},{x.c_mi!r},{x.d_s!r},{x.s_mb!r},{x.p}\n")
+    out = str(tmp_path / "trace.bin")
+    assert import_csv(str(csv_path), out, columns={"t": "ts", "p": "priority"}, chunk_rows=7) == len(arrivals)
+
+    reader = TraceReader(out)
+    assert len(reader) == len(arrivals)
+    _, first = next(next(reader.iter_batches(batch_size=4)).iter_tasks())
+    assert (first.c_mi, first.d_s, first.p) == (arrivals[0][1].c_mi, arrivals[0][1].d_s, arrivals[0][1].p)
+
+    chunks = list(reader.iter_batches(batch_size=16, t_start=5.0, t_end=10.0, time_scale=0.5, rebase=True))
+    t = np.concatenate([c.t for c in chunks])
+    ref = np.array([a for a, _ in arrivals if 5.0 < a <= 10.0])
+    np.testing.assert_allclose(t, (ref - 5.0) * 0.5)
+    assert isinstance(chunks[0].tasks.c_mi, np.memmap)
+
+def test_write_trace_rejects_unsorted(tmp_path):
+    with pytest.raises(ValueError):
+        write_trace(str(tmp_path / "bad.bin"), [1.0, 0.5], [1, 1], [1, 1], [1, 1], [0, 0])
+
+def test_priorities_outside_int8_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        write_trace(str(tmp_path / "bad.bin"), [0.0, 1.0], [1, 1], [1, 1], [1, 1], [0, 300])
+    csv_path = tmp_path / "bad.csv"
+    csv_path.write_text("t,c_mi,d_s,s_mb,p\n0.0,1,1,1,2\n1.0,1,1,1,1.5\n")
+    with pytest.raises(ValueError):
+        import_csv(str(csv_path), str(tmp_path / "bad2.bin"))
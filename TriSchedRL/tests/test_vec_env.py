@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from src.env.sla import SLAConfig
+from src.env.edgecloud_env import EdgeCloudEnv, Task
+from src.env.vec_env import VecEdgeCloudEnv
+
+NODES = ("edge1", "edge2", "cloud1")
+
+def test_vec_env_replicas_match_scalar_env(make_components):
+    B = 3
+    vec = VecEdgeCloudEnv(*make_components(*NODES), SLAConfig(True), num_envs=B, dt_s=0.2)
+    refs = [EdgeCloudEnv(*make_components(*NODES), SLAConfig(True), dt_s=0.2) for _ in range(B)]
+    vec.reset(seed=[1, 2, 3])
+    for e in refs:
+        e.reset(0)
+    ids = vec.nodes.node_ids
+    for k in range(10):
+        tasks = [Task(f"t{k}", 200.0 + 30 * b, 0.4, 1.0 + b, b) for b in range(B)]
+        idx = np.array([(k + b) % len(ids) for b in range(B)])
+        _, res, _, _ = vec.step(tasks, idx)
+        for b in range(B):
+            _, ref, _, _ = refs[b].step(tasks[b], ids[idx[b]])
+            got = res.result(b, ids)
+            assert got.node_id == ref.node_id and got.violation == ref.violation
+            assert np.isclose(got.latency_s, ref.latency_s) and np.isclose(got.energy_j, ref.energy_j)
+            assert np.isclose(got.sla_penalty, ref.sla_penalty)
+    vec.reset(indices=[1])
+    assert vec.queue_work_mi[1].sum() == 0.0 and vec.queue_work_mi[0].sum() > 0.0
+
+def test_step_rejects_wrong_number_of_node_indices(make_components):
+    vec = VecEdgeCloudEnv(*make_components(*NODES), SLAConfig(True), num_envs=2, dt_s=0.2)
+    vec.reset(0)
+    tasks = [Task(f"t{b}", 200.0, 0.4, 1.0, 0) for b in range(2)]
+    with pytest.raises(ValueError):
+        vec.step(tasks, [0])
+    with pytest.raises(ValueError):
+        vec.step(tasks, 0)
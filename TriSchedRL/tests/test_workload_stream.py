@@ -0,0 +1,19 @@
+import itertools
+import numpy as np
+from src.workloads.generators import WorkloadConfig, WorkloadGenerator
+
+def test_stream_chunks_match_generate_statistics():
+    cfg = WorkloadConfig(seed=4, mode="bursty", horizon_s=5000.0, lambda_per_s=3.0)
+    ref = WorkloadGenerator(cfg).generate()
+    chunks = list(WorkloadGenerator(cfg).stream(chunk_size=256))
+    assert all(len(c) == 256 for c in chunks[:-1])
+    t = np.concatenate([c.t for c in chunks])
+    assert np.all(np.diff(t) >= 0) and t[-1] <= cfg.horizon_s
+    assert abs(len(t) - len(ref)) < 0.1 * len(ref)
+    c_mi = np.concatenate([c.tasks.c_mi for c in chunks])
+    assert abs(c_mi.mean() - np.mean([x.c_mi for _, x in ref])) < 10.0
+
+def test_stream_unbounded_horizon():
+    cfg = WorkloadConfig(seed=1, mode="poisson", horizon_s=float("inf"), lambda_per_s=50.0)
+    chunks = list(itertools.islice(WorkloadGenerator(cfg).stream(chunk_size=100), 5))
+    assert [c.start_index for c in chunks] == [0, 100, 200, 300, 400]